@@ -0,0 +1,326 @@
+"""
+Performance benchmarks of the Yuma kernels, the consensus implementations, the table builders
+and the scaling of run_simulation over validators, miners and epochs.
+
+    python scripts/benchmark.py run --output benchmark.json [--quick]
+    python scripts/benchmark.py compare baseline.json benchmark.json
+
+compare exits with status 1 when a benchmark got slower or uses more memory than the thresholds allow.
+"""
+
+import argparse
+import ctypes
+import json
+import platform
+import statistics
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+
+import psutil
+import torch
+
+from yuma_simulation._internal.cases import BaseCase, cases
+from yuma_simulation._internal.consensus import (
+    consensus_bisection,
+    consensus_loop,
+    consensus_sorted,
+    consensus_sparse,
+)
+from yuma_simulation._internal.simulation_utils import (
+    generate_total_dividends_table,
+    run_simulation,
+)
+from yuma_simulation._internal.synthetic import SyntheticCase
+from yuma_simulation._internal.yumas import (
+    SimulationHyperparameters,
+    YumaConfig,
+    YumaParams,
+    YumaSimulationNames,
+)
+from yuma_simulation.v1.api import generate_chart_table
+
+# 2: peak memory includes the warm-up call
+SCHEMA_VERSION = 2
+
+yumas = YumaSimulationNames()
+yuma4_params = YumaParams(bond_alpha=0.025, alpha_high=0.99, alpha_low=0.9)
+yuma_versions = [
+    (yumas.YUMA_RUST, YumaParams()),
+    (yumas.YUMA, YumaParams()),
+    (yumas.YUMA_LIQUID, YumaParams(liquid_alpha=True)),
+    (yumas.YUMA2, YumaParams()),
+    (yumas.YUMA3, YumaParams()),
+    (yumas.YUMA31, YumaParams()),
+    (yumas.YUMA32, YumaParams()),
+    (yumas.YUMA4, yuma4_params),
+    (yumas.YUMA4_LIQUID, replace(yuma4_params, liquid_alpha=True)),
+]
+
+
+@dataclass
+class _MaterializedCase(BaseCase):
+    """Case holding pregenerated inputs, so that their generation is not timed."""
+
+    inputs: tuple[torch.Tensor, torch.Tensor] | None = None
+
+    @property
+    def weights_epochs(self) -> list[torch.Tensor]:
+        return list(self.inputs[0])
+
+    @property
+    def stakes_epochs(self) -> list[torch.Tensor]:
+        return list(self.inputs[1])
+
+
+def _synthetic_case(num_validators: int, num_servers: int, num_epochs: int) -> BaseCase:
+    case = SyntheticCase(
+        num_validators=num_validators, num_servers=num_servers, num_epochs=num_epochs
+    )
+    return _MaterializedCase(
+        name=f"Synthetic {num_validators}x{num_servers}x{num_epochs}",
+        validators=case.validators,
+        base_validator=case.base_validator,
+        servers=case.servers,
+        num_epochs=num_epochs,
+        inputs=(case.weights, case.stakes),
+    )
+
+
+class _PeakMemory:
+    """Samples the resident memory of the process in a thread and records its peak growth."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak_bytes = 0
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak_bytes = max(self.peak_bytes, self.process.memory_info().rss)
+
+    def __enter__(self) -> "_PeakMemory":
+        self.start_bytes = self.peak_bytes = self.process.memory_info().rss
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self.process.memory_info().rss)
+
+    @property
+    def growth_mb(self) -> float:
+        return (self.peak_bytes - self.start_bytes) / 2**20
+
+
+def _release_free_memory() -> None:
+    """Returns the memory freed by earlier benchmarks to the OS, so that it is not reused unseen by _PeakMemory."""
+
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        # Not glibc, the peak growth may then be underestimated
+        pass
+
+
+def _measure(function: Callable[[], object], repeats: int) -> dict[str, float]:
+    _release_free_memory()
+    timings = []
+    with _PeakMemory() as memory:
+        # The first call warms up caches and lazy initializations, its allocations count but it is not timed
+        function()
+        for _ in range(repeats):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+    return {
+        "seconds": statistics.median(timings),
+        "min_seconds": min(timings),
+        "repeats": repeats,
+        "peak_memory_mb": memory.growth_mb,
+    }
+
+
+def _benchmarks(quick: bool) -> dict[str, tuple[Callable[[], Callable[[], object]], int]]:
+    """Returns a setup per benchmark name, building the inputs and returning the timed function, with its repeats."""
+
+    scale = 4 if quick else 1
+    benchmarks: dict[str, tuple[Callable[[], Callable[[], object]], int]] = {}
+
+    # === Yuma variants ===
+    def yuma_variant(yuma_version: str, yuma_params: YumaParams) -> Callable[[], object]:
+        case = _synthetic_case(64 // scale, 1024 // scale, 50)
+        yuma_config = YumaConfig(yuma_params=yuma_params)
+        return lambda: run_simulation(case, yuma_version, yuma_config)
+
+    for yuma_version, yuma_params in yuma_versions:
+        benchmarks[f"yuma/{yuma_version}"] = (
+            lambda version=yuma_version, params=yuma_params: yuma_variant(version, params),
+            3,
+        )
+
+    # === Consensus ===
+    def consensus(function: Callable, num_validators: int, num_servers: int, sparse: bool = False):
+        case = SyntheticCase(
+            num_validators=num_validators, num_servers=num_servers, num_epochs=1, density=0.05
+        )
+        W, S = case.weights[0], case.stakes[0]
+        if sparse:
+            W = W.to_sparse_coo().coalesce()
+        config = YumaConfig()
+        return lambda: function(W, S, config.kappa, config.consensus_precision)
+
+    consensus_size = (256 // scale, 4096 // scale)
+    benchmarks["consensus/sorted"] = (lambda: consensus(consensus_sorted, *consensus_size), 5)
+    benchmarks["consensus/bisection"] = (lambda: consensus(consensus_bisection, *consensus_size), 5)
+    benchmarks["consensus/sparse"] = (
+        lambda: consensus(consensus_sparse, *consensus_size, sparse=True),
+        5,
+    )
+    # The reference loop runs once per miner, so it is only timed on a small subnet
+    benchmarks["consensus/loop"] = (lambda: consensus(consensus_loop, 32, 64 // scale), 3)
+
+    # === End-to-end builders ===
+    hyperparameters = SimulationHyperparameters(bond_penalty=0.99)
+    benchmarks["end_to_end/total_dividends_table"] = (
+        lambda: lambda: generate_total_dividends_table(cases, yuma_versions, hyperparameters),
+        1 if quick else 3,
+    )
+    chart_cases = cases[:1] if quick else cases[:3]
+    benchmarks["end_to_end/chart_table"] = (
+        lambda: lambda: generate_chart_table(chart_cases, yuma_versions[:3], hyperparameters),
+        1,
+    )
+
+    # === Scaling ===
+    def scaling(num_validators: int, num_servers: int, num_epochs: int) -> Callable[[], object]:
+        case = _synthetic_case(num_validators, num_servers, num_epochs)
+        return lambda: run_simulation(case, yumas.YUMA3, YumaConfig())
+
+    sizes = {
+        "validators": [(num_validators, 1024 // scale, 20) for num_validators in [16, 64, 256 // scale]],
+        "servers": [(64 // scale, num_servers // scale, 20) for num_servers in [256, 1024, 4096]],
+        "epochs": [(64 // scale, 256 // scale, num_epochs) for num_epochs in [25, 100, 400 // scale]],
+    }
+    for dimension, shapes in sizes.items():
+        for shape in shapes:
+            name = f"scaling/{dimension}/{'x'.join(str(size) for size in shape)}"
+            benchmarks[name] = (lambda shape=shape: scaling(*shape), 3)
+
+    return benchmarks
+
+
+def run(output: str, quick: bool, pattern: str | None) -> None:
+    torch.manual_seed(0)
+    results = {}
+    for name, (setup, repeats) in _benchmarks(quick).items():
+        if pattern is not None and pattern not in name:
+            continue
+        results[name] = _measure(setup(), repeats)
+        print(
+            f"{name}: {results[name]['seconds'] * 1e3:.2f} ms, "
+            f"+{results[name]['peak_memory_mb']:.1f} MB peak memory."
+        )
+
+    report = {
+        "schema_version": SCHEMA_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "quick": quick,
+        "environment": {
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "platform": platform.platform(),
+            "cpu_count": psutil.cpu_count(),
+            "torch_threads": torch.get_num_threads(),
+        },
+        "benchmarks": results,
+    }
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"JSON file {output} has been created successfully.")
+
+
+def compare_reports(
+    baseline: dict,
+    current: dict,
+    time_threshold: float,
+    memory_threshold: float,
+    min_memory_mb: float,
+) -> list[str]:
+    """Returns a description of every benchmark that regressed from baseline to current."""
+
+    regressions = []
+    for name, result in current["benchmarks"].items():
+        reference = baseline["benchmarks"].get(name)
+        if reference is None:
+            continue
+        ratio = result["seconds"] / max(reference["seconds"], 1e-12)
+        if ratio > 1 + time_threshold:
+            regressions.append(
+                f"{name}: {ratio:.2f}x slower "
+                f"({reference['seconds'] * 1e3:.2f} ms -> {result['seconds'] * 1e3:.2f} ms)"
+            )
+        memory_growth = result["peak_memory_mb"] - reference["peak_memory_mb"]
+        allowed = max(memory_threshold * reference["peak_memory_mb"], min_memory_mb)
+        if memory_growth > allowed:
+            regressions.append(
+                f"{name}: {memory_growth:.1f} MB more peak memory "
+                f"({reference['peak_memory_mb']:.1f} MB -> {result['peak_memory_mb']:.1f} MB)"
+            )
+    return regressions
+
+
+def compare(baseline_path: str, current_path: str, args: argparse.Namespace) -> int:
+    with open(baseline_path) as file:
+        baseline = json.load(file)
+    with open(current_path) as file:
+        current = json.load(file)
+    if baseline.get("quick") != current.get("quick"):
+        print("Warning: comparing quick and full benchmark runs.")
+    if baseline.get("schema_version") != current.get("schema_version"):
+        print("Warning: comparing reports of different schema versions, memory is measured differently.")
+
+    regressions = compare_reports(
+        baseline, current, args.time_threshold, args.memory_threshold, args.min_memory_mb
+    )
+    missing = sorted(set(baseline["benchmarks"]) - set(current["benchmarks"]))
+    for name in missing:
+        print(f"{name}: missing from {current_path}.")
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print(f"No regressions against {baseline_path}.")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the benchmarks and save them as JSON")
+    run_parser.add_argument("--output", default="benchmark.json")
+    run_parser.add_argument("--quick", action="store_true", help="smaller sizes, for CI smoke runs")
+    run_parser.add_argument("--filter", dest="pattern", help="only run benchmarks whose name contains this")
+
+    compare_parser = subparsers.add_parser("compare", help="flag regressions against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--time-threshold", type=float, default=0.1, help="allowed slowdown, 0.1 = 10%%")
+    compare_parser.add_argument("--memory-threshold", type=float, default=0.2, help="allowed peak memory growth")
+    compare_parser.add_argument("--min-memory-mb", type=float, default=16.0, help="memory growth always allowed")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args.output, args.quick, args.pattern)
+    else:
+        sys.exit(compare(args.baseline, args.current, args))
+
+
+if __name__ == "__main__":
+    main()
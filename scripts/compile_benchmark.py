@@ -0,0 +1,79 @@
+import time
+
+import pandas as pd
+import torch
+
+from yuma_simulation._internal.compiled import compiled
+from yuma_simulation._internal.yumas import (
+    Yuma,
+    Yuma3,
+    Yuma4,
+    YumaConfig,
+    YumaRust,
+)
+
+
+def _random_inputs(num_validators: int, num_servers: int, generator: torch.Generator):
+    W = torch.rand(num_validators, num_servers, generator=generator)
+    W[W < 0.5] = 0.0
+    S = torch.rand(num_validators, generator=generator)
+    return W, S
+
+
+def _time_epochs(yuma_function, W, S, config, num_epochs: int) -> float:
+    B_state = None
+    start = time.perf_counter()
+    for _ in range(num_epochs):
+        result = yuma_function(W, S, B_state, config)
+        B_state = result.get("validator_ema_bond", result.get("validator_bonds"))
+    return (time.perf_counter() - start) / num_epochs
+
+
+def main():
+    # (validators, servers) sizes to benchmark
+    sizes = [(3, 2), (64, 256), (256, 4096)]
+    num_warmup_epochs = 3
+    num_epochs = 20
+    file_name = "compile_benchmark.csv"
+
+    config = YumaConfig()
+    generator = torch.Generator().manual_seed(0)
+
+    rows = []
+    for num_validators, num_servers in sizes:
+        W, S = _random_inputs(num_validators, num_servers, generator)
+
+        for yuma_function in [YumaRust, Yuma, Yuma3, Yuma4]:
+            compiled_function = compiled(yuma_function)
+
+            # Warm up both backends, the first compiled calls include the compile time
+            compile_start = time.perf_counter()
+            _time_epochs(compiled_function, W, S, config, num_warmup_epochs)
+            compile_time = time.perf_counter() - compile_start
+            _time_epochs(yuma_function, W, S, config, num_warmup_epochs)
+
+            eager_time = _time_epochs(yuma_function, W, S, config, num_epochs)
+            compiled_time = _time_epochs(compiled_function, W, S, config, num_epochs)
+
+            print(
+                f"{yuma_function.__name__} {num_validators}x{num_servers}: "
+                f"eager {eager_time * 1e3:.3f} ms, compiled {compiled_time * 1e3:.3f} ms per epoch."
+            )
+            rows.append(
+                {
+                    "Yuma function": yuma_function.__name__,
+                    "Validators": num_validators,
+                    "Servers": num_servers,
+                    "Eager (ms/epoch)": eager_time * 1e3,
+                    "Compiled (ms/epoch)": compiled_time * 1e3,
+                    "Speedup": eager_time / compiled_time,
+                    "Warm-up incl. compile (s)": compile_time,
+                }
+            )
+
+    # Save the DataFrame to a CSV file
+    pd.DataFrame(rows).to_csv(file_name, index=False, float_format="%.4f")
+    print(f"CSV file {file_name} has been created successfully.")
+
+if __name__ == "__main__":
+    main()
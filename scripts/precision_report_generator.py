@@ -0,0 +1,68 @@
+from dataclasses import replace
+
+from yuma_simulation._internal.cases import cases
+from yuma_simulation._internal.simulation_utils import generate_precision_report
+from yuma_simulation._internal.yumas import (
+    SimulationHyperparameters,
+    YumaParams,
+    YumaSimulationNames,
+)
+
+
+def main():
+    # List of bond_penalty values and corresponding file names
+    bond_penalty_values = [0, 0.5, 0.99, 1.0]
+
+    for bond_penalty in bond_penalty_values:
+        # Define simulation hyperparameters
+        simulation_hyperparameters = SimulationHyperparameters(
+            bond_penalty=bond_penalty,
+        )
+        # Make sure the output file name matches the bond_penalty parameter
+        file_name = f"precision_report_b{bond_penalty}.csv"
+
+        # Define Yuma parameter variations
+        base_yuma_params = YumaParams()
+        liquid_alpha_on_yuma_params = YumaParams(
+            liquid_alpha=True,
+        )
+
+        yuma4_params = YumaParams(
+            bond_alpha=0.025,
+            alpha_high=0.99,
+            alpha_low=0.9,
+        )
+        yuma4_liquid_params = replace(yuma4_params, liquid_alpha=True)
+
+        yumas = YumaSimulationNames()
+        yuma_versions = [
+            (yumas.YUMA_RUST, base_yuma_params),
+            (yumas.YUMA, base_yuma_params),
+            (yumas.YUMA_LIQUID, liquid_alpha_on_yuma_params),
+            (yumas.YUMA2, base_yuma_params),
+            (yumas.YUMA3, base_yuma_params),
+            (yumas.YUMA31, base_yuma_params),
+            (yumas.YUMA32, base_yuma_params),
+            (yumas.YUMA4, base_yuma_params),
+            (yumas.YUMA4_LIQUID, yuma4_liquid_params),
+        ]
+
+        print(f"Starting generation of float32 vs float64 report for bond_penalty={bond_penalty}.")
+        report_df = generate_precision_report(
+            cases=cases,
+            yuma_versions=yuma_versions,
+            simulation_hyperparameters=simulation_hyperparameters,
+        )
+
+        worst = report_df.loc[report_df["Max abs. dividend diff"].idxmax()]
+        print(
+            f"Largest per-epoch dividend difference: {worst['Max abs. dividend diff']:.3e} "
+            f"({worst['Case']} - {worst['Yuma version']})."
+        )
+
+        # Save the DataFrame to a CSV file
+        report_df.to_csv(file_name, index=False, float_format="%.3e")
+        print(f"CSV file {file_name} has been created successfully.")
+
+if __name__ == "__main__":
+    main()
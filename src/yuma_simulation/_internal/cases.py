@@ -1,4 +1,7 @@
-from dataclasses import dataclass, field
+import itertools
+from collections.abc import Iterator
+from dataclasses import dataclass, field, fields, is_dataclass
+from functools import cached_property
 
 import torch
 
@@ -13,6 +16,61 @@ def register_case(name: str):
 
     return decorator
 
+
+def _stack_epochs(
+    epochs: list[torch.Tensor],
+) -> tuple[torch.Tensor | None, list[torch.Tensor]]:
+    """Stacks per-epoch tensors into one contiguous tensor, returning it with a view of each epoch."""
+
+    if not epochs or any(tensor.layout != torch.strided for tensor in epochs):
+        return None, list(epochs)
+    if len({tensor.shape for tensor in epochs}) != 1:
+        return None, list(epochs)
+    stacked = torch.stack(epochs)
+    return stacked, list(stacked.unbind(0))
+
+
+def _concat_chunks(chunks: tuple[torch.Tensor | list[torch.Tensor], ...]) -> torch.Tensor | None:
+    """Concatenates dense chunks of epochs into one tensor, or returns None if they cannot be (sparse or ragged)."""
+
+    if not chunks or any(
+        not isinstance(chunk, torch.Tensor) or chunk.layout != torch.strided for chunk in chunks
+    ):
+        return None
+    if len({chunk.shape[1:] for chunk in chunks}) != 1:
+        return None
+    return torch.cat(chunks)
+
+
+def _input_key(value, tensors: list[torch.Tensor]):
+    """
+    Returns a key of a field value that changes when the value is reassigned or modified in place.
+    Tensors are keyed by their id and in-place version counter, including those held in lists, tuples, dicts
+    and dataclasses. They are appended to tensors, so that the cache keeps them alive and their ids are not reused.
+    """
+
+    if isinstance(value, torch.Tensor):
+        tensors.append(value)
+        return ("tensor", id(value), value._version)
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_input_key(item, tensors) for item in value))
+    if isinstance(value, dict):
+        return (dict, tuple((name, _input_key(item, tensors)) for name, item in value.items()))
+    if is_dataclass(value) and not isinstance(value, type):
+        return (
+            type(value),
+            tuple((item.name, _input_key(getattr(value, item.name), tensors)) for item in fields(value)),
+        )
+    return value
+
+
+def _same_key(a, b) -> bool:
+    try:
+        return bool(a == b)
+    except (RuntimeError, TypeError, ValueError):
+        return False
+
+
 @dataclass
 class BaseCase:
     name: str
@@ -34,6 +92,43 @@ class BaseCase:
     def stakes_epochs(self) -> list[torch.Tensor]:
         return [torch.tensor([0.8, 0.1, 0.1])] * self.num_epochs
 
+    def _build_inputs(self) -> tuple[torch.Tensor | None, torch.Tensor | None]:
+        weights, _ = _stack_epochs(self.weights_epochs[: self.num_epochs])
+        stakes, _ = _stack_epochs(self.stakes_epochs[: self.num_epochs])
+        return weights, stakes
+
+    def stacked_inputs(self) -> tuple[torch.Tensor | None, torch.Tensor | None]:
+        """
+        Returns the weights of shape [E, V, M] and the stakes of shape [E, V] of all epochs, each None when it
+        cannot be stacked (sparse or ragged). They are built on the first call and cached on the instance.
+        The cache is rebuilt when a field is reassigned or a tensor held by a field is modified in place,
+        inputs read from anything else than the fields are not tracked.
+        The tensors are shared by all callers and must not be modified, weights and stakes return copies.
+        """
+
+        tensors = []
+        key = _input_key([(field.name, getattr(self, field.name)) for field in fields(self)], tensors)
+        cached = self.__dict__.get("_stacked_inputs")
+        if cached is None or not _same_key(key, cached[0]):
+            # The source tensors are kept with the key, so that their ids stay unique while it is cached
+            cached = (key, self._build_inputs(), tensors)
+            self.__dict__["_stacked_inputs"] = cached
+        return cached[1]
+
+    @property
+    def weights(self) -> torch.Tensor | None:
+        """Weights of all epochs as one tensor of shape [E, V, M], or None if they cannot be stacked (sparse or ragged)."""
+
+        weights, _ = self.stacked_inputs()
+        return None if weights is None else weights.clone()
+
+    @property
+    def stakes(self) -> torch.Tensor | None:
+        """Stakes of all epochs as one tensor of shape [E, V], or None if they cannot be stacked."""
+
+        _, stakes = self.stacked_inputs()
+        return None if stakes is None else stakes.clone()
+
     def __post_init__(self):
         if self.base_validator not in self.validators:
             raise ValueError(
@@ -48,6 +143,342 @@ def create_case(case_name: str, **kwargs) -> BaseCase:
     return case_class(**kwargs)
 
 
+@dataclass
+class StreamingCase(BaseCase):
+    """
+    Case whose inputs are generated while the simulation runs instead of being held for every epoch.
+
+    Subclasses implement generate_epochs, yielding (W, S) one epoch at a time, or override epoch_chunks
+    to produce chunks of consecutive epochs at once. Simulations read one chunk at a time,
+    so their inputs never take more memory than chunk_size epochs.
+    Every call must yield the same epochs, the inputs may be read more than once (e.g. by a result cache).
+    """
+
+    chunk_size: int = 64
+
+    def generate_epochs(self) -> Iterator[tuple[torch.Tensor, torch.Tensor]]:
+        raise NotImplementedError(
+            "Subclasses must implement generate_epochs or epoch_chunks."
+        )
+
+    def epoch_chunks(
+        self, chunk_size: int | None = None, dtype: torch.dtype | None = None
+    ) -> Iterator[tuple[torch.Tensor, torch.Tensor]]:
+        """
+        Yields weights of shape [C, V, M] and stakes of shape [C, V] for chunks of at most chunk_size epochs,
+        cast to dtype when it is given.
+        """
+
+        chunk_size = chunk_size or self.chunk_size
+        if chunk_size < 1:
+            raise ValueError("Invalid chunk_size.")
+        epochs = itertools.islice(self.generate_epochs(), self.num_epochs)
+        while chunk := list(itertools.islice(epochs, chunk_size)):
+            weights, stakes = zip(*chunk)
+            weights, stakes = torch.stack(weights), torch.stack(stakes)
+            if dtype is not None:
+                weights, stakes = weights.to(dtype), stakes.to(dtype)
+            yield weights, stakes
+
+    @property
+    def weights_epochs(self) -> list[torch.Tensor]:
+        # Materializes the whole history, only meant for short cases
+        return [W for weights, _ in self.epoch_chunks() for W in weights]
+
+    @property
+    def stakes_epochs(self) -> list[torch.Tensor]:
+        return [S for _, stakes in self.epoch_chunks() for S in stakes]
+
+    def _build_inputs(self) -> tuple[torch.Tensor | None, torch.Tensor | None]:
+        chunks = list(self.epoch_chunks())
+        weights_chunks = tuple(weights for weights, _ in chunks)
+        stakes_chunks = tuple(stakes for _, stakes in chunks)
+        return _concat_chunks(weights_chunks), _concat_chunks(stakes_chunks)
+
+    def stacked_inputs(self) -> tuple[torch.Tensor | None, torch.Tensor | None]:
+        """Builds the whole history on every call, streaming cases never keep it on the instance."""
+
+        return self._build_inputs()
+
+    @property
+    def weights(self) -> torch.Tensor | None:
+        weights, _ = self.stacked_inputs()
+        return weights
+
+    @property
+    def stakes(self) -> torch.Tensor | None:
+        _, stakes = self.stacked_inputs()
+        return stakes
+
+
+def _equal_inputs(A: torch.Tensor, B: torch.Tensor) -> bool:
+    """Compares two inputs by value, including sparse COO and CSR tensors that torch.equal does not support."""
+
+    if A is B:
+        return True
+    if A.layout != B.layout or A.shape != B.shape:
+        return False
+    if A.layout == torch.sparse_coo:
+        A, B = A.coalesce(), B.coalesce()
+        return torch.equal(A.indices(), B.indices()) and torch.equal(A.values(), B.values())
+    if A.layout == torch.sparse_csr:
+        return (
+            torch.equal(A.crow_indices(), B.crow_indices())
+            and torch.equal(A.col_indices(), B.col_indices())
+            and torch.equal(A.values(), B.values())
+        )
+    return torch.equal(A, B)
+
+
+def _repeated_epochs(
+    weights_epochs: torch.Tensor | list[torch.Tensor],
+    stakes_epochs: torch.Tensor | list[torch.Tensor],
+    previous: tuple[torch.Tensor, torch.Tensor] | None = None,
+    compare_values: bool = True,
+) -> list[bool]:
+    """
+    Flags the epochs whose weights and stakes are equal to those of the epoch before,
+    the first one being compared with previous, the last epoch of an earlier chunk.
+    Lists of tensors (e.g. sparse weights) are compared one epoch at a time. Without compare_values,
+    only the cheap checks run: expanded views of a single epoch (segments) and repeats of the same tensor objects.
+    """
+
+    if not isinstance(weights_epochs, torch.Tensor) or not isinstance(stakes_epochs, torch.Tensor):
+        equal = _equal_inputs if compare_values else (lambda A, B: A is B)
+        repeated = []
+        for W, S in zip(weights_epochs, stakes_epochs):
+            repeated.append(previous is not None and equal(W, previous[0]) and equal(S, previous[1]))
+            previous = (W, S)
+        return repeated
+
+    num_epochs = len(weights_epochs)
+    if num_epochs == 0:
+        return []
+    if weights_epochs.stride(0) == 0 and stakes_epochs.stride(0) == 0:
+        # Expanded views of a single epoch
+        repeated = [True] * num_epochs
+    elif not compare_values:
+        repeated = [False] * num_epochs
+    else:
+        same = (weights_epochs[1:] == weights_epochs[:-1]).flatten(1).all(dim=-1)
+        same &= (stakes_epochs[1:] == stakes_epochs[:-1]).flatten(1).all(dim=-1)
+        repeated = [False, *same.tolist()]
+    repeated[0] = (
+        previous is not None
+        and torch.equal(previous[0], weights_epochs[0])
+        and torch.equal(previous[1], stakes_epochs[0])
+    )
+    return repeated
+
+
+@dataclass
+class Segment:
+    """Epochs start to stop (exclusive) of a case, which all use the weights W and the stakes S."""
+
+    start: int
+    stop: int
+    W: torch.Tensor
+    S: torch.Tensor
+
+
+def segments_from_epochs(
+    weights_epochs: list[torch.Tensor],
+    stakes_epochs: list[torch.Tensor],
+) -> list[Segment]:
+    """Encodes per-epoch inputs as segments, merging the runs of consecutive identical epochs."""
+
+    weights, _ = _stack_epochs(weights_epochs)
+    stakes, _ = _stack_epochs(stakes_epochs)
+    if weights is not None and stakes is not None:
+        repeated = _repeated_epochs(weights, stakes)
+    else:
+        repeated = _repeated_epochs(weights_epochs, stakes_epochs)
+
+    segments: list[Segment] = []
+    for epoch, (W, S, is_repeat) in enumerate(zip(weights_epochs, stakes_epochs, repeated)):
+        if is_repeat:
+            segments[-1].stop = epoch + 1
+        else:
+            segments.append(Segment(epoch, epoch + 1, W, S))
+    return segments
+
+
+@dataclass
+class SegmentedCase(StreamingCase):
+    """
+    Case whose inputs are piecewise constant, held as segments of epochs sharing the same weights and stakes.
+    Each segment keeps a single copy of its inputs whatever its length, and num_epochs is set to the end
+    of the last segment. Simulations compute the bond-independent stages once per segment.
+    """
+
+    segments: list[Segment] = field(default_factory=list)
+
+    def __post_init__(self):
+        super().__post_init__()
+        if not self.segments:
+            raise ValueError("A segmented case needs at least one segment.")
+        stop = 0
+        for segment in self.segments:
+            if segment.start != stop or segment.stop <= segment.start:
+                raise ValueError("Segments must cover consecutive epochs, starting at epoch 0.")
+            stop = segment.stop
+        self.num_epochs = stop
+
+    @classmethod
+    def from_case(cls, case: BaseCase) -> "SegmentedCase":
+        """Encodes the inputs of any case as segments."""
+
+        return cls(
+            name=case.name,
+            validators=case.validators,
+            base_validator=case.base_validator,
+            reset_bonds=case.reset_bonds,
+            reset_bonds_index=case.reset_bonds_index,
+            reset_bonds_epoch=case.reset_bonds_epoch,
+            servers=case.servers,
+            segments=segments_from_epochs(
+                case.weights_epochs[: case.num_epochs], case.stakes_epochs[: case.num_epochs]
+            ),
+        )
+
+    def generate_epochs(self) -> Iterator[tuple[torch.Tensor, torch.Tensor]]:
+        for segment in self.segments:
+            for _ in range(segment.stop - segment.start):
+                yield segment.W, segment.S
+
+    def epoch_chunks(
+        self, chunk_size: int | None = None, dtype: torch.dtype | None = None
+    ) -> Iterator[tuple[torch.Tensor | list[torch.Tensor], torch.Tensor | list[torch.Tensor]]]:
+        """
+        Yields one chunk per segment, cut at num_epochs. Dense inputs are expanded views of the segment's
+        tensors, so a segment is never copied and chunk_size does not apply.
+        """
+
+        for segment in self.segments:
+            num_epochs = min(segment.stop, self.num_epochs) - segment.start
+            if num_epochs <= 0:
+                return
+            W, S = segment.W, segment.S
+            if dtype is not None:
+                W, S = W.to(dtype), S.to(dtype)
+            if W.layout != torch.strided:
+                yield [W] * num_epochs, [S] * num_epochs
+            else:
+                yield W.expand(num_epochs, *W.shape), S.expand(num_epochs, *S.shape)
+
+
+@dataclass
+class CaseBuilder:
+    """
+    Builds a SegmentedCase one segment at a time, e.g. the stake merge of Case 9:
+
+        case = (
+            CaseBuilder("Merged stakes", validators, base_validator=validators[0])
+            .hold(W, torch.tensor([0.8, 0.1, 0.1]), epochs=6)
+            .hold(S=torch.tensor([0.8, 0.2, 0.0]), epochs=34)
+            .build()
+        )
+    """
+
+    name: str
+    validators: list[str]
+    base_validator: str
+    servers: list[str] = field(default_factory=lambda: ["Server 1", "Server 2"])
+    reset_bonds: bool = False
+    reset_bonds_index: int = None
+    reset_bonds_epoch: int = None
+    segments: list[Segment] = field(default_factory=list)
+
+    def hold(
+        self,
+        W: torch.Tensor | None = None,
+        S: torch.Tensor | None = None,
+        epochs: int = 1,
+    ) -> "CaseBuilder":
+        """Appends a segment of epochs using W and S, each defaulting to the one of the previous segment."""
+
+        if epochs < 1:
+            raise ValueError("Invalid number of epochs.")
+        previous = self.segments[-1] if self.segments else None
+        if previous is None and (W is None or S is None):
+            raise ValueError("The first segment needs both weights and stakes.")
+        W = previous.W if W is None else W
+        S = previous.S if S is None else S
+        start = previous.stop if previous is not None else 0
+        self.segments.append(Segment(start, start + epochs, W, S))
+        return self
+
+    def build(self) -> SegmentedCase:
+        return SegmentedCase(
+            name=self.name,
+            validators=self.validators,
+            base_validator=self.base_validator,
+            reset_bonds=self.reset_bonds,
+            reset_bonds_index=self.reset_bonds_index,
+            reset_bonds_epoch=self.reset_bonds_epoch,
+            servers=self.servers,
+            segments=list(self.segments),
+        )
+
+
+@dataclass
+class CaseBatch:
+    """
+    Cases of the same shape stacked along a leading scenario dimension, weights of shape [K, V, M].
+    The bond resets of each scenario are held as tensors of shape [K], with -1 for scenarios without a reset.
+    """
+
+    cases: list[BaseCase]
+
+    def __post_init__(self):
+        if not self.cases:
+            raise ValueError("A case batch needs at least one case.")
+        if len({case.num_epochs for case in self.cases}) != 1:
+            raise ValueError("All cases of a batch must have the same number of epochs.")
+        inputs = [case.stacked_inputs() for case in self.cases]
+        if any(weights is None or stakes is None for weights, stakes in inputs):
+            raise ValueError("All cases of a batch must have dense weights of the same shape.")
+        shapes = {tuple(weights.shape) for weights, _ in inputs}
+        if len(shapes) != 1:
+            raise ValueError("All cases of a batch must have weights of the same shape.")
+
+    @property
+    def num_epochs(self) -> int:
+        return self.cases[0].num_epochs
+
+    @cached_property
+    def weights(self) -> torch.Tensor:
+        """Weights of all epochs as one tensor of shape [E, K, V, M]."""
+
+        return torch.stack([case.stacked_inputs()[0] for case in self.cases], dim=1)
+
+    @cached_property
+    def stakes(self) -> torch.Tensor:
+        """Stakes of all epochs as one tensor of shape [E, K, V]."""
+
+        return torch.stack([case.stacked_inputs()[1] for case in self.cases], dim=1)
+
+    @property
+    def weights_epochs(self) -> list[torch.Tensor]:
+        return list(self.weights.unbind(0))
+
+    @property
+    def stakes_epochs(self) -> list[torch.Tensor]:
+        return list(self.stakes.unbind(0))
+
+    @property
+    def reset_bonds_epoch(self) -> torch.Tensor:
+        return torch.tensor(
+            [-1 if case.reset_bonds_epoch is None else case.reset_bonds_epoch for case in self.cases]
+        )
+
+    @property
+    def reset_bonds_index(self) -> torch.Tensor:
+        return torch.tensor(
+            [0 if case.reset_bonds_index is None else case.reset_bonds_index for case in self.cases]
+        )
+
+
 @register_case("Case 1")
 @dataclass
 class Case1(BaseCase):
@@ -126,7 +126,7 @@ def _plot_bonds(
     num_epochs: int,
     validators: list[str],
     servers: list[str],
-    bonds_per_epoch: list[torch.Tensor],
+    bonds_per_epoch: list[torch.Tensor] | torch.Tensor,
     case_name: str,
     to_base64: bool = False,
     normalize: bool = False,
@@ -356,24 +356,31 @@ def _set_default_xticks(ax: Axes, num_epochs: int) -> None:
 
 
 def _prepare_bond_data(
-    bonds_per_epoch: list[torch.Tensor],
+    bonds_per_epoch: list[torch.Tensor] | torch.Tensor,
     validators: list[str],
     servers: list[str],
     normalize: bool,
 ) -> list[list[list[float]]]:
-    """Prepares bond data for plotting, normalizing if specified."""
+    """
+    Prepares bond data for plotting, normalizing if specified.
+    bonds_per_epoch is indexed per epoch, so an [E, V, M] tensor (e.g. a memory-mapped bond history)
+    is read without copying the bonds of servers and validators that are not plotted.
+    """
 
     num_epochs = len(bonds_per_epoch)
-    bonds_data: list[list[list[float]]] = []
-    for idx_s, _ in enumerate(servers):
-        server_bonds: list[list[float]] = []
-        for idx_v, _ in enumerate(validators):
-            validator_bonds = [
-                float(bonds_per_epoch[epoch][idx_v, idx_s].item())
-                for epoch in range(num_epochs)
+    num_validators, num_servers = len(validators), len(servers)
+    if num_epochs == 0:
+        return [[[] for _ in validators] for _ in servers]
+    plotted_bonds = torch.stack(
+        [
+            (bonds.to_dense() if bonds.layout != torch.strided else bonds)[
+                :num_validators, :num_servers
             ]
-            server_bonds.append(validator_bonds)
-        bonds_data.append(server_bonds)
+            for bonds in bonds_per_epoch
+        ]
+    )
+    # [M, V, E] nested lists of Python floats
+    bonds_data: list[list[list[float]]] = plotted_bonds.double().permute(2, 1, 0).tolist()
 
     if normalize:
         for idx_s in range(len(servers)):
@@ -0,0 +1,173 @@
+"""
+This module provides the checkpoints of run_simulation, so that long runs can be resumed after an interruption
+or extended to more epochs without simulating the completed ones again.
+A checkpoint holds the loop state after a number of epochs and a hash of the inputs of those epochs.
+The results of the epochs are appended to a directory next to it, one file per checkpoint interval,
+so that every checkpoint only writes the epochs simulated since the previous one.
+"""
+
+import hashlib
+import os
+import tempfile
+from collections.abc import Iterator
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any
+
+import torch
+
+from yuma_simulation._internal.cases import BaseCase
+from yuma_simulation._internal.result_cache import _hash_value
+from yuma_simulation._internal.results import SimulationResult, open_bond_history
+from yuma_simulation._internal.yumas import YumaConfig
+
+
+def config_fields(yuma_config: YumaConfig) -> dict[str, Any]:
+    """Returns the simulation hyperparameters and Yuma parameters of a config by field name."""
+
+    return {
+        field.name: getattr(parameters, field.name)
+        for parameters in [yuma_config.simulation, yuma_config.yuma_params]
+        for field in fields(parameters)
+    }
+
+
+class InputHash:
+    """
+    Running hash of the inputs of a case, fed one epoch at a time, like the inputs part of simulation_key.
+    The hash after a number of epochs tells whether a checkpoint was written by a run of the same inputs.
+    """
+
+    def __init__(self, case: BaseCase, epochs: Iterator[tuple[torch.Tensor, torch.Tensor]]):
+        self._digest = hashlib.sha256()
+        for value in [case.validators, case.reset_bonds_epoch, case.reset_bonds_index]:
+            _hash_value(self._digest, value)
+        self._epochs = epochs
+        self.epoch = 0
+
+    def advance(self, epoch: int) -> str:
+        """Feeds the inputs up to epoch (exclusive) and returns the hash of all the inputs fed so far."""
+
+        while self.epoch < epoch:
+            W, S = next(self._epochs)
+            _hash_value(self._digest, W)
+            _hash_value(self._digest, S)
+            self.epoch += 1
+        return self._digest.hexdigest()
+
+
+def _rows_directory(path: str | os.PathLike) -> Path:
+    return Path(f"{path}.rows")
+
+
+def _save_atomically(data: Any, path: Path) -> None:
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as file:
+        try:
+            torch.save(data, file)
+        except BaseException:
+            file.close()
+            os.unlink(file.name)
+            raise
+    os.replace(file.name, path)
+
+
+@dataclass
+class SimulationCheckpoint:
+    """
+    The state of a run_simulation after its first state["epoch"] epochs.
+    state holds the fields of the SimulationState, config those of the YumaConfig of the run and input_hash
+    the InputHash of the simulated epochs. segments names the files of simulated rows, in epoch order.
+    Bonds written to a bonds_path are flushed there instead of being copied into the segments.
+    """
+
+    yuma_version: str
+    validators: list[str]
+    config: dict[str, Any]
+    state: dict[str, Any] = field(default_factory=lambda: {"epoch": 0})
+    input_hash: str = ""
+    keep_history: bool = True
+    bonds_path: str | None = None
+    segments: list[str] = field(default_factory=list)
+
+    @property
+    def epoch(self) -> int:
+        return self.state["epoch"]
+
+    def check(
+        self,
+        validators: list[str],
+        yuma_version: str,
+        yuma_config: YumaConfig,
+        input_hash: InputHash,
+    ) -> None:
+        """Raises a ValueError unless the checkpoint was written by a run of the same inputs, version and config."""
+
+        if list(validators) != self.validators:
+            raise ValueError("Invalid checkpoint: the case has different validators.")
+        if yuma_version != self.yuma_version:
+            raise ValueError(f"Invalid checkpoint: it was written by {self.yuma_version}.")
+        if config_fields(yuma_config) != self.config:
+            raise ValueError("Invalid checkpoint: it was written with a different config.")
+        try:
+            matches = input_hash.advance(self.epoch) == self.input_hash
+        except StopIteration:
+            matches = False
+        if not matches:
+            raise ValueError("Invalid checkpoint: the case has different inputs.")
+
+    def append_rows(self, path: str | os.PathLike, rows: SimulationResult, start: int) -> None:
+        """Writes the rows of the epochs simulated since start to a new segment file."""
+
+        directory = _rows_directory(path)
+        directory.mkdir(exist_ok=True)
+        # Unique names, so that a segment listed by the last saved checkpoint is never overwritten
+        with tempfile.NamedTemporaryFile(
+            dir=directory, prefix=f"{start}-{start + rows.num_epochs}-", suffix=".pt", delete=False
+        ) as file:
+            torch.save(rows.to_dict(), file)
+        self.segments.append(os.path.basename(file.name))
+
+    def result(self, path: str | os.PathLike) -> SimulationResult:
+        """Reads the results of the simulated epochs back, with the bonds of a bonds_path mapped from the file."""
+
+        directory = _rows_directory(path)
+        parts = [
+            SimulationResult.from_dict(torch.load(directory / segment, weights_only=True))
+            for segment in self.segments
+        ]
+        if not parts:
+            return SimulationResult.empty(self.validators, 0, keep_history=self.keep_history)
+        result = SimulationResult.concatenate(parts)
+        if result.bonds is None and self.bonds_path is not None and result.server_incentives is not None:
+            result.bonds = open_bond_history(self.bonds_path)[: self.epoch]
+            result.bonds_path = self.bonds_path
+        return result
+
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        Writes the checkpoint atomically, so that an interrupted save keeps the previous one,
+        then removes the segment files it no longer lists.
+        """
+
+        path = Path(path)
+        data = {
+            "yuma_version": self.yuma_version,
+            "validators": self.validators,
+            "config": self.config,
+            "state": self.state,
+            "input_hash": self.input_hash,
+            "keep_history": self.keep_history,
+            "bonds_path": self.bonds_path,
+            "segments": self.segments,
+        }
+        _save_atomically(data, path)
+
+        directory = _rows_directory(path)
+        segments = set(self.segments)
+        for segment in directory.iterdir() if directory.is_dir() else []:
+            if segment.name not in segments:
+                segment.unlink(missing_ok=True)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "SimulationCheckpoint":
+        return cls(**torch.load(path, weights_only=True))
@@ -0,0 +1,140 @@
+"""
+This module provides the opt-in compiled backend of the Yuma step functions.
+Each Yuma function is compiled with torch.compile on first use and kept in a registry, falling back to eager mode
+when compilation is unavailable or fails. Compiled graphs are cached on disk so that worker processes reuse them.
+The cache directory is enabled once, when the first function is compiled, and stays enabled for the process.
+"""
+
+import contextlib
+import functools
+import os
+import subprocess
+import warnings
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import torch
+
+from yuma_simulation._internal.yumas import YumaConfig
+
+DEFAULT_COMPILE_CACHE_DIR = Path.home() / ".cache" / "yuma_simulation" / "torch_compile"
+
+_compiled_functions: dict[Callable, Callable] = {}
+_compile_cache: contextlib.ExitStack | None = None
+
+
+@dataclass(frozen=True)
+class Backends:
+    EAGER: str = "eager"
+    COMPILED: str = "compiled"
+
+
+@contextlib.contextmanager
+def compile_cache_dir(cache_dir: str | os.PathLike | None = None) -> Iterator[Path]:
+    """
+    Enables the on-disk cache of compiled graphs in cache_dir while the context is active.
+    An explicit TORCHINDUCTOR_CACHE_DIR is kept when no directory is given. The environment is restored on exit.
+    """
+
+    previous = os.environ.get("TORCHINDUCTOR_CACHE_DIR")
+    if cache_dir is None:
+        cache_dir = previous or DEFAULT_COMPILE_CACHE_DIR
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    import torch._inductor.config
+
+    os.environ["TORCHINDUCTOR_CACHE_DIR"] = str(cache_dir)
+    try:
+        with torch._inductor.config.patch(fx_graph_cache=True):
+            yield cache_dir
+    finally:
+        if previous is None:
+            os.environ.pop("TORCHINDUCTOR_CACHE_DIR", None)
+        else:
+            os.environ["TORCHINDUCTOR_CACHE_DIR"] = previous
+
+
+def _enable_compile_cache() -> None:
+    """
+    Enters compile_cache_dir for the rest of the process, the first time it is called.
+    Compiled steps then run without setting up the cache on every call, including when they recompile for new shapes.
+    """
+
+    global _compile_cache
+    if _compile_cache is None:
+        stack = contextlib.ExitStack()
+        stack.enter_context(compile_cache_dir())
+        _compile_cache = stack
+
+
+def _compile_errors() -> tuple[type[Exception], ...]:
+    """Returns the exceptions raised when Dynamo, Inductor or the C++ compiler fail to compile a function."""
+
+    try:
+        from torch._dynamo.exc import TorchDynamoException
+        from torch._inductor.exc import (
+            CppCompileError,
+            CppWrapperCodeGenError,
+            InvalidCxxCompiler,
+            OperatorIssue,
+            SubgraphLoweringException,
+        )
+    except ImportError:
+        return ()
+    return (
+        TorchDynamoException,
+        OperatorIssue,
+        SubgraphLoweringException,
+        InvalidCxxCompiler,
+        CppWrapperCodeGenError,
+        CppCompileError,
+        subprocess.CalledProcessError,
+    )
+
+
+def _with_eager_fallback(function: Callable, compiled_function: Callable) -> Callable:
+    compile_errors = _compile_errors()
+    state = {"compiled_function": compiled_function}
+
+    @functools.wraps(function)
+    def step(*args, **kwargs):
+        if state["compiled_function"] is not None:
+            try:
+                return state["compiled_function"](*args, **kwargs)
+            except compile_errors as error:
+                warnings.warn(
+                    f"Compiling {function.__name__} failed, falling back to eager mode: {error}"
+                )
+                state["compiled_function"] = None
+        return function(*args, **kwargs)
+
+    return step
+
+
+def compiled(function: Callable) -> Callable:
+    """Returns the compiled version of a Yuma function from the registry, compiling it on first use."""
+
+    if function not in _compiled_functions:
+        if not hasattr(torch, "compile"):
+            warnings.warn("torch.compile is unavailable, falling back to eager mode.")
+            _compiled_functions[function] = function
+        else:
+            _enable_compile_cache()
+            _compiled_functions[function] = _with_eager_fallback(
+                function, torch.compile(function)
+            )
+    return _compiled_functions[function]
+
+
+def resolve_backend(function: Callable, config: YumaConfig) -> Callable:
+    """Returns the Yuma function to run under config.backend."""
+
+    backends = Backends()
+    if config.backend == backends.EAGER:
+        return function
+    elif config.backend == backends.COMPILED:
+        return compiled(function)
+    else:
+        raise ValueError("Invalid backend.")
@@ -0,0 +1,289 @@
+"""
+This module provides the consensus kernels shared by all Yuma versions.
+Each kernel computes, for every miner, the stake-weighted kappa quantile of the weights it received,
+expressed on the grid of the reference bisection (steps of 1/2**n, with 2**n >= consensus_precision).
+"""
+
+import torch
+
+from yuma_simulation._internal.parameters import broadcast_parameter, is_swept
+from yuma_simulation._internal.workspace import YumaWorkspace, workspace_buffer
+
+
+def _bisection_steps(consensus_precision: int) -> int:
+    """Returns how many halvings the reference bisection performs for the given precision."""
+
+    c_high = 1.0
+    c_low = 0.0
+    steps = 0
+    while (c_high - c_low) > 1 / consensus_precision:
+        c_high = (c_high + c_low) / 2.0
+        steps += 1
+    return steps
+
+
+def _snap_to_bisection_grid(
+    quantile: torch.Tensor,
+    consensus_precision: int,
+    dtype: torch.dtype | None,
+) -> torch.Tensor:
+    """Rounds float64 quantiles up to the c_high values the reference bisection can return."""
+
+    if is_swept(consensus_precision):
+        grid = torch.tensor(
+            [2 ** _bisection_steps(int(precision)) for precision in consensus_precision],
+            dtype=torch.float64,
+            device=quantile.device,
+        ).view(-1, 1)
+    else:
+        grid = 2 ** _bisection_steps(consensus_precision)
+    # clamp does not mix a scalar min with the tensor max of a swept grid
+    steps = torch.ceil(quantile * grid).clamp(min=1)
+    C = torch.minimum(steps, torch.as_tensor(grid, dtype=steps.dtype)) / grid
+    return C.to(dtype if dtype is not None else torch.get_default_dtype())
+
+
+def quantize_consensus(C: torch.Tensor, dtype: torch.dtype | None = None) -> torch.Tensor:
+    """
+    Normalizes the consensus and rounds it down to steps of 1/65535, like the u16 values of the chain.
+    The steps are divided in dtype, or in the default dtype when it is None (the legacy dtypes).
+    """
+
+    steps = (C / C.sum(dim=-1, keepdim=True) * 65_535).int()
+    return steps.to(dtype if dtype is not None else torch.get_default_dtype()) / 65_535
+
+
+def _tie_tolerance(S: torch.Tensor, kappa: float | torch.Tensor) -> torch.Tensor:
+    """
+    Bounds, in float64, the rounding of a stake sum and of kappa in S.dtype, the precision the loop compares in.
+    Supports closer to kappa than this may compare differently in the loop and are decided like it.
+    """
+
+    eps = torch.finfo(S.dtype).eps
+    stake = S.double().abs().sum(dim=-1)
+    kappa = kappa.double().abs() if isinstance(kappa, torch.Tensor) else abs(kappa)
+    return eps * ((S.shape[-1] + 1) * stake + kappa)
+
+
+def _decide_ties_like_loop(
+    C: torch.Tensor,
+    W: torch.Tensor,
+    S: torch.Tensor,
+    kappa: float,
+    consensus_precision: int,
+    dtype: torch.dtype | None,
+    ties: torch.Tensor,
+) -> torch.Tensor:
+    """Recomputes the consensus of the miners flagged in ties (of shape [..., M]) with the reference bisection."""
+
+    if not ties.any():
+        return C
+    W_miners = W.transpose(-1, -2)[ties]
+    S_miners = S.unsqueeze(-2).expand(*ties.shape, S.shape[-1])[ties]
+    # Swept parameters are taken per tied miner, so that each row of the bisection uses its scenario's value
+    if is_swept(kappa):
+        kappa = broadcast_parameter(kappa, 1).expand(ties.shape)[ties]
+    if is_swept(consensus_precision):
+        consensus_precision = broadcast_parameter(consensus_precision, 1).expand(ties.shape)[ties]
+    C[ties] = consensus_bisection(
+        W_miners.unsqueeze(-1), S_miners, kappa, consensus_precision, dtype=C.dtype
+    ).squeeze(-1)
+    return C
+
+
+def consensus_loop(
+    W: torch.Tensor,
+    S: torch.Tensor,
+    kappa: float,
+    consensus_precision: int,
+    dtype: torch.dtype | None = None,
+) -> torch.Tensor:
+    """Reference per-miner bisection, kept for audits and for validating the vectorized kernels."""
+
+    if W.dim() > 2:
+        # Swept parameters follow the scenario dimension, the one right before [V, M]
+        split = W.dim() == 3
+        return torch.stack(
+            [
+                consensus_loop(
+                    W_i,
+                    S_i,
+                    kappa[i].item() if split and is_swept(kappa) else kappa,
+                    consensus_precision[i].item()
+                    if split and is_swept(consensus_precision)
+                    else consensus_precision,
+                    dtype=dtype,
+                )
+                for i, (W_i, S_i) in enumerate(zip(W, S))
+            ]
+        )
+
+    C = torch.zeros(W.shape[1], dtype=dtype)
+
+    for i, miner_weight in enumerate(W.T):
+        c_high = 1.0
+        c_low = 0.0
+
+        while (c_high - c_low) > 1 / consensus_precision:
+            c_mid = (c_high + c_low) / 2.0
+            _c_sum = (miner_weight > c_mid) * S
+            if _c_sum.sum() > kappa:
+                c_low = c_mid
+            else:
+                c_high = c_mid
+
+        C[i] = c_high
+
+    return C
+
+
+def consensus_sorted(
+    W: torch.Tensor,
+    S: torch.Tensor,
+    kappa: float,
+    consensus_precision: int,
+    dtype: torch.dtype | None = None,
+    workspace: YumaWorkspace | None = None,
+) -> torch.Tensor:
+    """
+    Computes the consensus of all miners at once by sorting the weight columns.
+
+    The stake supporting a miner above a threshold c is the cumulative stake of the validators whose
+    weight is strictly greater than c, so the smallest c with support <= kappa is the weight at which
+    the descending cumulative stake first exceeds kappa. Rounding that value up to the bisection grid
+    gives the same c_high as the reference loop. Accepts W of shape [..., V, M] and S of shape [..., V].
+    With a workspace (W of shape [V, M] only), the V x M temporaries are written into its buffers.
+    """
+
+    sort_out = None
+    if workspace is not None:
+        sort_out = (
+            workspace.buffer("sorted_weight", W.dtype),
+            workspace.buffer("sorted_order", torch.int64),
+        )
+    W_sorted, order = torch.sort(W, dim=-2, descending=True, out=sort_out)
+    # Accumulate in float64 so that the kappa comparison is not perturbed by the sort order
+    stake_above = torch.gather(
+        S.double().unsqueeze(-1).expand_as(W),
+        -2,
+        order,
+        out=workspace_buffer(workspace, "sorted_stake", torch.float64),
+    ).cumsum_(dim=-2)
+
+    kappa_sorted = broadcast_parameter(kappa, 2, stake_above.dtype)
+    mask_buffer = workspace_buffer(workspace, "consensus_mask", torch.bool)
+    exceeds = torch.gt(stake_above, kappa_sorted, out=mask_buffer)
+    has_quantile = exceeds.any(dim=-2)
+    # Stakes are non-negative, so the first exceeding position is the number of positions not exceeding
+    num_exceeding = exceeds.sum(dim=-2, keepdim=True)
+    first = (W.shape[-2] - num_exceeding).clamp(max=W.shape[-2] - 1)
+
+    quantile = W_sorted.gather(-2, first).squeeze(-2).double()
+    quantile = torch.where(has_quantile, quantile, torch.zeros_like(quantile))
+    C = _snap_to_bisection_grid(quantile, consensus_precision, dtype)
+
+    # === Ties ===
+    # The loop sums the stakes in S.dtype, so a support within rounding of kappa (e.g. equal stakes backing
+    # a miner with exactly half of the stake) is decided by the reference bisection instead
+    tolerance = _tie_tolerance(S, kappa)[..., None, None]
+    num_above = torch.gt(stake_above, kappa_sorted + tolerance, out=mask_buffer).sum(dim=-2)
+    num_near = torch.ge(stake_above, kappa_sorted - tolerance, out=mask_buffer).sum(dim=-2)
+    return _decide_ties_like_loop(C, W, S, kappa, consensus_precision, dtype, num_near > num_above)
+
+
+def consensus_bisection(
+    W: torch.Tensor,
+    S: torch.Tensor,
+    kappa: float,
+    consensus_precision: int,
+    dtype: torch.dtype | None = None,
+) -> torch.Tensor:
+    """
+    Runs the reference bisection for all miners at once, bit-for-bit identical to consensus_loop.
+
+    Every miner keeps its own c_low/c_high and follows the same stopping rule and strict comparison,
+    so the Python loop runs once per halving instead of once per halving and miner. The weights are
+    laid out miner-major so that each stake sum reduces a contiguous row, exactly like the loop.
+    Accepts W of shape [..., V, M] and S of shape [..., V].
+    """
+
+    W_miners = W.transpose(-1, -2).contiguous()
+    S_miners = S.unsqueeze(-2)
+
+    kappa = broadcast_parameter(kappa, 1, S.dtype)
+    if is_swept(consensus_precision):
+        step = 1 / broadcast_parameter(consensus_precision, 1).double()
+    else:
+        step = 1 / consensus_precision
+
+    c_high = torch.ones(W_miners.shape[:-1], dtype=torch.float64, device=W.device)
+    c_low = torch.zeros_like(c_high)
+
+    active = (c_high - c_low) > step
+    while active.any():
+        c_mid = (c_high + c_low) / 2.0
+        _c_sum = (W_miners > c_mid.unsqueeze(-1)) * S_miners
+        above = _c_sum.sum(dim=-1) > kappa
+        c_low = torch.where(active & above, c_mid, c_low)
+        c_high = torch.where(active & ~above, c_mid, c_high)
+        active = (c_high - c_low) > step
+
+    return c_high.to(dtype if dtype is not None else torch.get_default_dtype())
+
+
+def consensus_sparse(
+    W: torch.Tensor,
+    S: torch.Tensor,
+    kappa: float,
+    consensus_precision: int,
+    dtype: torch.dtype | None = None,
+) -> torch.Tensor:
+    """
+    Sort-based consensus over the non-zero entries of a coalesced sparse COO weight matrix of shape [V, M].
+
+    Implicit zeros never lie strictly above a threshold, so only the stored entries are sorted, grouped per miner.
+    """
+
+    rows, cols = W.indices()
+    values = W.values()
+    num_entries = values.shape[0]
+
+    # Group the entries per miner, largest weight first
+    order = torch.sort(values, descending=True, stable=True).indices
+    order = order[torch.sort(cols[order], stable=True).indices]
+    cols_sorted = cols[order]
+    values_sorted = values[order]
+    stake_sorted = S[rows[order]].double()
+
+    # Cumulative stake within each miner's group, summed from the group start like the dense kernel
+    # so that supports exactly equal to kappa round the same way
+    counts = torch.bincount(cols_sorted, minlength=W.shape[1])
+    starts = counts.cumsum(0) - counts
+    positions = torch.arange(num_entries, device=values.device)
+    offsets = positions - starts[cols_sorted]
+    stake_groups = stake_sorted.new_zeros(W.shape[1], int(counts.max()) if num_entries else 0)
+    stake_groups[cols_sorted, offsets] = stake_sorted
+    stake_above = stake_groups.cumsum_(dim=1)[cols_sorted, offsets]
+
+    positions = torch.where(stake_above > kappa, positions, num_entries)
+    first = torch.full_like(counts, num_entries).scatter_reduce(
+        0, cols_sorted, positions, reduce="amin"
+    )
+
+    # Miners without enough supporting stake get the index of the trailing zero
+    values_padded = torch.cat([values_sorted.double(), values_sorted.new_zeros(1, dtype=torch.float64)])
+    quantile = values_padded[first]
+    C = _snap_to_bisection_grid(quantile, consensus_precision, dtype)
+
+    # === Ties ===
+    # Supports within rounding of kappa are decided like the loop, on the dense columns of those miners
+    near = (stake_above - kappa).abs() <= _tie_tolerance(S, kappa)
+    ties = torch.zeros(W.shape[1], dtype=torch.bool, device=values.device)
+    ties[cols_sorted[near]] = True
+    if not ties.any():
+        return C
+    tied_miners = ties.nonzero().squeeze(-1)
+    C[tied_miners] = consensus_bisection(
+        W.index_select(1, tied_miners).to_dense(), S, kappa, consensus_precision, dtype=C.dtype
+    )
+    return C
@@ -0,0 +1,74 @@
+"""
+This module provides the process-pool executor used to fan independent simulations out to several cores.
+Every job is a (case, Yuma version, config) triple, results are returned in the order of the jobs,
+and a failing job is reported with its identity.
+"""
+
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TypeVar
+
+import torch
+
+from yuma_simulation._internal.cases import BaseCase
+from yuma_simulation._internal.yumas import YumaConfig
+
+JobT = TypeVar("JobT", bound="SimulationJob")
+ResultT = TypeVar("ResultT")
+
+
+@dataclass(frozen=True)
+class SimulationJob:
+    case: BaseCase
+    yuma_version: str
+    yuma_config: YumaConfig
+
+    @property
+    def name(self) -> str:
+        return f"{self.case.name} - {self.yuma_version}"
+
+
+class SimulationJobError(RuntimeError):
+    """Raised when a job fails, naming the case, Yuma version and parameters of the job."""
+
+
+def _run_job(function: Callable[[JobT], ResultT], job: JobT) -> ResultT:
+    try:
+        return function(job)
+    except Exception as error:
+        raise SimulationJobError(
+            f"Job '{job.name}' ({job.yuma_config.yuma_params}) failed: {error!r}"
+        ) from error
+
+
+def _init_worker() -> None:
+    # Jobs already run in parallel, intra-op threads would only oversubscribe the cores
+    torch.set_num_threads(1)
+
+
+def run_jobs(
+    function: Callable[[JobT], ResultT],
+    jobs: list[JobT],
+    max_workers: int | None = None,
+) -> list[ResultT]:
+    """
+    Calls function on every job and returns the results in the order of jobs.
+    Jobs run in this process when max_workers is None, otherwise in a pool of at most max_workers processes,
+    in which case function and jobs must be picklable and a failing job raises SimulationJobError.
+    """
+
+    if max_workers is None:
+        return [function(job) for job in jobs]
+    if max_workers < 1:
+        raise ValueError("Invalid max_workers.")
+
+    with ProcessPoolExecutor(
+        max_workers=min(max_workers, max(len(jobs), 1)), initializer=_init_worker
+    ) as executor:
+        futures = [executor.submit(_run_job, function, job) for job in jobs]
+        try:
+            return [future.result() for future in futures]
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
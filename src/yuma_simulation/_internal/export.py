@@ -0,0 +1,209 @@
+"""
+This module provides the columnar export of simulation results for analysis in other tools.
+Per-epoch dividends and server incentives and consensus are written as Parquet or Arrow IPC tables,
+bonds as .npy arrays that can be memory-mapped, and the case, Yuma version and config of every run
+are stored in the table schema.
+"""
+
+import json
+import os
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import torch
+
+from yuma_simulation._internal.results import SimulationResult
+from yuma_simulation._internal.yumas import YumaConfig
+
+# Key of the run metadata in the schema of exported tables
+RUNS_METADATA_KEY = b"yuma_simulation.runs"
+
+EXPORT_FORMATS = ("parquet", "arrow")
+
+
+@dataclass(frozen=True)
+class ExportedRun:
+    """A simulation result with the case, Yuma version and config that produced it."""
+
+    case_name: str
+    yuma_version: str
+    yuma_config: YumaConfig
+    result: SimulationResult
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError(
+            "Exporting tables requires pyarrow, install yuma-simulation[export]."
+        ) from error
+    return pyarrow
+
+
+def _metadata_value(value: Any) -> Any:
+    if isinstance(value, torch.Tensor):
+        return value.tolist()
+    return value
+
+
+def run_metadata(run: ExportedRun) -> dict[str, Any]:
+    """Returns the case, Yuma version and config of a run as JSON-serializable values."""
+
+    config = {
+        field.name: _metadata_value(getattr(parameters, field.name))
+        for parameters in [run.yuma_config.simulation, run.yuma_config.yuma_params]
+        for field in fields(parameters)
+    }
+    return {
+        "case": run.case_name,
+        "yuma_version": run.yuma_version,
+        "validators": run.result.validators,
+        "num_epochs": run.result.num_epochs,
+        "config": config,
+    }
+
+
+def _float64(values: torch.Tensor) -> np.ndarray:
+    return values.detach().cpu().to(torch.float64).numpy()
+
+
+def _validator_columns(runs: list[ExportedRun]) -> dict[str, np.ndarray]:
+    columns: dict[str, list[np.ndarray]] = {
+        "run": [np.zeros(0, dtype=np.int32)],
+        "epoch": [np.zeros(0, dtype=np.int32)],
+        "validator": [np.zeros(0, dtype=object)],
+        "dividend": [np.zeros(0)],
+    }
+    for index, run in enumerate(runs):
+        num_epochs, num_validators = run.result.dividends.shape
+        columns["run"].append(np.full(num_epochs * num_validators, index, dtype=np.int32))
+        columns["epoch"].append(np.repeat(np.arange(num_epochs, dtype=np.int32), num_validators))
+        columns["validator"].append(
+            np.tile(np.asarray(run.result.validators, dtype=object), num_epochs)
+        )
+        columns["dividend"].append(run.result.dividends.numpy().reshape(-1))
+    return {name: np.concatenate(values) for name, values in columns.items()}
+
+
+def _server_columns(runs: list[ExportedRun]) -> dict[str, np.ndarray]:
+    columns: dict[str, list[np.ndarray]] = {
+        "run": [np.zeros(0, dtype=np.int32)],
+        "epoch": [np.zeros(0, dtype=np.int32)],
+        "server": [np.zeros(0, dtype=np.int32)],
+        "incentive": [np.zeros(0)],
+        "consensus": [np.zeros(0)],
+    }
+    for index, run in enumerate(runs):
+        incentives = run.result.server_incentives
+        if incentives is None:
+            continue
+        num_rows, num_servers = incentives.shape
+        # Without history, the single row is the last epoch
+        first_epoch = run.result.num_epochs - num_rows
+        columns["run"].append(np.full(num_rows * num_servers, index, dtype=np.int32))
+        columns["epoch"].append(
+            np.repeat(np.arange(first_epoch, first_epoch + num_rows, dtype=np.int32), num_servers)
+        )
+        columns["server"].append(np.tile(np.arange(num_servers, dtype=np.int32), num_rows))
+        columns["incentive"].append(_float64(incentives).reshape(-1))
+        consensus = run.result.server_consensus
+        columns["consensus"].append(
+            _float64(consensus).reshape(-1)
+            if consensus is not None
+            else np.full(num_rows * num_servers, np.nan)
+        )
+    return {name: np.concatenate(values) for name, values in columns.items()}
+
+
+def _bonds_array(result: SimulationResult) -> np.ndarray | None:
+    if result.bonds is None:
+        return None
+    if isinstance(result.bonds, list):
+        if not result.bonds:
+            return None
+        return torch.stack([bonds.to_dense() for bonds in result.bonds]).cpu().numpy()
+    return result.bonds.detach().cpu().numpy()
+
+
+def _write_table(columns: dict[str, np.ndarray], metadata: bytes, path: Path, format: str) -> None:
+    pyarrow = _pyarrow()
+    arrays = {
+        name: (
+            pyarrow.array(values, type=pyarrow.string()).dictionary_encode()
+            if values.dtype == object
+            else pyarrow.array(values)
+        )
+        for name, values in columns.items()
+    }
+    table = pyarrow.table(arrays).replace_schema_metadata({RUNS_METADATA_KEY: metadata})
+    if format == "parquet":
+        pyarrow.parquet.write_table(table, path)
+    else:
+        with pyarrow.ipc.new_file(str(path), table.schema) as writer:
+            writer.write_table(table)
+
+
+def export_results(
+    runs: list[ExportedRun],
+    directory: str | os.PathLike,
+    format: str = "parquet",
+    include_bonds: bool = False,
+) -> dict[str, Path]:
+    """
+    Writes the outputs of runs into directory and returns the written paths by name.
+
+    "validators" is a table of (run, epoch, validator, dividend) rows and "servers" one of
+    (run, epoch, server, incentive, consensus) rows, in Parquet or Arrow IPC format, where run indexes runs.
+    The schema metadata of both holds the case, Yuma version and config of every run under RUNS_METADATA_KEY.
+    With include_bonds, the bonds of run i are saved as "bonds_<i>.npy" of shape [E, V, M], which
+    numpy.load(path, mmap_mode="r") maps without reading it.
+    """
+
+    if format not in EXPORT_FORMATS:
+        raise ValueError("Invalid export format.")
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    extension = "parquet" if format == "parquet" else "arrow"
+    paths: dict[str, Path] = {}
+
+    runs_metadata = [run_metadata(run) for run in runs]
+    if include_bonds:
+        for index, run in enumerate(runs):
+            bonds = _bonds_array(run.result)
+            if bonds is None:
+                continue
+            path = directory / f"bonds_{index}.npy"
+            np.save(path, bonds)
+            runs_metadata[index]["bonds_file"] = path.name
+            paths[f"bonds_{index}"] = path
+
+    metadata = json.dumps(runs_metadata).encode()
+    for name, columns in [
+        ("validators", _validator_columns(runs)),
+        ("servers", _server_columns(runs)),
+    ]:
+        path = directory / f"{name}.{extension}"
+        _write_table(columns, metadata, path, format)
+        paths[name] = path
+
+    return paths
+
+
+def load_table(path: str | os.PathLike) -> tuple[pd.DataFrame, list[dict[str, Any]]]:
+    """Reads an exported table, memory-mapping Arrow IPC files, and returns it with the metadata of its runs."""
+
+    pyarrow = _pyarrow()
+    path = Path(path)
+    if path.suffix == ".parquet":
+        table = pyarrow.parquet.read_table(path, memory_map=True)
+    else:
+        table = pyarrow.ipc.open_file(pyarrow.memory_map(str(path))).read_all()
+    runs_metadata = json.loads(table.schema.metadata[RUNS_METADATA_KEY])
+    return table.to_pandas(), runs_metadata
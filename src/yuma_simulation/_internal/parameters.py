@@ -0,0 +1,58 @@
+"""
+This module provides the helpers behind hyperparameter sweeps.
+Any numeric field of SimulationHyperparameters or YumaParams can hold a 1-D tensor of P values,
+which the kernels broadcast along the scenario dimension of inputs of shape [..., P, V, M].
+"""
+
+from dataclasses import fields, replace
+from typing import Any
+
+import torch
+
+
+def is_swept(value: Any) -> bool:
+    return isinstance(value, torch.Tensor) and value.dim() > 0
+
+
+def broadcast_parameter(value: Any, trailing_dims: int, dtype: torch.dtype | None = None) -> Any:
+    """
+    Views a swept parameter of shape [P] so that it lines up with the scenario dimension of a tensor
+    that has trailing_dims dimensions after it (e.g. 2 for [..., P, V, M], 1 for [..., P, M]).
+    A swept parameter is cast to dtype, the dtype of the tensor it is combined with, so that it rounds
+    like a Python scalar would. Scalars are returned unchanged.
+    """
+
+    if not is_swept(value):
+        return value
+    if dtype is not None:
+        value = value.to(dtype)
+    return value.view(-1, *([1] * trailing_dims))
+
+
+def sweep_size(*parameters: Any) -> int | None:
+    """Returns the number of points swept by the given parameter dataclasses, or None if nothing is swept."""
+
+    sizes = {
+        getattr(params, field.name).shape
+        for params in parameters
+        for field in fields(params)
+        if isinstance(getattr(params, field.name), torch.Tensor)
+    }
+    if not sizes:
+        return None
+    if len(sizes) != 1 or len(next(iter(sizes))) != 1:
+        raise ValueError("Swept parameters must be 1-D tensors of the same length.")
+    return next(iter(sizes))[0]
+
+
+def sweep_point(parameters: Any, index: int) -> Any:
+    """Returns a copy of a parameter dataclass with every swept field replaced by its value at index."""
+
+    return replace(
+        parameters,
+        **{
+            field.name: getattr(parameters, field.name)[index].item()
+            for field in fields(parameters)
+            if isinstance(getattr(parameters, field.name), torch.Tensor)
+        },
+    )
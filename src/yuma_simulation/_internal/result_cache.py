@@ -0,0 +1,195 @@
+"""
+This module provides a persistent, content-addressed cache of run_simulation outputs.
+Entries are keyed by a hash of the case inputs, the Yuma version, the full YumaConfig and a version tag,
+stored as one file each, and evicted least recently used first once the cache exceeds its size cap.
+"""
+
+import hashlib
+import os
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass, fields
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any
+
+import torch
+from filelock import FileLock
+
+from yuma_simulation._internal.cases import BaseCase
+from yuma_simulation._internal.yumas import YumaConfig
+
+# Bump whenever a change to the kernels alters simulation outputs or the way they are stored,
+# so that stale entries are never served
+KERNEL_VERSION = "3"
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "yuma_simulation" / "results"
+
+
+def _library_version() -> str:
+    try:
+        return version("yuma-simulation")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+CACHE_VERSION = f"{_library_version()}+kernels.{KERNEL_VERSION}"
+
+# Outputs are stored as SimulationResult.to_dict() containers
+SimulationOutput = dict[str, Any]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+def _hash_value(digest: Any, value: Any) -> None:
+    if isinstance(value, torch.Tensor):
+        if value.layout != torch.strided:
+            value = value.to_sparse_coo().coalesce()
+            digest.update(b"sparse")
+            _hash_value(digest, value.indices())
+            _hash_value(digest, value.values())
+            return
+        digest.update(f"{value.dtype}{tuple(value.shape)}".encode())
+        raw_bytes = value.detach().cpu().contiguous().reshape(-1).view(torch.uint8)
+        digest.update(raw_bytes.numpy().tobytes())
+    else:
+        digest.update(repr(value).encode())
+
+
+def simulation_key(
+    case: BaseCase,
+    yuma_version: str,
+    yuma_config: YumaConfig,
+    *extra: Any,
+    version_tag: str = CACHE_VERSION,
+) -> str:
+    """Returns the content hash identifying a simulation of a case by a Yuma version and config."""
+
+    digest = hashlib.sha256()
+    for value in [version_tag, yuma_version, case.validators, case.num_epochs]:
+        _hash_value(digest, value)
+    for value in [case.reset_bonds_epoch, case.reset_bonds_index, *extra]:
+        _hash_value(digest, value)
+
+    if hasattr(case, "epoch_chunks"):
+        for weights_chunk, stakes_chunk in case.epoch_chunks():
+            for W, S in zip(weights_chunk, stakes_chunk):
+                _hash_value(digest, W)
+                _hash_value(digest, S)
+    else:
+        for W in case.weights_epochs[: case.num_epochs]:
+            _hash_value(digest, W)
+        for S in case.stakes_epochs[: case.num_epochs]:
+            _hash_value(digest, S)
+
+    for parameters in [yuma_config.simulation, yuma_config.yuma_params]:
+        for field in fields(parameters):
+            _hash_value(digest, field.name)
+            _hash_value(digest, getattr(parameters, field.name))
+
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of run_simulation outputs, safe to share between processes.
+
+    Entries are written atomically and their modification time records their last use.
+    When the total size exceeds max_bytes, the least recently used entries are removed.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike = DEFAULT_CACHE_DIR,
+        max_bytes: int = 1 << 30,
+        version_tag: str = CACHE_VERSION,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.version_tag = version_tag
+        self.stats = CacheStats()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pt"
+
+    def _lock(self) -> FileLock:
+        return FileLock(self.directory / ".lock")
+
+    def get(self, key: str) -> SimulationOutput | None:
+        path = self._path(key)
+        try:
+            result = torch.load(path, weights_only=True)
+        except FileNotFoundError:
+            self.stats.misses += 1
+            return None
+        except Exception:
+            # An unreadable entry is dropped and recomputed
+            path.unlink(missing_ok=True)
+            self.stats.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        self.stats.hits += 1
+        return result
+
+    def put(self, key: str, result: SimulationOutput) -> None:
+        # Readers in other processes only ever see complete entries
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as file:
+            try:
+                torch.save(result, file)
+            except BaseException:
+                file.close()
+                os.unlink(file.name)
+                raise
+        os.replace(file.name, self._path(key))
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock():
+            entries = []
+            for path in self.directory.glob("*.pt"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total_bytes = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+                if total_bytes <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total_bytes -= size
+                self.stats.evictions += 1
+
+    def get_or_compute(
+        self,
+        case: BaseCase,
+        yuma_version: str,
+        yuma_config: YumaConfig,
+        compute: Callable[[], SimulationOutput],
+        *extra: Any,
+    ) -> SimulationOutput:
+        """Returns the cached outputs of a simulation, computing and storing them on a miss."""
+
+        key = simulation_key(
+            case, yuma_version, yuma_config, *extra, version_tag=self.version_tag
+        )
+        result = self.get(key)
+        if result is None:
+            result = compute()
+            self.put(key, result)
+        return result
+
+    def clear(self) -> None:
+        with self._lock():
+            for path in self.directory.glob("*.pt"):
+                path.unlink(missing_ok=True)
@@ -0,0 +1,334 @@
+"""
+This module provides the columnar container of simulation outputs.
+Dividends, incentives and bonds are written into tensors preallocated for the whole run, one row per epoch,
+and can be read back as tensors, as NumPy views or in the dict and list shapes returned by earlier releases.
+"""
+
+import os
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import torch
+
+from yuma_simulation._internal.sparse_utils import is_sparse
+
+
+def open_bond_history(
+    path: str | os.PathLike,
+    shape: tuple[int, int, int] | None = None,
+    dtype: torch.dtype | None = None,
+) -> torch.Tensor:
+    """
+    Returns a tensor of bond snapshots of shape [E, V, M] backed by a memory-mapped .npy file.
+    With a shape and dtype the file is created at its full size, otherwise an existing file is opened;
+    writes to an opened file stay in memory. Snapshots are paged in from disk only when indexed.
+    """
+
+    if shape is None:
+        array = np.load(path, mmap_mode="c")
+    else:
+        array = _create_bond_file(path, shape, dtype)
+    return torch.from_numpy(array)
+
+
+def _create_bond_file(
+    path: str | os.PathLike,
+    shape: tuple[int, int, int],
+    dtype: torch.dtype,
+) -> np.memmap:
+    numpy_dtype = torch.empty(0, dtype=dtype).numpy().dtype
+    return np.lib.format.open_memmap(path, mode="w+", dtype=numpy_dtype, shape=shape)
+
+
+def _truncate_bond_file(path: str | os.PathLike, num_rows: int) -> np.memmap:
+    """
+    Shrinks a .npy bond file to its first num_rows snapshots in place and maps it again.
+    The header keeps its padded length, as a smaller shape never needs more characters.
+    """
+
+    with open(path, "r+b") as file:
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+        data_offset = file.tell()
+        header_offset = 10 if version == (1, 0) else 12
+        header = repr(
+            {
+                "descr": np.lib.format.dtype_to_descr(dtype),
+                "fortran_order": fortran_order,
+                "shape": (num_rows, *shape[1:]),
+            }
+        )
+        file.seek(header_offset)
+        file.write(header.ljust(data_offset - header_offset - 1).encode("latin1") + b"\n")
+        file.truncate(data_offset + num_rows * int(np.prod(shape[1:])) * dtype.itemsize)
+    return np.load(path, mmap_mode="r+")
+
+
+@dataclass
+class SimulationResult:
+    """
+    Outputs of a simulation, one row per epoch.
+
+    dividends holds the dividends per 1,000 Tao of every validator, of shape [E, V] in float64.
+    server_incentives and server_consensus of shape [E, M] and bonds of shape [E, V, M] keep the dtype of the run,
+    or only hold the last epoch when keep_history is False. Sparse bonds are kept as a list of sparse tensors.
+    With a bonds_path, bonds are written into a memory-mapped .npy file there instead (see open_bond_history),
+    flushed to disk by flush and truncate.
+    Unpacks as (dividends_per_validator, bonds_per_epoch, server_incentives_per_epoch).
+    """
+
+    validators: list[str]
+    dividends: torch.Tensor
+    server_incentives: torch.Tensor | None = None
+    server_consensus: torch.Tensor | None = None
+    bonds: torch.Tensor | list[torch.Tensor] | None = None
+    keep_history: bool = True
+    bonds_path: str | os.PathLike | None = None
+    _bond_file: np.memmap | None = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def empty(
+        cls,
+        validators: list[str],
+        num_epochs: int,
+        keep_history: bool = True,
+        bonds_path: str | os.PathLike | None = None,
+    ) -> "SimulationResult":
+        """Allocates the dividends of a run, incentives and bonds are allocated by the first write."""
+
+        dividends = torch.zeros(num_epochs, len(validators), dtype=torch.float64)
+        return cls(list(validators), dividends, keep_history=keep_history, bonds_path=bonds_path)
+
+    @property
+    def num_epochs(self) -> int:
+        return self.dividends.shape[0]
+
+    def write(
+        self,
+        epoch: int,
+        dividends: torch.Tensor,
+        bonds: torch.Tensor,
+        server_incentive: torch.Tensor,
+        server_consensus: torch.Tensor | None = None,
+    ) -> None:
+        """Copies the outputs of an epoch into its rows."""
+
+        row = epoch if self.keep_history else 0
+        if self.server_incentives is None:
+            num_rows = self.num_epochs if self.keep_history else 1
+            self.server_incentives = server_incentive.new_zeros(
+                (num_rows, *server_incentive.shape)
+            )
+            if server_consensus is not None:
+                self.server_consensus = server_consensus.new_zeros(
+                    (num_rows, *server_consensus.shape)
+                )
+            if self.bonds_path is not None:
+                self._bond_file = _create_bond_file(
+                    self.bonds_path, (num_rows, *bonds.shape), bonds.dtype
+                )
+                self.bonds = torch.from_numpy(self._bond_file)
+            elif is_sparse(bonds):
+                self.bonds = []
+            else:
+                self.bonds = bonds.new_zeros((num_rows, *bonds.shape))
+
+        self.dividends[epoch] = dividends
+        self.server_incentives[row] = server_incentive
+        if self.server_consensus is not None:
+            self.server_consensus[row] = server_consensus
+        if isinstance(self.bonds, list):
+            if not self.keep_history:
+                self.bonds.clear()
+            self.bonds.append(bonds.clone())
+        else:
+            self.bonds[row] = bonds.to_dense() if is_sparse(bonds) else bonds
+
+    def flush(self) -> None:
+        """Writes the bonds held in a memory-mapped file to disk."""
+
+        if self._bond_file is not None:
+            self._bond_file.flush()
+
+    def truncate(self, num_epochs: int) -> "SimulationResult":
+        """
+        Drops the rows after the first num_epochs epochs, e.g. of a run stopped early.
+        A bond file is flushed and shrunk to the kept rows.
+        """
+
+        self.flush()
+        self.dividends = self.dividends[:num_epochs]
+        if self.keep_history and self.server_incentives is not None:
+            self.server_incentives = self.server_incentives[:num_epochs]
+            if self.server_consensus is not None:
+                self.server_consensus = self.server_consensus[:num_epochs]
+            if self._bond_file is not None and num_epochs < self._bond_file.shape[0]:
+                self.bonds = None
+                self._bond_file = _truncate_bond_file(self.bonds_path, num_epochs)
+                self.bonds = torch.from_numpy(self._bond_file)
+            else:
+                self.bonds = self.bonds[:num_epochs]
+        return self
+
+    def resized(
+        self,
+        num_epochs: int,
+        bonds_path: str | os.PathLike | None = None,
+    ) -> "SimulationResult":
+        """Returns a copy with rows for num_epochs epochs that starts with the rows of this result."""
+
+        resized = SimulationResult.empty(
+            self.validators, num_epochs, keep_history=self.keep_history, bonds_path=bonds_path
+        )
+        num_rows = min(self.num_epochs, num_epochs)
+        resized.dividends[:num_rows] = self.dividends[:num_rows]
+        if self.server_incentives is None:
+            return resized
+        if not self.keep_history:
+            num_epochs = num_rows = 1
+
+        def resize_rows(rows: torch.Tensor, allocated: torch.Tensor | None = None) -> torch.Tensor:
+            if allocated is None:
+                allocated = rows.new_zeros((num_epochs, *rows.shape[1:]))
+            allocated[:num_rows] = rows[:num_rows]
+            return allocated
+
+        resized.server_incentives = resize_rows(self.server_incentives)
+        if self.server_consensus is not None:
+            resized.server_consensus = resize_rows(self.server_consensus)
+        if bonds_path is None:
+            if isinstance(self.bonds, list):
+                resized.bonds = self.bonds[:num_rows]
+            else:
+                resized.bonds = resize_rows(self.bonds)
+            return resized
+
+        bonds = self.bonds
+        if isinstance(bonds, list):
+            bonds = torch.stack([snapshot.to_dense() for snapshot in bonds])
+        # Bonds mapped from the target file itself are copied to a new file, which then replaces it
+        replaces_source = (
+            self.bonds_path is not None
+            and os.path.exists(self.bonds_path)
+            and os.path.exists(bonds_path)
+            and os.path.samefile(self.bonds_path, bonds_path)
+        )
+        target_path = f"{bonds_path}.tmp" if replaces_source else bonds_path
+        resized._bond_file = _create_bond_file(
+            target_path, (num_epochs, *bonds.shape[1:]), bonds.dtype
+        )
+        resized.bonds = resize_rows(bonds, torch.from_numpy(resized._bond_file))
+        if replaces_source:
+            resized.flush()
+            os.replace(target_path, bonds_path)
+        return resized
+
+    def rows(self, start: int, stop: int) -> "SimulationResult":
+        """
+        Returns a compact copy of the epochs start to stop, leaving out the bonds held in a file.
+        Without keep_history, the outputs other than the dividends only hold the last epoch and are copied whole.
+        """
+
+        rows = SimulationResult(
+            self.validators, self.dividends[start:stop].clone(), keep_history=self.keep_history
+        )
+        if self.server_incentives is None:
+            return rows
+        selected = slice(start, stop) if self.keep_history else slice(None)
+        rows.server_incentives = self.server_incentives[selected].clone()
+        if self.server_consensus is not None:
+            rows.server_consensus = self.server_consensus[selected].clone()
+        if self._bond_file is None or not self.keep_history:
+            bonds = self.bonds[selected]
+            rows.bonds = [snapshot.clone() for snapshot in bonds] if isinstance(bonds, list) else bonds.clone()
+        return rows
+
+    @classmethod
+    def concatenate(cls, parts: list["SimulationResult"]) -> "SimulationResult":
+        """Joins the rows of consecutive parts, e.g. written by rows, into one result."""
+
+        first = parts[0]
+        result = cls(
+            first.validators,
+            torch.cat([part.dividends for part in parts]),
+            keep_history=first.keep_history,
+        )
+        parts = [part for part in parts if part.server_incentives is not None]
+        if not parts:
+            return result
+        if not first.keep_history:
+            result.server_incentives = parts[-1].server_incentives
+            result.server_consensus = parts[-1].server_consensus
+            result.bonds = parts[-1].bonds
+            return result
+
+        result.server_incentives = torch.cat([part.server_incentives for part in parts])
+        if parts[0].server_consensus is not None:
+            result.server_consensus = torch.cat([part.server_consensus for part in parts])
+        if isinstance(parts[0].bonds, list):
+            result.bonds = [snapshot for part in parts for snapshot in part.bonds]
+        elif parts[0].bonds is not None:
+            result.bonds = torch.cat([part.bonds for part in parts])
+        return result
+
+    def as_numpy(self) -> dict[str, np.ndarray]:
+        """Returns NumPy views of the dense outputs, sharing memory with the tensors on the CPU."""
+
+        arrays = {"dividends": self.dividends.numpy()}
+        if self.server_incentives is not None:
+            arrays["server_incentives"] = self.server_incentives.detach().cpu().numpy()
+        if self.server_consensus is not None:
+            arrays["server_consensus"] = self.server_consensus.detach().cpu().numpy()
+        if isinstance(self.bonds, torch.Tensor):
+            arrays["bonds"] = self.bonds.detach().cpu().numpy()
+        return arrays
+
+    @property
+    def dividends_per_validator(self) -> dict[str, list[float]]:
+        return dict(zip(self.validators, self.dividends.T.tolist()))
+
+    @property
+    def bonds_per_epoch(self) -> list[torch.Tensor]:
+        if self.bonds is None:
+            return []
+        return list(self.bonds)
+
+    @property
+    def server_incentives_per_epoch(self) -> list[torch.Tensor]:
+        if self.server_incentives is None:
+            return []
+        return list(self.server_incentives)
+
+    def __iter__(self) -> Iterator[Any]:
+        yield self.dividends_per_validator
+        yield self.bonds_per_epoch
+        yield self.server_incentives_per_epoch
+
+    def __len__(self) -> int:
+        return 3
+
+    def __getitem__(self, index: int | slice) -> Any:
+        """Indexes the outputs like the (dividends, bonds, incentives) triple of earlier releases."""
+
+        return tuple(self)[index]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the outputs as plain containers, loadable by torch.load(weights_only=True)."""
+
+        return {
+            "validators": self.validators,
+            "dividends": self.dividends,
+            "server_incentives": self.server_incentives,
+            "server_consensus": self.server_consensus,
+            "bonds": self.bonds,
+            "keep_history": self.keep_history,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SimulationResult":
+        return cls(**data)
@@ -3,13 +3,30 @@ This module provides functionalities to run Yuma simulations, generate charts, a
 It integrates various Yuma versions, handles different chart types, and organizes the outputs into HTML tables.
 """
 
+import functools
+import os
+from collections.abc import Callable, Collection, Iterator
+from dataclasses import dataclass, field, replace
+
 import pandas as pd
 import torch
 
-from yuma_simulation._internal.cases import BaseCase
+from yuma_simulation._internal.cases import (
+    BaseCase,
+    CaseBatch,
+    _repeated_epochs,
+)
+from yuma_simulation._internal.checkpoint import InputHash, SimulationCheckpoint, config_fields
 from yuma_simulation._internal.charts_utils import (
     _calculate_total_dividends,
 )
+from yuma_simulation._internal.compiled import resolve_backend
+from yuma_simulation._internal.executor import SimulationJob, run_jobs
+from yuma_simulation._internal.parameters import sweep_point, sweep_size
+from yuma_simulation._internal.result_cache import ResultCache
+from yuma_simulation._internal.results import SimulationResult
+from yuma_simulation._internal.sparse_utils import is_sparse, zero_columns
+from yuma_simulation._internal.workspace import YumaWorkspace
 from yuma_simulation._internal.yumas import (
     SimulationHyperparameters,
     Yuma,
@@ -20,96 +37,1065 @@ from yuma_simulation._internal.yumas import (
     YumaParams,
     YumaRust,
     YumaSimulationNames,
+    _normalize_weights,
+    _per_server,
+    _resolve_dtype,
+    _yuma_bonds,
+    yuma_consensus_stages,
 )
 
 
-def run_simulation(
-    case: BaseCase,
-    yuma_version: str,
-    yuma_config: YumaConfig,
-) -> tuple[dict[str, list[float]], list[torch.Tensor], list[torch.Tensor]]:
-    """Runs the Yuma simulation for a given case and Yuma version, returning dividends, bonds and incentive data."""
-
-    dividends_per_validator: dict[str, list[float]] = {
-        validator: [] for validator in case.validators
-    }
-    bonds_per_epoch: list[torch.Tensor] = []
-    server_incentives_per_epoch: list[torch.Tensor] = []
+# Outputs of the Yuma functions consumed by the simulation loop, everything else is skipped
+_SIMULATION_OUTPUTS = frozenset(
+    [
+        "weight",
+        "server_consensus_weight",
+        "server_incentive",
+        "validator_bonds",
+        "validator_ema_bond",
+        "validator_reward_normalized",
+    ]
+)
+
+
+@dataclass
+class SimulationState:
+    """
+    Loop state carried from one epoch to the next by a single Yuma version.
+
+    epoch counts the simulated epochs. converged, dividends and outputs are only tracked by iter_simulation:
+    whether the current run of identical inputs reached its steady state, and the dividends,
+    server incentive and recorded outputs of the last simulated epoch, repeated by a fast-forward.
+    """
+
     B_state: torch.Tensor | None = None
     W_prev: torch.Tensor | None = None
     server_consensus_weight: torch.Tensor | None = None
+    epoch: int = 0
+    converged: bool = False
+    dividends: torch.Tensor | None = None
+    outputs: dict[str, torch.Tensor] = field(default_factory=dict)
+
+
+def _reset_bonds(B_state: torch.Tensor, server_index: int) -> torch.Tensor:
+    """Zeroes all bonds held on a server, keeping sparse bond matrices sparse."""
+
+    if is_sparse(B_state):
+        return zero_columns(B_state, server_index)
+    B_state[:, server_index] = 0.0
+    return B_state
+
+
+def _reset_bonds_if_due(
+    case: BaseCase | CaseBatch,
+    epoch: int,
+    state: SimulationState,
+    conditional: bool,
+) -> None:
+    """
+    Resets the bonds on the case's reset server at its reset epoch.
+    A conditional reset only happens if that server had no consensus weight in the previous epoch.
+    Case batches hold one reset per scenario, applied as a mask.
+    """
+
+    if state.B_state is None:
+        return
+    if conditional and state.server_consensus_weight is None:
+        return
+
+    if hasattr(case, "cases"):
+        reset_index = case.reset_bonds_index
+        due = case.reset_bonds_epoch == epoch
+        if conditional:
+            due &= (
+                state.server_consensus_weight.gather(-1, reset_index.unsqueeze(-1)).squeeze(-1)
+                == 0.0
+            )
+        servers = torch.arange(state.B_state.shape[-1], device=state.B_state.device)
+        mask = due.unsqueeze(-1) & (servers == reset_index.unsqueeze(-1))
+        state.B_state.masked_fill_(mask.unsqueeze(-2), 0.0)
+        return
+
+    if epoch != case.reset_bonds_epoch:
+        return
+    if conditional and state.server_consensus_weight[case.reset_bonds_index] != 0.0:
+        return
+    state.B_state = _reset_bonds(state.B_state, case.reset_bonds_index)
+
+
+def _consensus_stages_options(
+    yuma_version: str,
+    yuma_config: YumaConfig,
+) -> tuple[torch.dtype | None, bool]:
+    """
+    Returns the consensus dtype and whether the previous epoch's weights are clipped for a Yuma version.
+    Versions returning the same options share identical bond-independent stages.
+    """
 
     simulation_names = YumaSimulationNames()
+    consensus_dtype = _resolve_dtype(yuma_config)
+    if consensus_dtype is None and yuma_version == simulation_names.YUMA_RUST:
+        consensus_dtype = torch.float64
+    return consensus_dtype, yuma_version == simulation_names.YUMA2
 
-    for epoch in range(case.num_epochs):
-        W: torch.Tensor = case.weights_epochs[epoch]
-        S: torch.Tensor = case.stakes_epochs[epoch]
-
-        stakes_tao: torch.Tensor = S * yuma_config.total_subnet_stake
-        stakes_units: torch.Tensor = stakes_tao / 1000.0
-
-        # Call the appropriate Yuma function
-        if yuma_version in [simulation_names.YUMA, simulation_names.YUMA_LIQUID]:
-            result = Yuma(W=W, S=S, B_old=B_state, config=yuma_config)
-            B_state = result["validator_ema_bond"]
-        elif yuma_version == simulation_names.YUMA2:
-            result = Yuma2(W=W, W_prev=W_prev, S=S, B_old=B_state, config=yuma_config)
-            B_state = result["validator_ema_bond"]
-            W_prev = result["weight"]
-        elif yuma_version == simulation_names.YUMA3:
-            result = Yuma3(W, S, B_old=B_state, config=yuma_config)
-            B_state = result["validator_bonds"]
-        elif yuma_version == simulation_names.YUMA31:
-            if B_state is not None and epoch == case.reset_bonds_epoch:
-                B_state[:, case.reset_bonds_index] = 0.0
-            result = Yuma3(W, S, B_old=B_state, config=yuma_config)
-            B_state = result["validator_bonds"]
-        elif yuma_version == simulation_names.YUMA32:
-            if (
-                B_state is not None
-                and epoch == case.reset_bonds_epoch
-                and server_consensus_weight is not None
-                and server_consensus_weight[case.reset_bonds_index] == 0.0
-            ):
-                B_state[:, case.reset_bonds_index] = 0.0
-            result = Yuma3(W, S, B_old=B_state, config=yuma_config)
-            B_state = result["validator_bonds"]
-            server_consensus_weight = result["server_consensus_weight"]
-        elif yuma_version in [simulation_names.YUMA4, simulation_names.YUMA4_LIQUID]:
+
+def _case_inputs(
+    case: BaseCase | CaseBatch,
+    yuma_config: YumaConfig,
+) -> tuple[torch.Tensor | list[torch.Tensor], torch.Tensor | list[torch.Tensor]]:
+    """
+    Reads the weights and stakes of a case once, cast to the configured dtype.
+    Cases with dense inputs return them stacked along a leading epoch dimension, others as lists.
+    """
+
+    # Checked by behaviour, like in _epoch_chunks
+    weights_epochs = stakes_epochs = None
+    if hasattr(case, "cases"):
+        weights_epochs, stakes_epochs = case.weights, case.stakes
+    elif hasattr(case, "stacked_inputs"):
+        weights_epochs, stakes_epochs = case.stacked_inputs()
+    if weights_epochs is None or stakes_epochs is None:
+        weights_epochs = case.weights_epochs[: case.num_epochs]
+        stakes_epochs = case.stakes_epochs[: case.num_epochs]
+
+    dtype = _resolve_dtype(yuma_config)
+    if isinstance(weights_epochs, torch.Tensor):
+        if dtype is not None:
+            weights_epochs, stakes_epochs = weights_epochs.to(dtype), stakes_epochs.to(dtype)
+        return weights_epochs, stakes_epochs
+    if dtype is not None:
+        weights_epochs = [W.to(dtype) for W in weights_epochs]
+        stakes_epochs = [S.to(dtype) for S in stakes_epochs]
+
+    return weights_epochs, stakes_epochs
+
+
+def _epoch_chunks(
+    case: BaseCase,
+    yuma_config: YumaConfig,
+) -> Iterator[tuple[torch.Tensor | list[torch.Tensor], torch.Tensor | list[torch.Tensor]]]:
+    """
+    Yields the weights and stakes of a case in chunks of consecutive epochs, cast to the configured dtype.
+    Streaming and segmented cases are read one chunk at a time, every other case is a single chunk.
+    """
+
+    # Checked by behaviour, so that cases imported through another package path are streamed too
+    if hasattr(case, "epoch_chunks"):
+        yield from case.epoch_chunks(dtype=_resolve_dtype(yuma_config))
+    else:
+        yield _case_inputs(case, yuma_config)
+
+
+def _epochs(
+    case: BaseCase,
+    yuma_config: YumaConfig,
+) -> Iterator[tuple[torch.Tensor, torch.Tensor, bool]]:
+    """
+    Yields the weights and stakes of every epoch, flagging the epochs that repeat the inputs of the previous one.
+    Only segmented inputs are flagged, comparing every epoch of a dense case would cost more than it saves.
+    """
+
+    previous_inputs: tuple[torch.Tensor, torch.Tensor] | None = None
+    for weights_epochs, stakes_epochs in _epoch_chunks(case, yuma_config):
+        if not len(weights_epochs):
+            continue
+        repeated = _repeated_epochs(
+            weights_epochs, stakes_epochs, previous_inputs, compare_values=False
+        )
+        yield from zip(weights_epochs, stakes_epochs, repeated)
+        previous_inputs = (weights_epochs[-1], stakes_epochs[-1])
+
+
+def _select_epochs(
+    epochs: torch.Tensor | list[torch.Tensor],
+    indices: list[int],
+) -> torch.Tensor | list[torch.Tensor]:
+    if isinstance(epochs, torch.Tensor):
+        return epochs[indices]
+    return [epochs[index] for index in indices]
+
+
+def _repeated_epoch_stages(
+    W: torch.Tensor,
+    S: torch.Tensor,
+    yuma_version: str,
+    yuma_config: YumaConfig,
+    W_prev: torch.Tensor | None,
+    outputs: Collection[str] = _SIMULATION_OUTPUTS,
+) -> dict[str, torch.Tensor]:
+    """
+    Computes the bond-independent stages of an epoch that repeats the inputs of the previous one.
+    They hold for every later epoch of the same run, as the previous weights clipped by Yuma 2 no longer change.
+    """
+
+    consensus_dtype, clips_previous = _consensus_stages_options(yuma_version, yuma_config)
+    return yuma_consensus_stages(
+        W,
+        S,
+        yuma_config,
+        W_prev=W_prev if clips_previous else None,
+        consensus_dtype=consensus_dtype,
+        outputs=outputs,
+    )
+
+
+def _check_scalar_config(yuma_config: YumaConfig) -> None:
+    """Raises a ValueError when a swept config reaches a runner of a single scenario."""
+
+    if sweep_size(yuma_config.simulation, yuma_config.yuma_params) is not None:
+        raise ValueError(
+            "Invalid config: swept parameters are only supported by run_sweep and run_batched_simulation."
+        )
+
+
+def _sweep_configs(yuma_config: YumaConfig, num_scenarios: int) -> list[YumaConfig]:
+    """Returns the scalar config of every scenario, taking the i-th value of each swept parameter."""
+
+    num_points = sweep_size(yuma_config.simulation, yuma_config.yuma_params)
+    if num_points is None:
+        return [yuma_config] * num_scenarios
+    if num_points != num_scenarios:
+        raise ValueError("Swept parameters must hold one value per scenario.")
+    return [
+        YumaConfig(
+            simulation=sweep_point(yuma_config.simulation, index),
+            yuma_params=sweep_point(yuma_config.yuma_params, index),
+        )
+        for index in range(num_points)
+    ]
+
+
+def _batched_consensus_stages(
+    weights_epochs: torch.Tensor | list[torch.Tensor],
+    stakes_epochs: torch.Tensor | list[torch.Tensor],
+    yuma_version: str,
+    yuma_config: YumaConfig,
+    W_prev: torch.Tensor | None = None,
+    outputs: Collection[str] = _SIMULATION_OUTPUTS,
+) -> list[dict[str, torch.Tensor]]:
+    """
+    Computes the bond-independent stages of all epochs in a single batched pass.
+    W_prev is the normalized weight of the epoch before the first one, when the epochs continue an earlier chunk.
+    """
+
+    W = weights_epochs if isinstance(weights_epochs, torch.Tensor) else torch.stack(weights_epochs)
+    S = stakes_epochs if isinstance(stakes_epochs, torch.Tensor) else torch.stack(stakes_epochs)
+    consensus_dtype, clips_previous = _consensus_stages_options(
+        yuma_version, yuma_config
+    )
+
+    W_prev_epochs: torch.Tensor | None = None
+    if clips_previous:
+        # Yuma 2 clips the previous epoch's weights, the first epoch of a run clips its own
+        W_normalized = _normalize_weights(W)
+        W_first = W_normalized[:1] if W_prev is None else W_prev.unsqueeze(0)
+        W_prev_epochs = torch.cat([W_first, W_normalized[:-1]])
+
+    stages = yuma_consensus_stages(
+        W,
+        S,
+        yuma_config,
+        W_prev=W_prev_epochs,
+        consensus_dtype=consensus_dtype,
+        outputs=outputs,
+    )
+
+    return [
+        {key: value[epoch] for key, value in stages.items()}
+        for epoch in range(len(weights_epochs))
+    ]
+
+
+def _run_epoch(
+    case: BaseCase | CaseBatch,
+    epoch: int,
+    yuma_version: str,
+    yuma_config: YumaConfig,
+    W: torch.Tensor,
+    S: torch.Tensor,
+    state: SimulationState,
+    stages: dict[str, torch.Tensor] | None = None,
+    workspace: YumaWorkspace | None = None,
+    outputs: Collection[str] = _SIMULATION_OUTPUTS,
+) -> dict[str, torch.Tensor]:
+    """Advances a Yuma version by one epoch, updating its loop state in place."""
+
+    simulation_names = YumaSimulationNames()
+
+    # Call the appropriate Yuma function
+    if yuma_version in [simulation_names.YUMA, simulation_names.YUMA_LIQUID]:
+        result = resolve_backend(Yuma, yuma_config)(
+            W=W,
+            S=S,
+            B_old=state.B_state,
+            config=yuma_config,
+            stages=stages,
+            outputs=outputs,
+            workspace=workspace,
+        )
+        state.B_state = result["validator_ema_bond"]
+    elif yuma_version == simulation_names.YUMA2:
+        result = resolve_backend(Yuma2, yuma_config)(
+            W=W,
+            W_prev=state.W_prev,
+            S=S,
+            B_old=state.B_state,
+            config=yuma_config,
+            stages=stages,
+            outputs=outputs,
+            workspace=workspace,
+        )
+        state.B_state = result["validator_ema_bond"]
+        state.W_prev = result["weight"]
+    elif yuma_version == simulation_names.YUMA3:
+        result = resolve_backend(Yuma3, yuma_config)(
+            W,
+            S,
+            B_old=state.B_state,
+            config=yuma_config,
+            stages=stages,
+            outputs=outputs,
+            workspace=workspace,
+        )
+        state.B_state = result["validator_bonds"]
+    elif yuma_version == simulation_names.YUMA31:
+        _reset_bonds_if_due(case, epoch, state, conditional=False)
+        result = resolve_backend(Yuma3, yuma_config)(
+            W,
+            S,
+            B_old=state.B_state,
+            config=yuma_config,
+            stages=stages,
+            outputs=outputs,
+            workspace=workspace,
+        )
+        state.B_state = result["validator_bonds"]
+    elif yuma_version == simulation_names.YUMA32:
+        _reset_bonds_if_due(case, epoch, state, conditional=True)
+        result = resolve_backend(Yuma3, yuma_config)(
+            W,
+            S,
+            B_old=state.B_state,
+            config=yuma_config,
+            stages=stages,
+            outputs=outputs,
+            workspace=workspace,
+        )
+        state.B_state = result["validator_bonds"]
+        state.server_consensus_weight = result["server_consensus_weight"]
+    elif yuma_version in [simulation_names.YUMA4, simulation_names.YUMA4_LIQUID]:
+        _reset_bonds_if_due(case, epoch, state, conditional=True)
+        result = resolve_backend(Yuma4, yuma_config)(
+            W,
+            S,
+            B_old=state.B_state,
+            config=yuma_config,
+            stages=stages,
+            outputs=outputs,
+            workspace=workspace,
+        )
+        state.B_state = result["validator_bonds"]
+        state.server_consensus_weight = result["server_consensus_weight"]
+    elif yuma_version == simulation_names.YUMA_RUST:
+        result = resolve_backend(YumaRust, yuma_config)(
+            W,
+            S,
+            B_old=state.B_state,
+            config=yuma_config,
+            stages=stages,
+            outputs=outputs,
+            workspace=workspace,
+        )
+        state.B_state = result["validator_ema_bond"]
+    else:
+        raise ValueError("Invalid Yuma function.")
+
+    return result
+
+
+def _validator_dividends(
+    S: torch.Tensor,
+    D_normalized: torch.Tensor,
+    yuma_config: YumaConfig,
+) -> torch.Tensor:
+    """
+    Converts normalized validator rewards into dividends per 1,000 Tao of stake, as float64.
+    The division runs in float64 like the Python floats it replaces, so the values are unchanged.
+    """
+
+    stakes_tao: torch.Tensor = S * yuma_config.total_subnet_stake
+    stakes_units: torch.Tensor = (stakes_tao / 1000.0).double()
+
+    E_i: torch.Tensor = yuma_config.validator_emission_ratio * D_normalized
+    validator_emission: torch.Tensor = (E_i * yuma_config.total_epoch_emission).double()
+
+    return torch.where(stakes_units > 1e-6, validator_emission / stakes_units, 0.0)
+
+
+def _has_converged(
+    bonds: torch.Tensor,
+    previous_bonds: torch.Tensor,
+    dividends: torch.Tensor,
+    previous_dividends: torch.Tensor,
+    tolerance: float,
+) -> bool:
+    """
+    Tells whether the bonds and dividends changed by at most tolerance over the last epoch,
+    relative to their largest magnitude. Bonds are compared per server, as the bonds of Yuma 3 are scaled
+    by the stake capacity and a small server's bonds can still grow while a large one's have converged.
+    """
+
+    if is_sparse(bonds):
+        bonds, previous_bonds = bonds.to_dense(), previous_bonds.to_dense()
+    if bonds.numel():
+        bonds_change = (bonds - previous_bonds).abs()
+        if (bonds_change > tolerance * bonds.abs().amax(dim=-2, keepdim=True)).any():
+            return False
+    if not dividends.numel():
+        return True
+    dividends_change = float((dividends - previous_dividends).abs().max())
+    return dividends_change <= tolerance * float(dividends.abs().max())
+
+
+def _fast_forward_bonds(
+    yuma_version: str,
+    yuma_config: YumaConfig,
+    stages: dict[str, torch.Tensor],
+    state: SimulationState,
+    num_epochs: int,
+) -> torch.Tensor:
+    """
+    Returns the bonds after num_epochs more epochs with unchanged inputs.
+
+    The EMA bonds of Yuma 1 and Yuma 2 follow B_k = B* + (1 - alpha)^k (B_0 - B*), where B* is the instantaneous bond
+    of the run, so they are advanced in closed form. The other versions keep their converged bonds.
+    """
+
+    simulation_names = YumaSimulationNames()
+    ema_versions = [simulation_names.YUMA, simulation_names.YUMA_LIQUID, simulation_names.YUMA2]
+    if yuma_version not in ema_versions or is_sparse(state.B_state):
+        return state.B_state
+
+    bonds = _yuma_bonds(
+        stages,
+        None,
+        yuma_config,
+        W=state.W_prev if yuma_version == simulation_names.YUMA2 else None,
+    )
+    B_target = bonds["validator_bond"]
+    decay = (1 - _per_server(bonds["bond_alpha"])) ** num_epochs
+    return (B_target + decay * (state.B_state - B_target)).to(state.B_state.dtype)
+
+
+@dataclass
+class EpochRecord:
+    """
+    Outputs of one simulated epoch, as yielded by iter_simulation.
+
+    dividends holds the dividends per 1,000 Tao of every validator, in float64.
+    bonds and the tensors of outputs may be overwritten by the next epoch, clone them to keep them.
+    fast_forwarded marks epochs skipped by the steady-state fast-forward, which repeat the previous outputs.
+    """
+
+    epoch: int
+    dividends: torch.Tensor
+    bonds: torch.Tensor
+    server_incentive: torch.Tensor
+    outputs: dict[str, torch.Tensor | float] = field(default_factory=dict)
+    fast_forwarded: bool = False
+
+
+def iter_simulation(
+    case: BaseCase,
+    yuma_version: str,
+    yuma_config: YumaConfig,
+    two_phase: bool = False,
+    workspace: YumaWorkspace | None = None,
+    steady_state_tolerance: float | None = None,
+    outputs: Collection[str] = (),
+    state: SimulationState | None = None,
+) -> Iterator[EpochRecord]:
+    """
+    Runs the Yuma simulation for a given case and Yuma version, yielding an EpochRecord as each epoch completes.
+    outputs names further results of the Yuma function to include in the records (e.g. "server_consensus_weight").
+    Nothing is accumulated, so consumers can aggregate, write out or stop at any epoch.
+    A given state is updated in place and, when it already counts simulated epochs, the run continues after them.
+    It is consistent with the epochs yielded so far except while fast-forwarded records are yielded.
+    The other options are those of run_simulation.
+    """
+
+    _check_scalar_config(yuma_config)
+    simulation_outputs = _SIMULATION_OUTPUTS.union(outputs)
+    if state is None:
+        state = SimulationState()
+    start_epoch = state.epoch
+    chunk_start = 0
+    previous_inputs: tuple[torch.Tensor, torch.Tensor] | None = None
+    run_stages: dict[str, torch.Tensor] | None = None
+    previous_bonds: torch.Tensor | None = None
+    _, clips_previous = _consensus_stages_options(yuma_version, yuma_config)
+
+    simulation_names = YumaSimulationNames()
+    reset_epoch: int | None = None
+    if yuma_version in [
+        simulation_names.YUMA31,
+        simulation_names.YUMA32,
+        simulation_names.YUMA4,
+        simulation_names.YUMA4_LIQUID,
+    ]:
+        reset_epoch = case.reset_bonds_epoch
+
+    for weights_epochs, stakes_epochs in _epoch_chunks(case, yuma_config):
+        # Epochs already simulated by the given state are skipped
+        num_done = min(max(start_epoch - chunk_start, 0), len(weights_epochs))
+        chunk_start += len(weights_epochs)
+        if num_done:
+            previous_inputs = (weights_epochs[num_done - 1], stakes_epochs[num_done - 1])
+            weights_epochs, stakes_epochs = weights_epochs[num_done:], stakes_epochs[num_done:]
+        if not len(weights_epochs):
+            continue
+        if workspace is None and not is_sparse(weights_epochs[0]):
+            workspace = YumaWorkspace(
+                *weights_epochs[0].shape, device=weights_epochs[0].device
+            )
+        # Equal epochs are only searched for when a steady state may be fast-forwarded,
+        # segmented inputs are flagged from their layout
+        repeated = _repeated_epochs(
+            weights_epochs,
+            stakes_epochs,
+            previous_inputs,
+            compare_values=steady_state_tolerance is not None,
+        )
+        previous_inputs = (weights_epochs[-1], stakes_epochs[-1])
+
+        stages_per_epoch: dict[int, dict[str, torch.Tensor]] = {}
+        run_starts = [index for index, is_repeat in enumerate(repeated) if not is_repeat]
+        if two_phase and run_starts:
+            # The epoch before a run start ends the previous run, so the run starts chain like consecutive epochs
+            stages_per_epoch = dict(
+                zip(
+                    run_starts,
+                    _batched_consensus_stages(
+                        _select_epochs(weights_epochs, run_starts),
+                        _select_epochs(stakes_epochs, run_starts),
+                        yuma_version,
+                        yuma_config,
+                        W_prev=state.W_prev,
+                        outputs=simulation_outputs,
+                    ),
+                )
+            )
+
+        chunk_epoch = 0
+        while chunk_epoch < len(weights_epochs):
+            W: torch.Tensor = weights_epochs[chunk_epoch]
+            S: torch.Tensor = stakes_epochs[chunk_epoch]
+            if repeated[chunk_epoch]:
+                if run_stages is None and not clips_previous:
+                    # The stages batched for the run start hold for its repeats, unless Yuma 2 clips the previous weights
+                    run_stages = stages_per_epoch.get(chunk_epoch - 1)
+                if run_stages is None:
+                    run_stages = _repeated_epoch_stages(
+                        W, S, yuma_version, yuma_config, state.W_prev, outputs=simulation_outputs
+                    )
+                stages = run_stages
+            else:
+                run_stages = None
+                state.converged = False
+                stages = stages_per_epoch.get(chunk_epoch)
+
+            if state.converged:
+                # === Fast-forward ===
+                run_end = next(
+                    (index for index in range(chunk_epoch, len(repeated)) if not repeated[index]),
+                    len(repeated),
+                )
+                if reset_epoch is not None and reset_epoch >= state.epoch:
+                    run_end = min(run_end, chunk_epoch + reset_epoch - state.epoch)
+                num_skipped = run_end - chunk_epoch
+                if num_skipped > 0:
+                    B_converged = state.B_state
+                    state.B_state = _fast_forward_bonds(
+                        yuma_version, yuma_config, stages, state, num_skipped
+                    )
+                    record_outputs = {
+                        name: state.outputs[name] for name in outputs if name in state.outputs
+                    }
+                    first_skipped = state.epoch
+                    for skipped in range(num_skipped):
+                        last = skipped == num_skipped - 1
+                        if last:
+                            state.epoch = first_skipped + num_skipped
+                        yield EpochRecord(
+                            epoch=first_skipped + skipped,
+                            dividends=state.dividends,
+                            bonds=state.B_state if last else B_converged,
+                            server_incentive=state.outputs["server_incentive"],
+                            outputs=record_outputs,
+                            fast_forwarded=True,
+                        )
+                    chunk_epoch = run_end
+                    continue
+
+            detect_convergence = steady_state_tolerance is not None and repeated[chunk_epoch]
+            if detect_convergence:
+                previous_bonds = state.B_state.clone()
+
+            result = _run_epoch(
+                case,
+                state.epoch,
+                yuma_version,
+                yuma_config,
+                W,
+                S,
+                state,
+                stages=stages,
+                workspace=workspace,
+                outputs=simulation_outputs,
+            )
+
+            previous_dividends = state.dividends
+            state.dividends = _validator_dividends(
+                S, result["validator_reward_normalized"], yuma_config
+            )
+            if detect_convergence:
+                state.converged = _has_converged(
+                    state.B_state,
+                    previous_bonds,
+                    state.dividends,
+                    previous_dividends,
+                    steady_state_tolerance,
+                )
+
+            record_outputs = {name: result[name] for name in outputs if name in result}
+            state.outputs = {"server_incentive": result["server_incentive"], **record_outputs}
+            record = EpochRecord(
+                epoch=state.epoch,
+                dividends=state.dividends,
+                bonds=state.B_state,
+                server_incentive=result["server_incentive"],
+                outputs=record_outputs,
+            )
+            state.epoch += 1
+            yield record
+            chunk_epoch += 1
+
+
+def run_simulation(
+    case: BaseCase,
+    yuma_version: str,
+    yuma_config: YumaConfig,
+    two_phase: bool = False,
+    workspace: YumaWorkspace | None = None,
+    cache: ResultCache | None = None,
+    keep_history: bool = True,
+    steady_state_tolerance: float | None = None,
+    on_epoch: Callable[[EpochRecord], bool | None] | None = None,
+    bonds_path: str | os.PathLike | None = None,
+    checkpoint_path: str | os.PathLike | None = None,
+    checkpoint_every: int | None = None,
+) -> SimulationResult:
+    """
+    Runs the Yuma simulation for a given case and Yuma version, returning dividends, bonds and incentive data
+    as a SimulationResult, which also unpacks as (dividends_per_validator, bonds_per_epoch, server_incentives_per_epoch).
+
+    With two_phase=True, the stages that do not depend on bonds are first computed for all epochs at once,
+    or for one chunk at a time for streaming cases, and the epoch loop only runs the bond recurrence and the dividends.
+    Dense cases write their V x M intermediates into a workspace, allocated for the run unless one is given
+    so that it can be reused across runs of the same shape.
+    With a cache, outputs already computed for the same inputs, version and config are loaded instead.
+    With keep_history=False, only the bonds and incentives of the last epoch are returned.
+    With a bonds_path, the bond history is written to a memory-mapped .npy file as the epochs complete,
+    so that its size is bounded by the disk rather than the memory; cached runs are copied to the file.
+    The file is flushed when the run ends or stops, and shrunk to the simulated epochs.
+    Runs of epochs with identical inputs (e.g. the segments of a SegmentedCase) compute their
+    bond-independent stages once.
+    on_epoch is called with the EpochRecord of every epoch as it completes, returning True stops the run
+    and returns the outputs of the epochs simulated so far. A cached run does not call it.
+    With a checkpoint_path, a SimulationCheckpoint is written there every checkpoint_every epochs and when
+    the run ends, from which resume_simulation continues the run. Each checkpoint saves the loop state and
+    appends the outputs of the epochs simulated since the previous one, a bond file is flushed instead of copied.
+    No checkpoint is written in the middle of a fast-forward.
+
+    With a steady_state_tolerance, a run of identical inputs is fast-forwarded once bonds and dividends change by
+    at most that fraction of their largest value in one epoch: the skipped epochs repeat the last dividends,
+    bonds and incentives, up to the next input change, bond reset or the end of the case.
+    Yuma 1 and Yuma 2 carry their bonds past the skipped epochs in closed form, so only the recorded epochs are
+    approximate; the other versions carry their converged bonds. Bonds contracting at a rate c per epoch
+    (c = 1 - bond_alpha for the EMA and relative bonds, 1 - decay_rate for Yuma 3) stay within
+    tolerance * c / (1 - c) of the values they would reach, relative to their largest value,
+    and dividends within the same bound.
+    """
+
+    _check_scalar_config(yuma_config)
+    if cache is not None:
+        result = SimulationResult.from_dict(
+            cache.get_or_compute(
+                case,
+                yuma_version,
+                yuma_config,
+                lambda: run_simulation(
+                    case,
+                    yuma_version,
+                    yuma_config,
+                    two_phase=two_phase,
+                    workspace=workspace,
+                    keep_history=keep_history,
+                    steady_state_tolerance=steady_state_tolerance,
+                ).to_dict(),
+                two_phase,
+                keep_history,
+                steady_state_tolerance,
+            )
+        )
+        if bonds_path is not None:
+            result = result.resized(result.num_epochs, bonds_path=bonds_path)
+            result.flush()
+        return result
+
+    result = SimulationResult.empty(
+        case.validators, case.num_epochs, keep_history=keep_history, bonds_path=bonds_path
+    )
+    checkpoint = None
+    if checkpoint_path is not None:
+        checkpoint = SimulationCheckpoint(
+            yuma_version=yuma_version,
+            validators=list(case.validators),
+            config=config_fields(yuma_config),
+            keep_history=keep_history,
+            bonds_path=None if bonds_path is None else str(bonds_path),
+        )
+    return _simulate(
+        case,
+        yuma_version,
+        yuma_config,
+        SimulationState(),
+        result,
+        two_phase=two_phase,
+        workspace=workspace,
+        steady_state_tolerance=steady_state_tolerance,
+        on_epoch=on_epoch,
+        checkpoint_path=checkpoint_path,
+        checkpoint_every=checkpoint_every,
+        checkpoint=checkpoint,
+    )
+
+
+def resume_simulation(
+    case: BaseCase,
+    yuma_version: str,
+    yuma_config: YumaConfig,
+    checkpoint_path: str | os.PathLike,
+    two_phase: bool = False,
+    workspace: YumaWorkspace | None = None,
+    steady_state_tolerance: float | None = None,
+    on_epoch: Callable[[EpochRecord], bool | None] | None = None,
+    bonds_path: str | os.PathLike | None = None,
+    checkpoint_every: int | None = None,
+) -> SimulationResult:
+    """
+    Continues the run_simulation that wrote the checkpoint at checkpoint_path from its last simulated epoch,
+    returning the same outputs as an uninterrupted run. New checkpoints are written to the same path.
+
+    The case may have more epochs than the checkpointed run, e.g. to extend a finished 40-epoch run to 400 epochs,
+    provided its earlier epochs have the same inputs, which is checked against the hash stored in the checkpoint.
+    The bonds of a run that wrote them to a bonds_path are read back from that file, which may also be the
+    bonds_path of the resumed run. The remaining options are those of run_simulation,
+    and keep_history is the one of the checkpointed run.
+    """
+
+    checkpoint = SimulationCheckpoint.load(checkpoint_path)
+    if checkpoint.epoch > case.num_epochs:
+        raise ValueError("Invalid checkpoint: it is past the last epoch of the case.")
+    input_hash = _input_hash(case, yuma_config)
+    checkpoint.check(case.validators, yuma_version, yuma_config, input_hash)
+
+    result = checkpoint.result(checkpoint_path).resized(case.num_epochs, bonds_path=bonds_path)
+    bonds_path = None if bonds_path is None else str(bonds_path)
+    if bonds_path != checkpoint.bonds_path:
+        # The bonds move to or from a file, so the simulated rows are written again where the new run keeps them
+        checkpoint.bonds_path = bonds_path
+        checkpoint.segments = []
+        if checkpoint.epoch:
+            result.flush()
+            checkpoint.append_rows(checkpoint_path, result.rows(0, checkpoint.epoch), start=0)
+
+    return _simulate(
+        case,
+        yuma_version,
+        yuma_config,
+        SimulationState(**checkpoint.state),
+        result,
+        two_phase=two_phase,
+        workspace=workspace,
+        steady_state_tolerance=steady_state_tolerance,
+        on_epoch=on_epoch,
+        checkpoint_path=checkpoint_path,
+        checkpoint_every=checkpoint_every,
+        checkpoint=checkpoint,
+        input_hash=input_hash,
+    )
+
+
+def _input_hash(case: BaseCase, yuma_config: YumaConfig) -> InputHash:
+    return InputHash(case, ((W, S) for W, S, _ in _epochs(case, yuma_config)))
+
+
+def _save_checkpoint(
+    path: str | os.PathLike,
+    checkpoint: SimulationCheckpoint,
+    input_hash: InputHash,
+    state: SimulationState,
+    result: SimulationResult,
+) -> None:
+    """Appends the rows simulated since the last checkpoint and saves the loop state after them."""
+
+    if state.epoch > checkpoint.epoch:
+        result.flush()
+        checkpoint.append_rows(path, result.rows(checkpoint.epoch, state.epoch), start=checkpoint.epoch)
+    checkpoint.state = {name: getattr(state, name) for name in SimulationState.__dataclass_fields__}
+    checkpoint.input_hash = input_hash.advance(state.epoch)
+    checkpoint.save(path)
+
+
+def _simulate(
+    case: BaseCase,
+    yuma_version: str,
+    yuma_config: YumaConfig,
+    state: SimulationState,
+    result: SimulationResult,
+    two_phase: bool = False,
+    workspace: YumaWorkspace | None = None,
+    steady_state_tolerance: float | None = None,
+    on_epoch: Callable[[EpochRecord], bool | None] | None = None,
+    checkpoint_path: str | os.PathLike | None = None,
+    checkpoint_every: int | None = None,
+    checkpoint: SimulationCheckpoint | None = None,
+    input_hash: InputHash | None = None,
+) -> SimulationResult:
+    """
+    Simulates the epochs of a case after those counted by state, writing their outputs into result.
+    With a checkpoint_path, checkpoint continues the given checkpoint, whose inputs were hashed by input_hash.
+    """
+
+    if checkpoint_every is not None and checkpoint_every < 1:
+        raise ValueError("Invalid checkpoint_every.")
+    if checkpoint_path is not None and input_hash is None:
+        input_hash = _input_hash(case, yuma_config)
+
+    try:
+        for record in iter_simulation(
+            case,
+            yuma_version,
+            yuma_config,
+            two_phase=two_phase,
+            workspace=workspace,
+            steady_state_tolerance=steady_state_tolerance,
+            outputs=["server_consensus_weight"],
+            state=state,
+        ):
+            result.write(
+                record.epoch,
+                record.dividends,
+                record.bonds,
+                record.server_incentive,
+                record.outputs["server_consensus_weight"],
+            )
+            # The state matches the records except in the middle of a fast-forward
+            consistent = state.epoch == record.epoch + 1
             if (
-                B_state is not None
-                and epoch == case.reset_bonds_epoch
-                and server_consensus_weight is not None
-                and server_consensus_weight[case.reset_bonds_index] == 0.0
+                checkpoint_path is not None
+                and checkpoint_every is not None
+                and consistent
+                and state.epoch - checkpoint.epoch >= checkpoint_every
             ):
-                B_state[:, case.reset_bonds_index] = 0.0
-            result = Yuma4(W, S, B_old=B_state, config=yuma_config)
-            B_state = result["validator_bonds"]
-            server_consensus_weight = result["server_consensus_weight"]
-        elif yuma_version == "Yuma 0 (subtensor)":
-            result = YumaRust(W, S, B_old=B_state, config=yuma_config)
-            B_state = result["validator_ema_bond"]
-        else:
-            raise ValueError("Invalid Yuma function.")
-
-        D_normalized: torch.Tensor = result["validator_reward_normalized"]
-
-        E_i: torch.Tensor = yuma_config.validator_emission_ratio * D_normalized
-        validator_emission: torch.Tensor = E_i * yuma_config.total_epoch_emission
-
-        for i, validator in enumerate(case.validators):
-            stake_unit = float(stakes_units[i].item())
-            validator_emission_i = float(validator_emission[i].item())
-            if stake_unit > 1e-6:
-                dividend_per_1000_tao = validator_emission_i / stake_unit
-            else:
-                dividend_per_1000_tao = 0.0
-            dividends_per_validator[validator].append(dividend_per_1000_tao)
+                _save_checkpoint(checkpoint_path, checkpoint, input_hash, state, result)
+            if on_epoch is not None and on_epoch(record):
+                if checkpoint_path is not None and consistent:
+                    _save_checkpoint(checkpoint_path, checkpoint, input_hash, state, result)
+                return result.truncate(record.epoch + 1)
+    except BaseException:
+        # Keeps the bonds of the simulated epochs on disk when the run is cut short
+        result.flush()
+        raise
+
+    if checkpoint_path is not None:
+        _save_checkpoint(checkpoint_path, checkpoint, input_hash, state, result)
+    # Streaming cases may yield fewer epochs than the num_epochs the buffers were allocated for
+    return result.truncate(state.epoch)
+
+
+def run_batched_simulation(
+    cases: list[BaseCase],
+    yuma_version: str,
+    yuma_config: YumaConfig,
+    two_phase: bool = False,
+    workspace: YumaWorkspace | None = None,
+) -> list[SimulationResult]:
+    """
+    Runs the Yuma simulation for several cases of the same shape at once, stacked along a leading scenario dimension.
+    Swept parameters of yuma_config (1-D tensors) hold one value per case.
+    Returns the outputs of run_simulation for each case, in the order of cases.
+    """
+
+    batch = CaseBatch(cases)
+    scenario_configs = _sweep_configs(yuma_config, len(cases))
+    state = SimulationState()
+    outputs = [SimulationResult.empty(case.validators, batch.num_epochs) for case in cases]
+
+    weights_epochs, stakes_epochs = _case_inputs(batch, yuma_config)
+    if workspace is None and not is_sparse(weights_epochs[0]):
+        num_scenarios, num_validators, num_servers = weights_epochs[0].shape
+        workspace = YumaWorkspace(
+            num_validators,
+            num_servers,
+            device=weights_epochs[0].device,
+            batch_shape=(num_scenarios,),
+        )
+
+    stages_per_epoch: list[dict[str, torch.Tensor]] | None = None
+    if two_phase:
+        stages_per_epoch = _batched_consensus_stages(
+            weights_epochs, stakes_epochs, yuma_version, yuma_config
+        )
+
+    for epoch in range(batch.num_epochs):
+        W: torch.Tensor = weights_epochs[epoch]
+        S: torch.Tensor = stakes_epochs[epoch]
+        stages = stages_per_epoch[epoch] if stages_per_epoch is not None else None
+
+        result = _run_epoch(
+            batch,
+            epoch,
+            yuma_version,
+            yuma_config,
+            W,
+            S,
+            state,
+            stages=stages,
+            workspace=workspace,
+        )
+
+        for scenario, (scenario_config, output) in enumerate(zip(scenario_configs, outputs)):
+            dividends = _validator_dividends(
+                S[scenario],
+                result["validator_reward_normalized"][scenario],
+                scenario_config,
+            )
+            output.write(
+                epoch,
+                dividends,
+                state.B_state[scenario],
+                result["server_incentive"][scenario],
+                result["server_consensus_weight"][scenario],
+            )
 
-        bonds_per_epoch.append(B_state.clone())
-        server_incentives_per_epoch.append(result["server_incentive"])
+    return outputs
 
-    return dividends_per_validator, bonds_per_epoch, server_incentives_per_epoch
+
+def run_sweep(
+    case: BaseCase,
+    yuma_version: str,
+    yuma_config: YumaConfig,
+    two_phase: bool = False,
+) -> list[SimulationResult]:
+    """
+    Runs a case over a grid of hyperparameters in one batched epoch loop.
+
+    Numeric fields of yuma_config.simulation and yuma_config.yuma_params may be 1-D tensors of the same length,
+    every other field is shared by the grid. Returns the outputs of run_simulation for each grid point.
+    """
+
+    num_points = sweep_size(yuma_config.simulation, yuma_config.yuma_params)
+    return run_batched_simulation(
+        [case] * (num_points or 1), yuma_version, yuma_config, two_phase=two_phase
+    )
+
+
+def run_simulations(
+    case: BaseCase,
+    yuma_versions: list[tuple[str, YumaParams]],
+    simulation_hyperparameters: SimulationHyperparameters,
+    keep_history: bool = True,
+) -> list[SimulationResult]:
+    """
+    Runs several Yuma versions over a case in a single pass over the epochs.
+
+    The bond-independent stages are computed once per epoch and shared by every version that agrees on them,
+    each version then advances its own bond state. Returns the outputs of run_simulation in the order of yuma_versions.
+    """
+
+    if not yuma_versions:
+        return []
+
+    yuma_configs = [
+        YumaConfig(simulation=simulation_hyperparameters, yuma_params=yuma_params)
+        for _, yuma_params in yuma_versions
+    ]
+    for yuma_config in yuma_configs:
+        _check_scalar_config(yuma_config)
+    states = [SimulationState() for _ in yuma_versions]
+    outputs = [
+        SimulationResult.empty(case.validators, case.num_epochs, keep_history=keep_history)
+        for _ in yuma_versions
+    ]
+
+    # Weights and stakes only depend on the simulation hyperparameters, which all configs share
+    W_prev: torch.Tensor | None = None
+    num_simulated = 0
+    run_stages: dict[tuple[torch.dtype | None, bool], dict[str, torch.Tensor]] = {}
+
+    for epoch, (W, S, is_repeat) in enumerate(_epochs(case, yuma_configs[0])):
+        # Within a run of identical inputs, the stages computed at its first repeated epoch hold until it ends
+        if not is_repeat:
+            run_stages = {}
+        shared_stages = run_stages if is_repeat else {}
+
+        for (yuma_version, _), yuma_config, state, output in zip(
+            yuma_versions, yuma_configs, states, outputs
+        ):
+            consensus_dtype, clips_previous = _consensus_stages_options(
+                yuma_version, yuma_config
+            )
+            stages_key = (consensus_dtype, clips_previous)
+            if stages_key not in shared_stages:
+                shared_stages[stages_key] = yuma_consensus_stages(
+                    W,
+                    S,
+                    yuma_config,
+                    W_prev=W_prev if clips_previous else None,
+                    consensus_dtype=consensus_dtype,
+                    outputs=_SIMULATION_OUTPUTS,
+                )
+
+            result = _run_epoch(
+                case,
+                epoch,
+                yuma_version,
+                yuma_config,
+                W,
+                S,
+                state,
+                stages=shared_stages[stages_key],
+            )
+
+            dividends = _validator_dividends(
+                S, result["validator_reward_normalized"], yuma_config
+            )
+            output.write(
+                epoch,
+                dividends,
+                state.B_state,
+                result["server_incentive"],
+                result["server_consensus_weight"],
+            )
+
+        if shared_stages:
+            W_prev = next(iter(shared_stages.values()))["weight"]
+        num_simulated = epoch + 1
+
+    # Streaming cases may yield fewer epochs than the num_epochs the buffers were allocated for
+    return [output.truncate(num_simulated) for output in outputs]
 
 
 def _generate_draggable_html_table(
@@ -316,12 +1302,71 @@ def _generate_ipynb_table(
     return custom_css + html_table
 
 
+def _simulate_job(
+    job: SimulationJob,
+    cache: ResultCache | None = None,
+    keep_history: bool = True,
+) -> SimulationResult:
+    return run_simulation(
+        job.case, job.yuma_version, job.yuma_config, cache=cache, keep_history=keep_history
+    )
+
+
+def _simulate_cases(
+    cases: list[BaseCase],
+    yuma_versions: list[tuple[str, YumaParams]],
+    simulation_hyperparameters: SimulationHyperparameters,
+    max_workers: int | None = None,
+    cache: ResultCache | None = None,
+    keep_history: bool = True,
+) -> list[list[SimulationResult]]:
+    """
+    Returns the run_simulation outputs of every case and Yuma version, grouped per case.
+    Without max_workers or cache, each case runs all versions in a single pass, otherwise every
+    (case, version) pair is a separate job, run in a process pool when max_workers is given.
+    """
+
+    if max_workers is None and cache is None:
+        return [
+            run_simulations(
+                case, yuma_versions, simulation_hyperparameters, keep_history=keep_history
+            )
+            for case in cases
+        ]
+
+    jobs = [
+        SimulationJob(
+            case,
+            yuma_version,
+            YumaConfig(simulation=simulation_hyperparameters, yuma_params=yuma_params),
+        )
+        for case in cases
+        for yuma_version, yuma_params in yuma_versions
+    ]
+    results = run_jobs(
+        functools.partial(_simulate_job, cache=cache, keep_history=keep_history),
+        jobs,
+        max_workers=max_workers,
+    )
+    num_versions = len(yuma_versions)
+    return [
+        results[index * num_versions : (index + 1) * num_versions]
+        for index in range(len(cases))
+    ]
+
+
 def generate_total_dividends_table(
     cases: list[BaseCase],
     yuma_versions: list[tuple[str, YumaParams]],
     simulation_hyperparameters: SimulationHyperparameters,
+    max_workers: int | None = None,
+    cache: ResultCache | None = None,
 ) -> pd.DataFrame:
-    """Generates a DataFrame of total dividends for standardized validator names across Yuma versions."""
+    """
+    Generates a DataFrame of total dividends for standardized validator names across Yuma versions.
+    With max_workers, the simulations run in a pool of at most max_workers processes.
+    With a cache, simulations already stored in it are not recomputed.
+    """
 
     standardized_validators = ["Validator A", "Validator B", "Validator C"]
     rows: list[dict[str, object]] = []
@@ -330,6 +1375,16 @@ def generate_total_dividends_table(
         if len(case.validators) != 3:
             raise ValueError(f"Case '{case.name}' does not have exactly 3 validators.")
 
+    simulation_results_per_case = _simulate_cases(
+        cases,
+        yuma_versions,
+        simulation_hyperparameters,
+        max_workers=max_workers,
+        cache=cache,
+        keep_history=False,
+    )
+
+    for case, simulation_results in zip(cases, simulation_results_per_case):
         validator_mapping = {
             case.validators[0]: "Validator A",
             case.validators[1]: "Validator B",
@@ -338,18 +1393,9 @@ def generate_total_dividends_table(
 
         row: dict[str, object] = {"Case": case.name}
 
-        for yuma_version, yuma_params in yuma_versions:
-            yuma_config = YumaConfig(
-                simulation=simulation_hyperparameters,
-                yuma_params=yuma_params,
-            )
-
-            dividends_per_validator, _, _ = run_simulation(
-                case=case,
-                yuma_version=yuma_version,
-                yuma_config=yuma_config,
-            )
-
+        for (yuma_version, _), (dividends_per_validator, _, _) in zip(
+            yuma_versions, simulation_results
+        ):
             total_dividends, _ = _calculate_total_dividends(
                 validators=case.validators,
                 dividends_per_validator=dividends_per_validator,
@@ -379,3 +1425,46 @@ def generate_total_dividends_table(
     df = df[columns]
 
     return df
+
+
+def generate_precision_report(
+    cases: list[BaseCase],
+    yuma_versions: list[tuple[str, YumaParams]],
+    simulation_hyperparameters: SimulationHyperparameters,
+) -> pd.DataFrame:
+    """Compares per-epoch dividends simulated in float32 against float64 for every case and Yuma version."""
+
+    rows: list[dict[str, object]] = []
+
+    for case in cases:
+        for yuma_version, yuma_params in yuma_versions:
+            dividends_per_dtype: dict[str, torch.Tensor] = {}
+            for dtype in ["float32", "float64"]:
+                yuma_config = YumaConfig(
+                    simulation=replace(simulation_hyperparameters, dtype=dtype),
+                    yuma_params=yuma_params,
+                )
+                # Dividends of shape [V, E]
+                dividends_per_dtype[dtype] = run_simulation(
+                    case=case,
+                    yuma_version=yuma_version,
+                    yuma_config=yuma_config,
+                ).dividends.T
+
+            dividends_32 = dividends_per_dtype["float32"]
+            dividends_64 = dividends_per_dtype["float64"]
+            abs_diff = (dividends_32 - dividends_64).abs()
+            rel_diff = abs_diff / dividends_64.abs().clamp(min=1e-12)
+            total_diff = (dividends_32.sum(dim=1) - dividends_64.sum(dim=1)).abs()
+
+            rows.append(
+                {
+                    "Case": case.name,
+                    "Yuma version": yuma_version,
+                    "Max abs. dividend diff": abs_diff.max().item(),
+                    "Max rel. dividend diff": rel_diff.max().item(),
+                    "Max total dividend diff": total_diff.max().item(),
+                }
+            )
+
+    return pd.DataFrame(rows)
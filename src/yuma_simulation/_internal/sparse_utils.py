@@ -0,0 +1,309 @@
+"""
+This module provides sparse counterparts of the Yuma stages and bond updates.
+Weights and bonds are kept as coalesced COO tensors and every V x M quantity is computed over the stored entries only,
+so memory and time scale with the number of non-zero weights instead of V x M.
+"""
+
+from collections.abc import Collection
+
+import torch
+
+from yuma_simulation._internal.consensus import consensus_sparse, quantize_consensus
+
+
+def is_sparse(X: torch.Tensor) -> bool:
+    return X.layout in (torch.sparse_coo, torch.sparse_csr)
+
+
+def to_coo(X: torch.Tensor) -> torch.Tensor:
+    """Converts a sparse CSR or COO tensor into a coalesced COO tensor."""
+
+    if X.layout == torch.sparse_csr:
+        X = X.to_sparse_coo()
+    return X.coalesce()
+
+
+def _with_values(X: torch.Tensor, values: torch.Tensor) -> torch.Tensor:
+    """Builds a sparse tensor with the support of the coalesced X and the given values."""
+
+    return torch.sparse_coo_tensor(X.indices(), values, X.shape, is_coalesced=True)
+
+
+def _row_sum(X: torch.Tensor, values: torch.Tensor | None = None) -> torch.Tensor:
+    if values is None:
+        values = X.values()
+    return values.new_zeros(X.shape[0]).index_add_(0, X.indices()[0], values)
+
+
+def _column_sum(X: torch.Tensor, values: torch.Tensor | None = None) -> torch.Tensor:
+    if values is None:
+        values = X.values()
+    return values.new_zeros(X.shape[1]).index_add_(0, X.indices()[1], values)
+
+
+def _per_column(value: torch.Tensor | float, cols: torch.Tensor) -> torch.Tensor | float:
+    """Expands a per-miner parameter (e.g. liquid bond alpha) onto the stored entries."""
+
+    if isinstance(value, torch.Tensor) and value.dim() > 0:
+        return value[cols]
+    return value
+
+
+def _align(
+    X: torch.Tensor, Y: torch.Tensor | None
+) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    """Returns the union support of X and Y with the values of both on it, zero where an entry is missing."""
+
+    X = to_coo(X)
+    x_values = X.values()
+    if Y is None:
+        return X.indices(), x_values, torch.zeros_like(x_values)
+
+    Y = to_coo(Y)
+    y_values = Y.values().to(x_values.dtype)
+    stacked = torch.cat(
+        [
+            torch.stack([x_values, torch.zeros_like(x_values)], dim=1),
+            torch.stack([torch.zeros_like(y_values), y_values], dim=1),
+        ]
+    )
+    union = torch.sparse_coo_tensor(
+        torch.cat([X.indices(), Y.indices()], dim=1), stacked, (*X.shape, 2)
+    ).coalesce()
+    return union.indices(), union.values()[:, 0], union.values()[:, 1]
+
+
+def zero_columns(X: torch.Tensor, index: int) -> torch.Tensor:
+    """Sparse equivalent of X[:, index] = 0.0."""
+
+    X = to_coo(X)
+    return _with_values(X, X.values().masked_fill(X.indices()[1] == index, 0.0))
+
+
+def sparse_consensus_stages(
+    W: torch.Tensor,
+    S: torch.Tensor,
+    kappa: float,
+    consensus_precision: int,
+    W_prev: torch.Tensor | None = None,
+    consensus_dtype: torch.dtype | None = None,
+    outputs: Collection[str] | None = None,
+    dtype: torch.dtype | None = None,
+) -> dict[str, torch.Tensor]:
+    """Sparse counterpart of yuma_consensus_stages for a single epoch, dtype being the resolved dtype policy."""
+
+    if W.dim() != 2:
+        raise ValueError("Sparse weights are only supported one epoch at a time.")
+
+    W = to_coo(W)
+    rows = W.indices()[0]
+
+    # === Weight ===
+    W = _with_values(W, W.values() / (_row_sum(W) + 1e-6)[rows])
+
+    # === Stake ===
+    S = S / S.sum()
+
+    # === Consensus ===
+    C = consensus_sparse(W, S, kappa, consensus_precision, dtype=consensus_dtype)
+
+    C = quantize_consensus(C, dtype)
+
+    # === Consensus clipped weight ===
+    W_source = W if W_prev is None else to_coo(W_prev)
+    W_clipped = _with_values(
+        W_source, torch.minimum(W_source.values(), C[W_source.indices()[1]])
+    )
+
+    # === Rank ===
+    R = _column_sum(W_clipped, S[W_clipped.indices()[0]] * W_clipped.values())
+
+    # === Incentive ===
+    I = (R / R.sum()).nan_to_num(0)
+
+    stages = {
+        "weight": W,
+        "stake": S,
+        "server_consensus_weight": C,
+        "consensus_clipped_weight": W_clipped,
+        "server_rank": R,
+        "server_incentive": I,
+    }
+
+    # === Prerank ===
+    if outputs is None or "server_prerank" in outputs or "server_trust" in outputs:
+        P = _column_sum(W, S[rows] * W.values())
+        stages["server_prerank"] = P
+
+        # === Trusts ===
+        stages["server_trust"] = (R / P).nan_to_num(0)
+
+    if outputs is None or "validator_trust" in outputs:
+        stages["validator_trust"] = _row_sum(W_clipped) / _row_sum(W)
+
+    return stages
+
+
+def _sparse_ema(
+    B: torch.Tensor,
+    B_old: torch.Tensor,
+    bond_alpha: torch.Tensor | float,
+) -> torch.Tensor:
+    indices, b, b_old = _align(B, B_old)
+    alpha = _per_column(bond_alpha, indices[1])
+    values = alpha * b + (1 - alpha) * b_old
+    return torch.sparse_coo_tensor(indices, values, B.shape, is_coalesced=True)
+
+
+def _dividends(B: torch.Tensor, I: torch.Tensor) -> torch.Tensor:
+    return _row_sum(B, B.values() * I[B.indices()[1]])
+
+
+def sparse_yuma_rust_bonds(
+    W_clipped: torch.Tensor,
+    S: torch.Tensor,
+    I: torch.Tensor,
+    B_old: torch.Tensor | None,
+    bond_alpha: torch.Tensor | float,
+) -> dict[str, torch.Tensor]:
+    rows, cols = W_clipped.indices()
+
+    # === Bonds ===
+    B = S[rows] * W_clipped.values()
+    B = B / (_column_sum(W_clipped, B) + 1e-6)[cols]
+    B = _with_values(W_clipped, torch.nan_to_num(B))
+
+    if B_old is not None:
+        B_ema = _sparse_ema(B, B_old, bond_alpha)
+    else:
+        B_ema = B.clone()
+
+    B_ema_values = B_ema.values() / (_column_sum(B_ema) + 1e-6)[B_ema.indices()[1]]
+    B_ema = _with_values(B_ema, torch.nan_to_num(B_ema_values))
+
+    # === Dividend Calculation===
+    D = _dividends(B_ema, I)
+    D_normalized = D / (D.sum() + 1e-6)
+
+    return {
+        "validator_bond": B,
+        "validator_ema_bond": B_ema,
+        "validator_reward": D,
+        "validator_reward_normalized": D_normalized,
+    }
+
+
+def sparse_yuma_bonds(
+    W: torch.Tensor,
+    W_clipped: torch.Tensor,
+    S: torch.Tensor,
+    I: torch.Tensor,
+    B_old: torch.Tensor | None,
+    bond_penalty: float,
+    bond_alpha: torch.Tensor | float,
+) -> dict[str, torch.Tensor]:
+    """W and W_clipped must share their support, as W_clipped is clipped from W."""
+
+    rows, cols = W.indices()
+
+    # === Bonds ===
+    W_b = _with_values(
+        W, (1 - bond_penalty) * W.values() + bond_penalty * W_clipped.values()
+    )
+    B = S[rows] * W_b.values()
+    B = B / _column_sum(W_b, B)[cols]
+    B = _with_values(W_b, B.nan_to_num(0))
+
+    if B_old is not None:
+        B_ema = _sparse_ema(B, B_old, bond_alpha)
+    else:
+        B_ema = B
+
+    # === Dividend ===
+    D = _dividends(B_ema, I)
+    D_normalized = D / (D.sum() + 1e-6)
+
+    return {
+        "weight_for_bond": W_b,
+        "validator_bond": B,
+        "validator_ema_bond": B_ema,
+        "validator_reward": D,
+        "validator_reward_normalized": D_normalized,
+    }
+
+
+def sparse_yuma3_bonds(
+    W: torch.Tensor,
+    S: torch.Tensor,
+    I: torch.Tensor,
+    B_old: torch.Tensor | None,
+    capacity_alpha: float,
+    decay_rate: float,
+    maxint: int,
+) -> dict[str, torch.Tensor]:
+    # Bonds only change where a weight is set or a bond is held
+    indices, w, b_old = _align(W, B_old)
+    rows = indices[0]
+
+    # === Bonds ===
+    capacity = S * maxint
+
+    # Compute Remaining Capacity
+    capacity_per_bond = capacity[rows]
+    remaining_capacity = capacity_per_bond - b_old
+    remaining_capacity = torch.clamp(remaining_capacity, min=0.0)
+
+    # Compute Purchase Capacity
+    purchase_capacity = torch.min((capacity_alpha * capacity)[rows], remaining_capacity)
+
+    # Allocate Purchase to Miners
+    purchase = purchase_capacity * w
+
+    # Update Bonds with Decay and Purchase
+    decay = 1 - decay_rate
+    B = decay * b_old + purchase
+    B = torch.min(B, capacity_per_bond)  # Enforce capacity constraints
+    B = torch.sparse_coo_tensor(indices, B, W.shape, is_coalesced=True)
+
+    # === Validator reward ===
+    D = _dividends(B, I)
+    D_normalized = D / (D.sum() + 1e-6)
+
+    return {
+        "validator_bonds": B,
+        "validator_reward": D,
+        "validator_reward_normalized": D_normalized,
+    }
+
+
+def sparse_yuma4_bonds(
+    W: torch.Tensor,
+    S: torch.Tensor,
+    I: torch.Tensor,
+    B_old: torch.Tensor | None,
+    bond_alpha: torch.Tensor | float,
+) -> dict[str, torch.Tensor]:
+    # Bonds only change where a weight is set or a bond is held
+    indices, w, b_old = _align(W, B_old)
+    alpha = _per_column(bond_alpha, indices[1])
+
+    # === Bonds ===
+    B_decayed = b_old * (1 - alpha)
+    remaining_capacity = torch.clamp(1.0 - B_decayed, min=0.0)
+
+    purchase = torch.min(alpha * w, remaining_capacity)
+
+    B = torch.clamp(B_decayed + purchase, max=1.0)
+    B = torch.sparse_coo_tensor(indices, B, W.shape, is_coalesced=True)
+
+    # === Dividends Calculation ===
+    D = S * _dividends(B, I)
+
+    # Normalize dividends
+    D_normalized = D / (D.sum() + 1e-6)
+
+    return {
+        "validator_bonds": B,
+        "validator_reward": D,
+        "validator_reward_normalized": D_normalized,
+    }
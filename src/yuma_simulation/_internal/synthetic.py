@@ -0,0 +1,146 @@
+"""
+This module provides synthetic scenarios at the scale of real subnets, for benchmarks and stress tests.
+Inputs are generated chunk by chunk with batched tensor operations from a seed, so that the same parameters
+always produce the same epochs and a case of any size only holds one chunk in memory.
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+import torch
+
+from yuma_simulation._internal.cases import StreamingCase
+
+
+@dataclass
+class SyntheticCase(StreamingCase):
+    """
+    Randomly generated case of num_validators validators weighting num_servers miners.
+
+    Stakes are Pareto distributed with tail index stake_tail, the largest one held by the first validator,
+    and follow a log-normal random walk of step stake_drift. Every validator weights a fixed random subset
+    of about density of the miners, according to a miner quality that follows a log-normal random walk
+    of step drift, with a log-normal disagreement of scale noise between validators.
+    Each epoch, every miner is replaced with probability churn_rate, its quality drawn anew.
+    A copier_fraction of the validators (never the first) copy the stake-weighted consensus
+    of the other validators' weights of the previous epoch.
+    Validators and servers are named after their index unless given.
+    With sparse=True, the weights of each epoch are yielded as a sparse COO matrix, for the sparse kernels.
+    """
+
+    name: str = "Synthetic"
+    validators: list[str] = field(default_factory=list)
+    base_validator: str = ""
+    servers: list[str] = field(default_factory=list)
+    num_validators: int = 256
+    num_servers: int = 1024
+    seed: int = 0
+    density: float = 0.1
+    stake_tail: float = 1.5
+    stake_drift: float = 0.01
+    drift: float = 0.05
+    noise: float = 0.1
+    churn_rate: float = 0.01
+    copier_fraction: float = 0.1
+    sparse: bool = False
+
+    def __post_init__(self):
+        if self.num_validators < 1 or self.num_servers < 1:
+            raise ValueError("Invalid synthetic case shape.")
+        if not 0.0 < self.density <= 1.0:
+            raise ValueError("Invalid density.")
+        if self.stake_tail <= 0.0:
+            raise ValueError("Invalid stake_tail.")
+        if not 0.0 <= self.churn_rate <= 1.0 or not 0.0 <= self.copier_fraction < 1.0:
+            raise ValueError("Invalid churn_rate or copier_fraction.")
+        if not self.validators:
+            self.validators = [f"Validator {index}" for index in range(self.num_validators)]
+        if not self.servers:
+            self.servers = [f"Server {index}" for index in range(self.num_servers)]
+        if len(self.validators) != self.num_validators or len(self.servers) != self.num_servers:
+            raise ValueError("Invalid synthetic case names.")
+        if not self.base_validator:
+            self.base_validator = self.validators[0]
+        super().__post_init__()
+
+    def epoch_chunks(
+        self, chunk_size: int | None = None, dtype: torch.dtype | None = None
+    ) -> Iterator[tuple[torch.Tensor | list[torch.Tensor], torch.Tensor | list[torch.Tensor]]]:
+        """
+        Yields weights of shape [C, V, M] and stakes of shape [C, V] for chunks of at most chunk_size epochs,
+        cast to dtype when it is given, or lists of sparse COO weights and of stakes with sparse=True.
+        The epochs only depend on the seed, not on the chunk size.
+        """
+
+        chunk_size = chunk_size or self.chunk_size
+        if chunk_size < 1:
+            raise ValueError("Invalid chunk_size.")
+        generator = torch.Generator().manual_seed(self.seed)
+        num_validators, num_servers = self.num_validators, self.num_servers
+
+        # === Initial state ===
+        # Pareto samples (1 - U)^(-1 / tail), in log space
+        uniform = torch.rand(num_validators, generator=generator, dtype=torch.float64)
+        log_stake = -torch.log1p(-uniform) / self.stake_tail
+        log_stake = log_stake.sort(descending=True).values
+        mask = torch.rand(num_validators, num_servers, generator=generator) < self.density
+        # Every validator weights at least one miner
+        mask[
+            torch.arange(num_validators),
+            torch.randint(num_servers, (num_validators,), generator=generator),
+        ] = True
+        copiers = torch.zeros(num_validators, dtype=torch.bool)
+        num_copiers = min(round(self.copier_fraction * num_validators), num_validators - 1)
+        copiers[1 + torch.randperm(num_validators - 1, generator=generator)[:num_copiers]] = True
+        log_quality = torch.randn(num_servers, generator=generator, dtype=torch.float64)
+        previous_consensus: torch.Tensor | None = None
+
+        for start in range(0, self.num_epochs, chunk_size):
+            num_epochs = min(chunk_size, self.num_epochs - start)
+            log_stakes = torch.empty(num_epochs, num_validators, dtype=torch.float64)
+            quality = torch.empty(num_epochs, num_servers, dtype=torch.float64)
+            W = torch.empty(num_epochs, num_validators, num_servers)
+
+            # === Random walks ===
+            # Draws are made one epoch at a time and the walks advanced in float64 epoch by epoch,
+            # so that chunks of any size produce the same epochs
+            for epoch in range(num_epochs):
+                stake_step = torch.randn(num_validators, generator=generator, dtype=torch.float64)
+                log_stake = log_stake + stake_step * self.stake_drift
+                log_stakes[epoch] = log_stake
+
+                # Miner quality restarts from a fresh draw at each churn
+                step = torch.randn(num_servers, generator=generator, dtype=torch.float64)
+                fresh = torch.randn(num_servers, generator=generator, dtype=torch.float64)
+                churned = torch.rand(num_servers, generator=generator) < self.churn_rate
+                log_quality = torch.where(churned, fresh, log_quality + step * self.drift)
+                quality[epoch] = log_quality
+
+                W[epoch].normal_(generator=generator)
+
+            # === Stake ===
+            S = torch.softmax(log_stakes, dim=-1).to(W.dtype)
+
+            # === Weight ===
+            # Qualities are shifted so that the best miner of each epoch has weight scale 1, which cannot overflow
+            quality = (quality - quality.max(dim=-1, keepdim=True).values).to(W.dtype)
+            W.mul_(self.noise).add_(quality.unsqueeze(-2)).exp_().mul_(mask)
+            tiny = torch.finfo(W.dtype).tiny
+            W.div_(W.sum(dim=-1, keepdim=True).clamp(min=tiny))
+
+            # === Copiers ===
+            if num_copiers:
+                honest_stake = S * ~copiers
+                consensus = torch.einsum("ev,evm->em", honest_stake, W)
+                consensus.div_(consensus.sum(dim=-1, keepdim=True).clamp(min=tiny))
+                first = consensus[:1] if previous_consensus is None else previous_consensus.unsqueeze(0)
+                previous_consensus = consensus[-1]
+                copied = torch.cat([first, consensus[:-1]])
+                W[:, copiers] = copied.unsqueeze(-2).expand(-1, num_copiers, -1)
+
+            if dtype is not None:
+                W, S = W.to(dtype), S.to(dtype)
+            if self.sparse:
+                yield [W_epoch.to_sparse_coo() for W_epoch in W], list(S)
+            else:
+                yield W, S
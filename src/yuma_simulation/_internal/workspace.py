@@ -0,0 +1,59 @@
+"""
+This module provides the reusable buffers of the dense Yuma kernels.
+A workspace is created once per (V, M) and passed to every epoch, so that the V x M temporaries
+are allocated on the first epoch only and written in place afterwards.
+"""
+
+import torch
+
+
+class YumaWorkspace:
+    """
+    Preallocated V x M buffers shared by the dense Yuma kernels across epochs.
+    A batch_shape such as (K,) gives buffers of shape [K, V, M] for batched scenarios.
+
+    Buffers are allocated on first use for each (name, dtype) and reused by every later epoch.
+    The tensors returned by a kernel running with a workspace alias these buffers,
+    so they are overwritten by the next call and must be cloned to be kept.
+    """
+
+    def __init__(
+        self,
+        num_validators: int,
+        num_servers: int,
+        device: torch.device | str | None = None,
+        batch_shape: tuple[int, ...] = (),
+    ):
+        self.shape = (*batch_shape, num_validators, num_servers)
+        self.device = device
+        self._buffers: dict[tuple[str, torch.dtype], torch.Tensor] = {}
+        self._weight_parity = 0
+
+    def buffer(self, name: str, dtype: torch.dtype) -> torch.Tensor:
+        key = (name, dtype)
+        if key not in self._buffers:
+            self._buffers[key] = torch.empty(self.shape, dtype=dtype, device=self.device)
+        return self._buffers[key]
+
+    def weight_buffer(self, dtype: torch.dtype) -> torch.Tensor:
+        """Alternates between two buffers, so that the previous epoch's weights (Yuma 2) stay readable."""
+
+        self._weight_parity ^= 1
+        return self.buffer(f"weight_{self._weight_parity}", dtype)
+
+    def fits(self, X: torch.Tensor) -> bool:
+        """Whether X is a dense tensor of the shape the buffers hold."""
+
+        return X.layout == torch.strided and tuple(X.shape) == self.shape
+
+
+def workspace_buffer(
+    workspace: YumaWorkspace | None,
+    name: str,
+    dtype: torch.dtype,
+) -> torch.Tensor | None:
+    """Returns a workspace buffer to be used as out=, or None to let torch allocate."""
+
+    if workspace is None:
+        return None
+    return workspace.buffer(name, dtype)
@@ -1,8 +1,27 @@
 import math
+from collections.abc import Collection
 from dataclasses import asdict, dataclass, field
 
 import torch
 
+from yuma_simulation._internal.consensus import (
+    consensus_bisection,
+    consensus_loop,
+    consensus_sorted,
+    quantize_consensus,
+)
+from yuma_simulation._internal.parameters import broadcast_parameter, is_swept
+from yuma_simulation._internal.sparse_utils import (
+    is_sparse,
+    sparse_consensus_stages,
+    sparse_yuma3_bonds,
+    sparse_yuma4_bonds,
+    sparse_yuma_bonds,
+    sparse_yuma_rust_bonds,
+    to_coo,
+)
+from yuma_simulation._internal.workspace import YumaWorkspace, workspace_buffer
+
 
 @dataclass
 class SimulationHyperparameters:
@@ -12,6 +31,11 @@ class SimulationHyperparameters:
     validator_emission_ratio: float = 0.41
     total_subnet_stake: float = 1_000_000.0
     consensus_precision: int = 100_000
+    consensus_mode: str = "sorted"
+    # "float32" or "float64" applied to inputs, intermediates and bonds; None keeps the legacy mixed dtypes
+    dtype: str | None = None
+    # "eager" or "compiled" (torch.compile with an eager fallback)
+    backend: str = "eager"
 
 
 @dataclass
@@ -58,220 +82,301 @@ class YumaSimulationNames:
     YUMA4_LIQUID: str = "Yuma 4 (Rhef+relative bonds) - liquid alpha on"
 
 
-def YumaRust(
+@dataclass(frozen=True)
+class ConsensusModes:
+    LOOP: str = "loop"
+    SORTED: str = "sorted"
+    BISECTION: str = "bisection"
+
+
+def _compute_consensus(
     W: torch.Tensor,
     S: torch.Tensor,
-    B_old: torch.Tensor | None = None,
-    config: YumaConfig = YumaConfig(),
-) -> dict[str, torch.Tensor | str | float]:
+    config: YumaConfig,
+    dtype: torch.dtype | None = None,
+    workspace: YumaWorkspace | None = None,
+) -> torch.Tensor:
     """
-    Currently implemented Subtensor Yuma function.
+    Computes the unnormalized miner consensus with the kernel selected by config.consensus_mode.
+    Only the sorted kernel writes its temporaries into the workspace.
     """
 
-    # === Weight ===
-    W = (W.T / (W.sum(dim=1) + 1e-6)).T
+    consensus_modes = ConsensusModes()
+    if config.consensus_mode == consensus_modes.SORTED:
+        return consensus_sorted(
+            W,
+            S,
+            config.kappa,
+            config.consensus_precision,
+            dtype=dtype,
+            workspace=workspace,
+        )
+    elif config.consensus_mode == consensus_modes.BISECTION:
+        return consensus_bisection(
+            W, S, config.kappa, config.consensus_precision, dtype=dtype
+        )
+    elif config.consensus_mode == consensus_modes.LOOP:
+        return consensus_loop(
+            W, S, config.kappa, config.consensus_precision, dtype=dtype
+        )
+    else:
+        raise ValueError("Invalid consensus mode.")
 
-    # === Stake ===
-    S = S / S.sum()
 
-    # === Prerank ===
-    P = (S.view(-1, 1) * W).sum(dim=0)
+def _resolve_dtype(config: YumaConfig) -> torch.dtype | None:
+    """Returns the torch dtype selected by config.dtype, or None when the legacy dtypes are kept."""
 
-    # === Consensus ===
-    C = torch.zeros(W.shape[1], dtype=torch.float64)
+    if config.dtype is None:
+        return None
+    elif config.dtype == "float32":
+        return torch.float32
+    elif config.dtype == "float64":
+        return torch.float64
+    else:
+        raise ValueError("Invalid dtype.")
 
-    for i, miner_weight in enumerate(W.T):
-        c_high = 1.0
-        c_low = 0.0
 
-        while (c_high - c_low) > 1 / config.consensus_precision:
-            c_mid = (c_high + c_low) / 2.0
-            _c_sum = (miner_weight > c_mid) * S
-            if _c_sum.sum() > config.kappa:
-                c_low = c_mid
-            else:
-                c_high = c_mid
+def _normalize_weights(W: torch.Tensor, out: torch.Tensor | None = None) -> torch.Tensor:
+    return torch.div(W, W.sum(dim=-1, keepdim=True) + 1e-6, out=out)
 
-        C[i] = c_high
 
-    C = (C / C.sum() * 65_535).int() / 65_535
+def _stake_weighted_sum(S: torch.Tensor, X: torch.Tensor) -> torch.Tensor:
+    """Sums S * X over the validators as a vector-matrix product, without a V x M temporary."""
 
-    # === Consensus clipped weight ===
-    W_clipped = torch.min(W, C)
+    return (S.to(X.dtype).unsqueeze(-2) @ X).squeeze(-2)
 
-    # === Rank ===
-    R = (S.view(-1, 1) * W_clipped).sum(dim=0)
 
-    # === Incentive ===
-    I = (R / R.sum()).nan_to_num(0)
+def _bond_dividends(B: torch.Tensor, I: torch.Tensor) -> torch.Tensor:
+    """Sums B * I over the miners as a matrix-vector product, without a V x M temporary."""
 
-    # === Trusts ===
-    T = (R / P).nan_to_num(0)
-    T_v = W_clipped.sum(dim=1) / W.sum(dim=1)
+    return (B @ I.to(B.dtype).unsqueeze(-1)).squeeze(-1)
 
-    # === Bonds ===
-    B = S.view(-1, 1) * W_clipped
-    B_sum = B.sum(dim=0)
-    B = B / (B_sum + 1e-6)
-    B = torch.nan_to_num(B)
 
-    a = b = torch.tensor(float('nan'))
-    bond_alpha = config.bond_alpha
-    if config.liquid_alpha:
-        consensus_high = (
-            config.override_consensus_high
-            if config.override_consensus_high is not None
-            else C.quantile(0.75)
-        )
-        consensus_low = (
-            config.override_consensus_low
-            if config.override_consensus_low is not None
-            else C.quantile(0.25)
-        )
+def _per_server(bond_alpha: torch.Tensor | float) -> torch.Tensor | float:
+    """Lines up a per-miner bond alpha of shape [..., M] with bonds of shape [..., V, M]."""
 
-        if consensus_high == consensus_low:
-            consensus_high = C.quantile(0.99)
+    if isinstance(bond_alpha, torch.Tensor) and bond_alpha.dim() > 0:
+        return bond_alpha.unsqueeze(-2)
+    return bond_alpha
 
-        a = (
-            math.log(1 / config.alpha_high - 1) - math.log(1 / config.alpha_low - 1)
-        ) / (consensus_low - consensus_high)
-        b = math.log(1 / config.alpha_low - 1) + a * consensus_low
-        alpha = 1 / (1 + math.e ** (-a * C + b))  # alpha to the old weight
-        bond_alpha = 1 - torch.clamp(alpha, config.alpha_low, config.alpha_high)
 
-    if B_old is not None:
-        B_ema = bond_alpha * B + (1 - bond_alpha) * B_old
-    else:
-        B_ema = B.clone()
+def _bond_ema(
+    B: torch.Tensor,
+    B_old: torch.Tensor,
+    bond_alpha: torch.Tensor | float,
+    out: torch.Tensor | None = None,
+) -> torch.Tensor:
+    """Computes bond_alpha * B + (1 - bond_alpha) * B_old, out may alias B_old."""
 
-    B_ema_sum = B_ema.sum(dim=0)
-    B_ema = B_ema / (B_ema_sum + 1e-6)
-    B_ema = torch.nan_to_num(B_ema)
+    bond_alpha = _per_server(bond_alpha)
+    B_ema = torch.mul(B_old, 1 - bond_alpha, out=out)
+    return _add_scaled(B_ema, B, bond_alpha)
 
-    # === Dividend Calculation===
-    D = (B_ema * I).sum(dim=1)
-    D_normalized = D / (D.sum() + 1e-6)
 
-    return {
-        "weight": W,
-        "stake": S,
-        "server_prerank": P,
-        "server_consensus_weight": C,
-        "consensus_clipped_weight": W_clipped,
-        "server_rank": R,
-        "server_incentive": I,
-        "server_trust": T,
-        "validator_trust": T_v,
-        "validator_bond": B,
-        "validator_ema_bond": B_ema,
-        "validator_reward": D,
-        "validator_reward_normalized": D_normalized,
-        "bond_alpha": bond_alpha,
-        "alpha_a": a,
-        "alpha_b": b,
-    }
+def _add_scaled(
+    X: torch.Tensor, Y: torch.Tensor, scale: torch.Tensor | float
+) -> torch.Tensor:
+    """Adds scale * Y to X in place."""
 
+    if isinstance(scale, torch.Tensor):
+        return X.addcmul_(Y, scale)
+    return X.add_(Y, alpha=scale)
 
-def Yuma(
+
+def _log(x: torch.Tensor | float) -> torch.Tensor | float:
+    return torch.log(x) if isinstance(x, torch.Tensor) else math.log(x)
+
+
+def _copy_bonds(B: torch.Tensor, out: torch.Tensor | None = None) -> torch.Tensor:
+    return B.clone() if out is None else out.copy_(B)
+
+
+def _select_outputs(
+    result: dict[str, torch.Tensor | float],
+    outputs: Collection[str] | None,
+) -> dict[str, torch.Tensor | float]:
+    if outputs is None:
+        return result
+    return {key: value for key, value in result.items() if key in outputs}
+
+
+def yuma_consensus_stages(
     W: torch.Tensor,
     S: torch.Tensor,
-    B_old: torch.Tensor | None = None,
     config: YumaConfig = YumaConfig(),
-) -> dict[str, torch.Tensor | None | float]:
+    W_prev: torch.Tensor | None = None,
+    consensus_dtype: torch.dtype | None = None,
+    outputs: Collection[str] | None = None,
+    workspace: YumaWorkspace | None = None,
+) -> dict[str, torch.Tensor]:
     """
-    Original Yuma function with bonds and EMA calculation.
+    Computes the bond-independent stages shared by all Yuma versions, from weight normalization to trusts.
+    Accepts W of shape [..., V, M] and S of shape [..., V], so that several epochs can be computed in one pass.
+    W_prev holds already normalized weights which are clipped instead of W (Yuma 2).
+    Sparse COO/CSR weights are processed over their non-zero entries, one epoch at a time.
+    When outputs is given, the prerank and trusts are only computed if requested;
+    the stages needed by the bond updates are always returned.
+    With a workspace (dense W of shape [V, M] only), the V x M stages are written into its buffers.
     """
 
+    dtype = _resolve_dtype(config)
+    if dtype is not None:
+        W = W.to(dtype)
+        S = S.to(dtype)
+        W_prev = W_prev.to(dtype) if W_prev is not None else None
+        consensus_dtype = dtype
+
+    if is_sparse(W):
+        return sparse_consensus_stages(
+            W,
+            S,
+            config.kappa,
+            config.consensus_precision,
+            W_prev=W_prev,
+            consensus_dtype=consensus_dtype,
+            outputs=outputs,
+            dtype=dtype,
+        )
+
+    if workspace is not None and not workspace.fits(W):
+        raise ValueError("Invalid workspace shape.")
+
     # === Weight ===
-    W = (W.T / (W.sum(dim=1) + 1e-6)).T
+    W = _normalize_weights(
+        W, out=workspace.weight_buffer(W.dtype) if workspace is not None else None
+    )
 
     # === Stake ===
-    S = S / S.sum()
-
-    # === Prerank ===
-    P = (S.view(-1, 1) * W).sum(dim=0)
+    S = S / S.sum(dim=-1, keepdim=True)
 
     # === Consensus ===
-    C = torch.zeros(W.shape[1])
-
-    for i, miner_weight in enumerate(W.T):
-        c_high = 1.0
-        c_low = 0.0
+    C = _compute_consensus(W, S, config, dtype=consensus_dtype, workspace=workspace)
 
-        while (c_high - c_low) > 1 / config.consensus_precision:
-            c_mid = (c_high + c_low) / 2.0
-            _c_sum = (miner_weight > c_mid) * S
-            if _c_sum.sum() > config.kappa:
-                c_low = c_mid
-            else:
-                c_high = c_mid
-
-        C[i] = c_high
-
-    C = (C / C.sum() * 65_535).int() / 65_535
+    C = quantize_consensus(C, dtype)
 
     # === Consensus clipped weight ===
-    W_clipped = torch.min(W, C)
+    W_source = W if W_prev is None else W_prev
+    W_clipped = torch.minimum(
+        W_source,
+        C.unsqueeze(-2),
+        out=workspace_buffer(
+            workspace, "consensus_clipped_weight", torch.result_type(W_source, C)
+        ),
+    )
 
     # === Rank ===
-    R = (S.view(-1, 1) * W_clipped).sum(dim=0)
+    R = _stake_weighted_sum(S, W_clipped)
 
     # === Incentive ===
-    I = (R / R.sum()).nan_to_num(0)
+    I = (R / R.sum(dim=-1, keepdim=True)).nan_to_num(0)
+
+    stages = {
+        "weight": W,
+        "stake": S,
+        "server_consensus_weight": C,
+        "consensus_clipped_weight": W_clipped,
+        "server_rank": R,
+        "server_incentive": I,
+    }
 
-    # === Trusts ===
-    T = (R / P).nan_to_num(0)
-    T_v = W_clipped.sum(dim=1) / W.sum(dim=1)
+    # === Prerank ===
+    if outputs is None or "server_prerank" in outputs or "server_trust" in outputs:
+        P = _stake_weighted_sum(S, W)
+        stages["server_prerank"] = P
 
-    # === Bonds ===
-    W_b = (1 - config.bond_penalty) * W + config.bond_penalty * W_clipped
-    B = S.view(-1, 1) * W_b / (S.view(-1, 1) * W_b).sum(dim=0)
-    B = B.nan_to_num(0)
+        # === Trusts ===
+        stages["server_trust"] = (R / P).nan_to_num(0)
+
+    if outputs is None or "validator_trust" in outputs:
+        stages["validator_trust"] = W_clipped.sum(dim=-1) / W.sum(dim=-1)
+
+    return stages
+
+
+def _liquid_bond_alpha(
+    C: torch.Tensor,
+    config: YumaConfig,
+) -> tuple[torch.Tensor | float, torch.Tensor | float, torch.Tensor | float]:
+    """Returns the bond alpha and, when liquid alpha is on, the parameters of its sigmoid."""
 
     a = b = torch.tensor(float('nan'))
-    bond_alpha = config.bond_alpha
+    bond_alpha = broadcast_parameter(config.bond_alpha, 1, C.dtype)
     if config.liquid_alpha:
+        alpha_high = broadcast_parameter(config.alpha_high, 1, C.dtype)
+        alpha_low = broadcast_parameter(config.alpha_low, 1, C.dtype)
         consensus_high = (
-            config.override_consensus_high
+            broadcast_parameter(config.override_consensus_high, 1, C.dtype)
             if config.override_consensus_high is not None
-            else C.quantile(0.75)
+            else C.quantile(0.75, dim=-1, keepdim=C.dim() > 1)
         )
         consensus_low = (
-            config.override_consensus_low
+            broadcast_parameter(config.override_consensus_low, 1, C.dtype)
             if config.override_consensus_low is not None
-            else C.quantile(0.25)
+            else C.quantile(0.25, dim=-1, keepdim=C.dim() > 1)
         )
 
-        if consensus_high == consensus_low:
-            consensus_high = C.quantile(0.99)
-
-        a = (
-            math.log(1 / config.alpha_high - 1) - math.log(1 / config.alpha_low - 1)
-        ) / (consensus_low - consensus_high)
-        b = math.log(1 / config.alpha_low - 1) + a * consensus_low
+        equal = consensus_high == consensus_low
+        if isinstance(equal, torch.Tensor) and equal.dim() > 0:
+            # One sigmoid per scenario of a batch
+            consensus_high = torch.where(
+                equal, C.quantile(0.99, dim=-1, keepdim=True), consensus_high
+            )
+        elif equal:
+            consensus_high = C.quantile(0.99, dim=-1, keepdim=C.dim() > 1)
+
+        a = (_log(1 / alpha_high - 1) - _log(1 / alpha_low - 1)) / (
+            consensus_low - consensus_high
+        )
+        b = _log(1 / alpha_low - 1) + a * consensus_low
         alpha = 1 / (1 + math.e ** (-a * C + b))  # alpha to the old weight
-        bond_alpha = 1 - torch.clamp(alpha, config.alpha_low, config.alpha_high)
+        bond_alpha = 1 - torch.clamp(torch.clamp(alpha, min=alpha_low), max=alpha_high)
 
+    return bond_alpha, a, b
+
+
+def _yuma_rust_bonds(
+    stages: dict[str, torch.Tensor],
+    B_old: torch.Tensor | None,
+    config: YumaConfig,
+    workspace: YumaWorkspace | None = None,
+) -> dict[str, torch.Tensor | float]:
+    S = stages["stake"]
+    W_clipped = stages["consensus_clipped_weight"]
+    I = stages["server_incentive"]
+
+    bond_alpha, a, b = _liquid_bond_alpha(stages["server_consensus_weight"], config)
+
+    if is_sparse(W_clipped):
+        bonds = sparse_yuma_rust_bonds(W_clipped, S, I, B_old, bond_alpha)
+        return {**bonds, "bond_alpha": bond_alpha, "alpha_a": a, "alpha_b": b}
+
+    # === Bonds ===
+    B = torch.mul(
+        S.unsqueeze(-1),
+        W_clipped,
+        out=workspace_buffer(
+            workspace, "validator_bond", torch.result_type(S, W_clipped)
+        ),
+    )
+    B_sum = B.sum(dim=-2, keepdim=True)
+    B = B.div_(B_sum + 1e-6)
+    B = B.nan_to_num_()
+
+    B_ema_out = workspace_buffer(workspace, "validator_ema_bond", B.dtype)
     if B_old is not None:
-        B_ema = bond_alpha * B + (1 - bond_alpha) * B_old
+        B_ema = _bond_ema(B, B_old, bond_alpha, out=B_ema_out)
     else:
-        B_ema = B
+        B_ema = _copy_bonds(B, out=B_ema_out)
 
-    # === Dividend ===
-    D = (B_ema * I).sum(dim=1)
-    D_normalized = D / (D.sum() + 1e-6)
+    B_ema_sum = B_ema.sum(dim=-2, keepdim=True)
+    B_ema = B_ema.div_(B_ema_sum + 1e-6)
+    B_ema = B_ema.nan_to_num_()
+
+    # === Dividend Calculation===
+    D = _bond_dividends(B_ema, I)
+    D_normalized = D / (D.sum(dim=-1, keepdim=True) + 1e-6)
 
     return {
-        "weight": W,
-        "stake": S,
-        "server_prerank": P,
-        "server_consensus_weight": C,
-        "consensus_clipped_weight": W_clipped,
-        "server_rank": R,
-        "server_incentive": I,
-        "server_trust": T,
-        "validator_trust": T_v,
-        "weight_for_bond": W_b,
         "validator_bond": B,
         "validator_ema_bond": B_ema,
         "validator_reward": D,
@@ -282,109 +387,56 @@ def Yuma(
     }
 
 
-def Yuma2(
-    W: torch.Tensor,
-    W_prev: torch.Tensor,
-    S: torch.Tensor,
-    B_old: torch.Tensor | None = None,
-    config: YumaConfig = YumaConfig(),
-) -> dict[str, torch.Tensor | None | float]:
-    """
-    Original Yuma function with bonds and EMA calculation.
-    """
-
-    # === Weight ===
-    W = (W.T / (W.sum(dim=1) + 1e-6)).T
-
-    if W_prev is None:
-        W_prev = W
-
-    # === Stake ===
-    S = S / S.sum()
-
-    # === Prerank ===
-    P = (S.view(-1, 1) * W).sum(dim=0)
-
-    # === Consensus ===
-    C = torch.zeros(W.shape[1])
-
-    for i, miner_weight in enumerate(W.T):
-        c_high = 1.0
-        c_low = 0.0
-
-        while (c_high - c_low) > 1 / config.consensus_precision:
-            c_mid = (c_high + c_low) / 2.0
-            _c_sum = (miner_weight > c_mid) * S
-            if _c_sum.sum() > config.kappa:
-                c_low = c_mid
-            else:
-                c_high = c_mid
-
-        C[i] = c_high
-
-    C = (C / C.sum() * 65_535).int() / 65_535
-
-    # === Consensus clipped weight ===
-    W_clipped = torch.min(W_prev, C)
-
-    # === Rank ===
-    R = (S.view(-1, 1) * W_clipped).sum(dim=0)
-
-    # === Incentive ===
-    I = (R / R.sum()).nan_to_num(0)
-
-    # === Trusts ===
-    T = (R / P).nan_to_num(0)
-    T_v = W_clipped.sum(dim=1) / W.sum(dim=1)
-
-    # === Bonds ===
-    W_b = (1 - config.bond_penalty) * W_prev + config.bond_penalty * W_clipped
-    B = S.view(-1, 1) * W_b / (S.view(-1, 1) * W_b).sum(dim=0)
-    B = B.nan_to_num(0)
-
-    a = b = torch.tensor(float('nan'))
-    bond_alpha = config.bond_alpha
-    if config.liquid_alpha:
-        consensus_high = (
-            config.override_consensus_high
-            if config.override_consensus_high is not None
-            else C.quantile(0.75)
+def _yuma_bonds(
+    stages: dict[str, torch.Tensor],
+    B_old: torch.Tensor | None,
+    config: YumaConfig,
+    W: torch.Tensor | None = None,
+    workspace: YumaWorkspace | None = None,
+) -> dict[str, torch.Tensor | float]:
+    if W is None:
+        W = stages["weight"]
+    S = stages["stake"]
+    W_clipped = stages["consensus_clipped_weight"]
+    I = stages["server_incentive"]
+
+    bond_alpha, a, b = _liquid_bond_alpha(stages["server_consensus_weight"], config)
+
+    if is_sparse(W):
+        bonds = sparse_yuma_bonds(
+            to_coo(W), W_clipped, S, I, B_old, config.bond_penalty, bond_alpha
         )
-        consensus_low = (
-            config.override_consensus_low
-            if config.override_consensus_low is not None
-            else C.quantile(0.25)
-        )
-
-        if consensus_high == consensus_low:
-            consensus_high = C.quantile(0.99)
+        return {**bonds, "bond_alpha": bond_alpha, "alpha_a": a, "alpha_b": b}
 
-        a = (
-            math.log(1 / config.alpha_high - 1) - math.log(1 / config.alpha_low - 1)
-        ) / (consensus_low - consensus_high)
-        b = math.log(1 / config.alpha_low - 1) + a * consensus_low
-        alpha = 1 / (1 + math.e ** (-a * C + b))  # alpha to the old weight
-        bond_alpha = 1 - torch.clamp(alpha, config.alpha_low, config.alpha_high)
+    # === Bonds ===
+    bond_penalty = broadcast_parameter(config.bond_penalty, 2, W.dtype)
+    W_b = torch.mul(
+        W,
+        1 - bond_penalty,
+        out=workspace_buffer(
+            workspace, "weight_for_bond", torch.result_type(W, W_clipped)
+        ),
+    )
+    W_b = _add_scaled(W_b, W_clipped, bond_penalty)
+    B = torch.mul(
+        S.unsqueeze(-1),
+        W_b,
+        out=workspace_buffer(workspace, "validator_bond", torch.result_type(S, W_b)),
+    )
+    B = B.div_(B.sum(dim=-2, keepdim=True))
+    B = B.nan_to_num_(0)
 
+    B_ema_out = workspace_buffer(workspace, "validator_ema_bond", B.dtype)
     if B_old is not None:
-        B_ema = bond_alpha * B + (1 - bond_alpha) * B_old
+        B_ema = _bond_ema(B, B_old, bond_alpha, out=B_ema_out)
     else:
-        B_ema = B
+        B_ema = _copy_bonds(B, out=B_ema_out)
 
     # === Dividend ===
-    D = (B_ema * I).sum(dim=1)
-    D_normalized = D / (D.sum() + 1e-6)
+    D = _bond_dividends(B_ema, I)
+    D_normalized = D / (D.sum(dim=-1, keepdim=True) + 1e-6)
 
     return {
-        "weight": W,
-        "stake": S,
-        "server_prerank": P,
-        "server_consensus_weight": C,
-        "consensus_clipped_weight": W_clipped,
-        "server_rank": R,
-        "server_incentive": I,
-        "server_trust": T,
-        "validator_trust": T_v,
         "weight_for_bond": W_b,
         "validator_bond": B,
         "validator_ema_bond": B_ema,
@@ -396,211 +448,257 @@ def Yuma2(
     }
 
 
-def Yuma3(
-    W: torch.Tensor,
-    S: torch.Tensor,
-    B_old: torch.Tensor | None = None,
-    config: YumaConfig = YumaConfig(),
-    maxint: int = 2**64 - 1,
-) -> dict[str, torch.Tensor | None | float]:
-    """
-    Original Yuma function with bonds and EMA calculation.
-    """
+def _yuma3_bonds(
+    stages: dict[str, torch.Tensor],
+    B_old: torch.Tensor | None,
+    config: YumaConfig,
+    maxint: int,
+    workspace: YumaWorkspace | None = None,
+) -> dict[str, torch.Tensor]:
+    W = stages["weight"]
+    S = stages["stake"]
+    I = stages["server_incentive"]
+
+    if is_sparse(W):
+        return sparse_yuma3_bonds(
+            W, S, I, B_old, config.capacity_alpha, config.decay_rate, maxint
+        )
 
-    # === Weight ===
-    W = (W.T / (W.sum(dim=1) + 1e-6)).T
+    # === Bonds ===
+    B_out = workspace_buffer(workspace, "validator_bonds", W.dtype)
+    if B_old is None:
+        B_old = torch.zeros_like(W) if B_out is None else B_out.zero_()
 
-    # === Stake ===
-    S = S / S.sum()
+    # 2**64 - 1 rounds to the same float either way, but dispatch modes cannot wrap a uint64 scalar
+    maxint = float(maxint)
+    capacity = S * maxint
 
-    # === Prerank ===
-    P = (S.view(-1, 1) * W).sum(dim=0)
+    # Compute Remaining Capacity
+    capacity_per_bond = S.unsqueeze(-1) * maxint
+    remaining_capacity = torch.sub(
+        capacity_per_bond,
+        B_old,
+        out=workspace_buffer(
+            workspace,
+            "remaining_capacity",
+            torch.result_type(capacity_per_bond, B_old),
+        ),
+    )
+    remaining_capacity = remaining_capacity.clamp_(min=0.0)
 
-    # === Consensus ===
-    C = torch.zeros(W.shape[1])
+    # Compute Purchase Capacity
+    capacity_alpha = (
+        broadcast_parameter(config.capacity_alpha, 1, capacity.dtype) * capacity
+    ).unsqueeze(-1)
+    purchase_capacity = torch.minimum(
+        capacity_alpha, remaining_capacity, out=remaining_capacity
+    )
 
-    for i, miner_weight in enumerate(W.T):
-        c_high = 1.0
-        c_low = 0.0
+    # Allocate Purchase to Miners
+    purchase = purchase_capacity.mul_(W)
 
-        while (c_high - c_low) > 1 / config.consensus_precision:
-            c_mid = (c_high + c_low) / 2.0
-            _c_sum = (miner_weight > c_mid) * S
-            if _c_sum.sum() > config.kappa:
-                c_low = c_mid
-            else:
-                c_high = c_mid
+    # Update Bonds with Decay and Purchase
+    decay = 1 - broadcast_parameter(config.decay_rate, 2, B_old.dtype)
+    B = torch.mul(B_old, decay, out=B_out).add_(purchase)
+    B = torch.minimum(B, capacity_per_bond, out=B)  # Enforce capacity constraints
 
-        C[i] = c_high
+    # === Validator reward ===
+    D = _bond_dividends(B, I)
+    D_normalized = D / (D.sum(dim=-1, keepdim=True) + 1e-6)
 
-    C = (C / C.sum() * 65_535).int() / 65_535
+    return {
+        "validator_bonds": B,
+        "validator_reward": D,
+        "validator_reward_normalized": D_normalized,
+    }
 
-    # === Consensus clipped weight ===
-    W_clipped = torch.min(W, C)
 
-    # === Rank ===
-    R = (S.view(-1, 1) * W_clipped).sum(dim=0)
+def _yuma4_bonds(
+    stages: dict[str, torch.Tensor],
+    B_old: torch.Tensor | None,
+    config: YumaConfig,
+    workspace: YumaWorkspace | None = None,
+) -> dict[str, torch.Tensor]:
+    W = stages["weight"]
+    S = stages["stake"]
+    I = stages["server_incentive"]
 
-    # === Incentive ===
-    I = (R / R.sum()).nan_to_num(0)
+    # === Liquid Alpha Adjustment ===
+    bond_alpha, _, _ = _liquid_bond_alpha(stages["server_consensus_weight"], config)
 
-    # === Trusts ===
-    T = (R / P).nan_to_num(0)
-    T_v = W_clipped.sum(dim=1) / W.sum(dim=1)
+    if is_sparse(W):
+        return sparse_yuma4_bonds(W, S, I, B_old, bond_alpha)
 
     # === Bonds ===
+    B_out = workspace_buffer(workspace, "validator_bonds", W.dtype)
     if B_old is None:
-        B_old = torch.zeros_like(W)
+        B_old = torch.zeros_like(W) if B_out is None else B_out.zero_()
 
-    capacity = S * maxint
-
-    # Compute Remaining Capacity
-    capacity_per_bond = S.unsqueeze(1) * maxint
-    remaining_capacity = capacity_per_bond - B_old
-    remaining_capacity = torch.clamp(remaining_capacity, min=0.0)
+    bond_alpha = _per_server(bond_alpha)
+    B_decayed = torch.mul(B_old, 1 - bond_alpha, out=B_out)
+    remaining_capacity = torch.neg(
+        B_decayed,
+        out=workspace_buffer(workspace, "remaining_capacity", B_decayed.dtype),
+    ).add_(1.0)
+    remaining_capacity = remaining_capacity.clamp_(min=0.0)
 
-    # Compute Purchase Capacity
-    capacity_alpha = (config.capacity_alpha * capacity).unsqueeze(1)
-    purchase_capacity = torch.min(capacity_alpha, remaining_capacity)
+    # Each validator can increase bonds by at most bond_alpha per epoch towards the cap
+    purchase_increment = torch.mul(
+        W,
+        bond_alpha,
+        out=workspace_buffer(
+            workspace, "purchase_increment", torch.result_type(W, bond_alpha)
+        ),
+    )  # Validators allocate their purchase across miners based on weights
+    # Ensure that purchase does not exceed remaining capacity
+    purchase = torch.minimum(
+        purchase_increment, remaining_capacity, out=remaining_capacity
+    )
 
-    # Allocate Purchase to Miners
-    purchase = purchase_capacity * W
+    B = B_decayed.add_(purchase)
+    B = B.clamp_(max=1.0)
 
-    # Update Bonds with Decay and Purchase
-    decay = 1 - config.decay_rate
-    B = decay * B_old + purchase
-    B = torch.min(B, capacity_per_bond)  # Enforce capacity constraints
+    # === Dividends Calculation ===
+    total_bonds_per_validator = _bond_dividends(B, I)  # Sum over miners for each validator
+    D = S * total_bonds_per_validator  # Element-wise multiplication
 
-    # === Validator reward ===
-    D = (B * I).sum(dim=1)
-    D_normalized = D / (D.sum() + 1e-6)
+    # Normalize dividends
+    D_normalized = D / (D.sum(dim=-1, keepdim=True) + 1e-6)
 
     return {
-        "weight": W,
-        "stake": S,
-        "server_prerank": P,
-        "server_consensus_weight": C,
-        "consensus_clipped_weight": W_clipped,
-        "server_rank": R,
-        "server_incentive": I,
-        "server_trust": T,
-        "validator_trust": T_v,
         "validator_bonds": B,
         "validator_reward": D,
         "validator_reward_normalized": D_normalized,
     }
 
 
-def Yuma4(
+def YumaRust(
     W: torch.Tensor,
     S: torch.Tensor,
     B_old: torch.Tensor | None = None,
     config: YumaConfig = YumaConfig(),
-) -> dict[str, torch.Tensor | None | float]:
+    stages: dict[str, torch.Tensor] | None = None,
+    outputs: Collection[str] | None = None,
+    workspace: YumaWorkspace | None = None,
+) -> dict[str, torch.Tensor | str | float]:
     """
-    Original Yuma function with bonds and EMA calculation.
+    Currently implemented Subtensor Yuma function.
     """
 
-    # === Weight ===
-    W = (W.T / (W.sum(dim=1) + 1e-6)).T
-
-    # === Stake ===
-    S = S / S.sum()
-
-    # === Prerank ===
-    P = (S.view(-1, 1) * W).sum(dim=0)
-
-    # === Consensus ===
-    C = torch.zeros(W.shape[1])
-
-    for i, miner_weight in enumerate(W.T):
-        c_high = 1.0
-        c_low = 0.0
+    if stages is None:
+        stages = yuma_consensus_stages(
+            W,
+            S,
+            config,
+            consensus_dtype=torch.float64,
+            outputs=outputs,
+            workspace=workspace,
+        )
 
-        while (c_high - c_low) > 1 / config.consensus_precision:
-            c_mid = (c_high + c_low) / 2.0
-            _c_sum = (miner_weight > c_mid) * S
-            if _c_sum.sum() > config.kappa:
-                c_low = c_mid
-            else:
-                c_high = c_mid
+    return _select_outputs(
+        {**stages, **_yuma_rust_bonds(stages, B_old, config, workspace=workspace)},
+        outputs,
+    )
 
-        C[i] = c_high
 
-    C = (C / C.sum() * 65_535).int() / 65_535
+def Yuma(
+    W: torch.Tensor,
+    S: torch.Tensor,
+    B_old: torch.Tensor | None = None,
+    config: YumaConfig = YumaConfig(),
+    stages: dict[str, torch.Tensor] | None = None,
+    outputs: Collection[str] | None = None,
+    workspace: YumaWorkspace | None = None,
+) -> dict[str, torch.Tensor | None | float]:
+    """
+    Original Yuma function with bonds and EMA calculation.
+    """
 
-    # === Consensus clipped weight ===
-    W_clipped = torch.min(W, C)
+    if stages is None:
+        stages = yuma_consensus_stages(
+            W, S, config, outputs=outputs, workspace=workspace
+        )
 
-    # === Rank ===
-    R = (S.view(-1, 1) * W_clipped).sum(dim=0)
+    return _select_outputs(
+        {**stages, **_yuma_bonds(stages, B_old, config, workspace=workspace)},
+        outputs,
+    )
 
-    # === Incentive ===
-    I = (R / R.sum()).nan_to_num(0)
 
-    # === Trusts ===
-    T = (R / P).nan_to_num(0)
-    T_v = W_clipped.sum(dim=1) / W.sum(dim=1)
+def Yuma2(
+    W: torch.Tensor,
+    W_prev: torch.Tensor,
+    S: torch.Tensor,
+    B_old: torch.Tensor | None = None,
+    config: YumaConfig = YumaConfig(),
+    stages: dict[str, torch.Tensor] | None = None,
+    outputs: Collection[str] | None = None,
+    workspace: YumaWorkspace | None = None,
+) -> dict[str, torch.Tensor | None | float]:
+    """
+    Original Yuma function with bonds and EMA calculation.
+    """
 
-    # === Liquid Alpha Adjustment ===
-    a = b = torch.tensor(float('nan'))
-    bond_alpha = config.bond_alpha
-    if config.liquid_alpha:
-        consensus_high = (
-            config.override_consensus_high
-            if config.override_consensus_high is not None
-            else C.quantile(0.75)
+    if stages is None:
+        stages = yuma_consensus_stages(
+            W, S, config, W_prev=W_prev, outputs=outputs, workspace=workspace
         )
-        consensus_low = (
-            config.override_consensus_low
-            if config.override_consensus_low is not None
-            else C.quantile(0.25)
-        )
-
-        if consensus_high == consensus_low:
-            consensus_high = C.quantile(0.99)
+    if W_prev is None:
+        W_prev = stages["weight"]
+
+    return _select_outputs(
+        {
+            **stages,
+            **_yuma_bonds(stages, B_old, config, W=W_prev, workspace=workspace),
+        },
+        outputs,
+    )
 
-        a = (
-            math.log(1 / config.alpha_high - 1) - math.log(1 / config.alpha_low - 1)
-        ) / (consensus_low - consensus_high)
-        b = math.log(1 / config.alpha_low - 1) + a * consensus_low
-        alpha = 1 / (1 + math.e ** (-a * C + b))  # alpha to the old weight
-        bond_alpha = 1 - torch.clamp(alpha, config.alpha_low, config.alpha_high)
 
-    # === Bonds ===
-    if B_old is None:
-        B_old = torch.zeros_like(W)
+def Yuma3(
+    W: torch.Tensor,
+    S: torch.Tensor,
+    B_old: torch.Tensor | None = None,
+    config: YumaConfig = YumaConfig(),
+    maxint: int = 2**64 - 1,
+    stages: dict[str, torch.Tensor] | None = None,
+    outputs: Collection[str] | None = None,
+    workspace: YumaWorkspace | None = None,
+) -> dict[str, torch.Tensor | None | float]:
+    """
+    Original Yuma function with bonds and EMA calculation.
+    """
 
-    B_decayed = B_old * (1 - bond_alpha)
-    remaining_capacity = 1.0 - B_decayed
-    remaining_capacity = torch.clamp(remaining_capacity, min=0.0)
+    if stages is None:
+        stages = yuma_consensus_stages(
+            W, S, config, outputs=outputs, workspace=workspace
+        )
 
-    # Each validator can increase bonds by at most bond_alpha per epoch towards the cap
-    purchase_increment = (
-        bond_alpha * W
-    )  # Validators allocate their purchase across miners based on weights
-    # Ensure that purchase does not exceed remaining capacity
-    purchase = torch.min(purchase_increment, remaining_capacity)
+    return _select_outputs(
+        {**stages, **_yuma3_bonds(stages, B_old, config, maxint, workspace=workspace)},
+        outputs,
+    )
 
-    B = B_decayed + purchase
-    B = torch.clamp(B, max=1.0)
 
-    # === Dividends Calculation ===
-    total_bonds_per_validator = (B * I).sum(dim=1)  # Sum over miners for each validator
-    D = S * total_bonds_per_validator  # Element-wise multiplication
+def Yuma4(
+    W: torch.Tensor,
+    S: torch.Tensor,
+    B_old: torch.Tensor | None = None,
+    config: YumaConfig = YumaConfig(),
+    stages: dict[str, torch.Tensor] | None = None,
+    outputs: Collection[str] | None = None,
+    workspace: YumaWorkspace | None = None,
+) -> dict[str, torch.Tensor | None | float]:
+    """
+    Original Yuma function with bonds and EMA calculation.
+    """
 
-    # Normalize dividends
-    D_normalized = D / (D.sum() + 1e-6)
+    if stages is None:
+        stages = yuma_consensus_stages(
+            W, S, config, outputs=outputs, workspace=workspace
+        )
 
-    return {
-        "weight": W,
-        "stake": S,
-        "server_prerank": P,
-        "server_consensus_weight": C,
-        "consensus_clipped_weight": W_clipped,
-        "server_rank": R,
-        "server_incentive": I,
-        "validator_bonds": B,
-        "validator_reward": D,
-        "validator_reward_normalized": D_normalized,
-    }
+    return _select_outputs(
+        {**stages, **_yuma4_bonds(stages, B_old, config, workspace=workspace)},
+        outputs,
+    )
@@ -1,4 +1,7 @@
+from dataclasses import dataclass
+
 import pandas as pd
+import torch
 from IPython.display import HTML
 
 from yuma_simulation._internal.cases import BaseCase
@@ -8,10 +11,13 @@ from yuma_simulation._internal.charts_utils import (
     _plot_incentives,
     _plot_validator_server_weights,
 )
+from yuma_simulation._internal.executor import SimulationJob, run_jobs
+from yuma_simulation._internal.result_cache import ResultCache
+from yuma_simulation._internal.results import SimulationResult
 from yuma_simulation._internal.simulation_utils import (
     _generate_draggable_html_table,
     _generate_ipynb_table,
-    run_simulation,
+    _simulate_cases,
 )
 from yuma_simulation._internal.yumas import (
     SimulationHyperparameters,
@@ -21,12 +27,111 @@ from yuma_simulation._internal.yumas import (
 )
 
 
+@dataclass(frozen=True)
+class _ChartJob(SimulationJob):
+    chart_types: tuple[str, ...] = ()
+    result: SimulationResult | None = None
+
+
+def _chart_weights(case: BaseCase) -> list[torch.Tensor]:
+    """Returns the weights plotted by the weights chart, streaming cases only keep the charted servers."""
+
+    if not hasattr(case, "epoch_chunks"):
+        return case.weights_epochs
+    return [
+        W[:, : len(case.servers)].clone()
+        for weights_chunk, _ in case.epoch_chunks()
+        for W in weights_chunk
+    ]
+
+
+def _render_charts(job: _ChartJob) -> dict[str, str]:
+    """Renders the charts of one (case, Yuma version) pair from its simulation result, keyed by chart type."""
+
+    case = job.case
+    yuma_version = job.yuma_version
+    yuma_config = job.yuma_config
+
+    yuma_names = YumaSimulationNames()
+    full_case_name = f"{case.name} - {yuma_version}"
+    if yuma_version in [yuma_names.YUMA, yuma_names.YUMA_LIQUID, yuma_names.YUMA2]:
+        full_case_name = f"{full_case_name} - beta={yuma_config.bond_penalty}"
+    elif yuma_version == yuma_names.YUMA4_LIQUID:
+        full_case_name = f"{full_case_name} [{yuma_config.alpha_low}, {yuma_config.alpha_high}]"
+
+    dividends_per_validator, bonds_per_epoch, server_incentives_per_epoch = job.result
+
+    charts: dict[str, str] = {}
+    for chart_type in job.chart_types:
+        if chart_type == "weights":
+            chart_base64 = _plot_validator_server_weights(
+                validators=case.validators,
+                weights_epochs=_chart_weights(case),
+                servers=case.servers,
+                num_epochs=case.num_epochs,
+                case_name=full_case_name,
+                to_base64=True,
+            )
+        elif chart_type == "dividends":
+            chart_base64 = _plot_dividends(
+                num_epochs=case.num_epochs,
+                validators=case.validators,
+                dividends_per_validator=dividends_per_validator,
+                case=full_case_name,
+                base_validator=case.base_validator,
+                to_base64=True,
+            )
+        elif chart_type == "bonds":
+            chart_base64 = _plot_bonds(
+                num_epochs=case.num_epochs,
+                validators=case.validators,
+                servers=case.servers,
+                bonds_per_epoch=bonds_per_epoch,
+                case_name=full_case_name,
+                to_base64=True,
+            )
+        elif chart_type == "normalized_bonds":
+            chart_base64 = _plot_bonds(
+                num_epochs=case.num_epochs,
+                validators=case.validators,
+                servers=case.servers,
+                bonds_per_epoch=bonds_per_epoch,
+                case_name=full_case_name,
+                to_base64=True,
+                normalize=True,
+            )
+        elif chart_type == "incentives":
+            chart_base64 = _plot_incentives(
+                servers=case.servers,
+                server_incentives_per_epoch=server_incentives_per_epoch,
+                num_epochs=case.num_epochs,
+                case_name=full_case_name,
+                to_base64=True,
+            )
+        else:
+            raise ValueError("Invalid chart type.")
+
+        charts[chart_type] = chart_base64
+
+    return charts
+
+
 def generate_chart_table(
     cases: list[BaseCase],
     yuma_versions: list[tuple[str, YumaParams]],
     yuma_hyperparameters: SimulationHyperparameters,
     draggable_table: bool = False,
+    max_workers: int | None = None,
+    cache: ResultCache | None = None,
 ) -> HTML:
+    """
+    Generates a table of charts with one column per Yuma version and one row per case and chart type.
+    Each case runs all Yuma versions in a single pass, as in generate_total_dividends_table.
+    With max_workers, the simulations and the charts of every (case, Yuma version) pair run in a pool of at most
+    max_workers processes.
+    With a cache, simulations already stored in it are not recomputed.
+    """
+
     table_data: dict[str, list[str]] = {
         yuma_version: [] for yuma_version, _ in yuma_versions
     }
@@ -35,86 +140,44 @@ def generate_chart_table(
         for yuma_version, chart_base64 in chart_base64_dict.items():
             table_data[yuma_version].append(chart_base64)
 
-    case_row_ranges = []
-    current_row_count = 0
-
+    chart_types_per_case: list[tuple[str, ...]] = []
     for idx, case in enumerate(cases):
         if idx in [9, 10]:
-            chart_types = ["weights", "dividends", "bonds", "normalized_bonds", "incentives"]
+            chart_types = ("weights", "dividends", "bonds", "normalized_bonds", "incentives")
         else:
-            chart_types = ["weights", "dividends", "bonds", "normalized_bonds"]
+            chart_types = ("weights", "dividends", "bonds", "normalized_bonds")
+        chart_types_per_case.append(chart_types)
+
+    simulation_results_per_case = _simulate_cases(
+        cases, yuma_versions, yuma_hyperparameters, max_workers=max_workers, cache=cache
+    )
+    jobs = [
+        _ChartJob(
+            case,
+            yuma_version,
+            YumaConfig(simulation=yuma_hyperparameters, yuma_params=yuma_params),
+            chart_types=chart_types,
+            result=result,
+        )
+        for case, chart_types, simulation_results in zip(
+            cases, chart_types_per_case, simulation_results_per_case
+        )
+        for (yuma_version, yuma_params), result in zip(yuma_versions, simulation_results)
+    ]
+    charts_per_job = run_jobs(_render_charts, jobs, max_workers=max_workers)
+
+    case_row_ranges = []
+    current_row_count = 0
+
+    for idx, chart_types in enumerate(chart_types_per_case):
+        case_charts = charts_per_job[idx * len(yuma_versions) : (idx + 1) * len(yuma_versions)]
 
         case_start = current_row_count
         for chart_type in chart_types:
-            chart_base64_dict: dict[str, str] = {}
-            for yuma_version, yuma_params in yuma_versions:
-                yuma_config = YumaConfig(simulation=yuma_hyperparameters, yuma_params=yuma_params)
-                yuma_names = YumaSimulationNames()
-                full_case_name = f"{case.name} - {yuma_version}"
-                if yuma_version in [yuma_names.YUMA, yuma_names.YUMA_LIQUID, yuma_names.YUMA2]:
-                    full_case_name = f"{full_case_name} - beta={yuma_config.bond_penalty}"
-                elif yuma_version == yuma_names.YUMA4_LIQUID:
-                    full_case_name = f"{full_case_name} [{yuma_config.alpha_low}, {yuma_config.alpha_high}]"
-
-                (
-                    dividends_per_validator,
-                    bonds_per_epoch,
-                    server_incentives_per_epoch,
-                ) = run_simulation(
-                    case=case,
-                    yuma_version=yuma_version,
-                    yuma_config=yuma_config,
-                )
-
-                if chart_type == "weights":
-                    chart_base64 = _plot_validator_server_weights(
-                        validators=case.validators,
-                        weights_epochs=case.weights_epochs,
-                        servers=case.servers,
-                        num_epochs=case.num_epochs,
-                        case_name=full_case_name,
-                        to_base64=True,
-                    )
-                elif chart_type == "dividends":
-                    chart_base64 = _plot_dividends(
-                        num_epochs=case.num_epochs,
-                        validators=case.validators,
-                        dividends_per_validator=dividends_per_validator,
-                        case=full_case_name,
-                        base_validator=case.base_validator,
-                        to_base64=True,
-                    )
-                elif chart_type == "bonds":
-                    chart_base64 = _plot_bonds(
-                        num_epochs=case.num_epochs,
-                        validators=case.validators,
-                        servers=case.servers,
-                        bonds_per_epoch=bonds_per_epoch,
-                        case_name=full_case_name,
-                        to_base64=True,
-                    )
-                elif chart_type == "normalized_bonds":
-                    chart_base64 = _plot_bonds(
-                        num_epochs=case.num_epochs,
-                        validators=case.validators,
-                        servers=case.servers,
-                        bonds_per_epoch=bonds_per_epoch,
-                        case_name=full_case_name,
-                        to_base64=True,
-                        normalize=True,
-                    )
-                elif chart_type == "incentives":
-                    chart_base64 = _plot_incentives(
-                        servers=case.servers,
-                        server_incentives_per_epoch=server_incentives_per_epoch,
-                        num_epochs=case.num_epochs,
-                        case_name=full_case_name,
-                        to_base64=True,
-                    )
-                else:
-                    raise ValueError("Invalid chart type.")
-
-                chart_base64_dict[yuma_version] = chart_base64
+            chart_base64_dict: dict[str, str] = {
+                yuma_version: charts[chart_type]
+                for (yuma_version, _), charts in zip(yuma_versions, case_charts)
+            }
 
             process_chart(table_data, chart_base64_dict)
             current_row_count += 1
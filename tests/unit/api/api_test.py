@@ -24,3 +24,28 @@ def test_generate_chart_table_with_charts():
     for img in imgs:
         src = img.get("src", "")
         assert src.startswith("data:image/png;base64,"), "Image should be base64-encoded"
+
+
+def test_generate_chart_table_simulates_each_case_in_one_pass(monkeypatch):
+    import sys
+
+    from src.yuma_simulation.v1 import api
+
+    simulation_utils = sys.modules[api._simulate_cases.__module__]
+    yumas = YumaSimulationNames()
+    yuma_versions = [
+        (yumas.YUMA, YumaParams()),
+        (yumas.YUMA3, YumaParams()),
+    ]
+    simulated = []
+
+    def counting_run_simulations(case, yuma_versions, simulation_hyperparameters, **kwargs):
+        simulated.append((case.name, [yuma_version for yuma_version, _ in yuma_versions]))
+        return run_simulations(case, yuma_versions, simulation_hyperparameters, **kwargs)
+
+    run_simulations = simulation_utils.run_simulations
+    monkeypatch.setattr(simulation_utils, "run_simulations", counting_run_simulations)
+
+    generate_chart_table(cases[:2], yuma_versions, SimulationHyperparameters())
+
+    assert simulated == [(case.name, [yumas.YUMA, yumas.YUMA3]) for case in cases[:2]]
@@ -0,0 +1,148 @@
+from dataclasses import dataclass
+
+import torch
+
+from src.yuma_simulation._internal.cases import (
+    BaseCase,
+    Case1,
+    Case9,
+    CaseBuilder,
+    SegmentedCase,
+    _repeated_epochs,
+)
+from src.yuma_simulation._internal.synthetic import SyntheticCase
+
+
+@dataclass
+class _CountingCase(BaseCase):
+    name: str = "Counting case"
+    validators: list[str] = None
+    base_validator: str = "A"
+
+    def __post_init__(self):
+        self.validators = ["A", "B", "C"]
+        self.builds = 0
+        super().__post_init__()
+
+    @property
+    def weights_epochs(self) -> list[torch.Tensor]:
+        self.builds += 1
+        return [torch.full((3, 2), float(epoch)) for epoch in range(self.num_epochs)]
+
+
+
+@dataclass
+class _TensorFieldCase(_CountingCase):
+    W: torch.Tensor = None
+
+    @property
+    def weights_epochs(self) -> list[torch.Tensor]:
+        self.builds += 1
+        return [self.W] * self.num_epochs
+
+def test_inputs_are_built_once_per_instance():
+    case = _CountingCase(num_epochs=10)
+
+    weights, stakes = case.stacked_inputs()
+
+    assert case.stacked_inputs()[0] is weights
+    assert case.builds == 1
+    for epoch in range(case.num_epochs):
+        assert torch.equal(weights[epoch], torch.full((3, 2), float(epoch)))
+    assert weights.shape == (10, 3, 2)
+    assert stakes.shape == (10, 3)
+    assert weights.is_contiguous()
+
+
+def test_second_call_returns_the_cached_inputs_without_rebuilding():
+    case = _TensorFieldCase(num_epochs=4, W=torch.ones(3, 2))
+
+    weights, stakes = case.stacked_inputs()
+    cached_weights, cached_stakes = case.stacked_inputs()
+
+    assert cached_weights is weights
+    assert cached_stakes is stakes
+    assert case.builds == 1
+
+
+def test_modifying_a_field_tensor_in_place_rebuilds_inputs():
+    case = _TensorFieldCase(num_epochs=4, W=torch.ones(3, 2))
+    case.stacked_inputs()
+
+    case.W.mul_(2)
+
+    weights, _ = case.stacked_inputs()
+    assert case.builds == 2
+    assert torch.equal(weights, torch.full((4, 3, 2), 2.0))
+
+
+def test_weights_are_copies_of_the_cached_inputs():
+    case = Case1()
+
+    case.weights[:, 0] = 0.5
+    case.stakes.zero_()
+
+    weights, stakes = case.stacked_inputs()
+    assert torch.equal(weights, torch.stack(case.weights_epochs))
+    assert torch.equal(stakes, torch.stack(case.stakes_epochs))
+
+
+def test_streaming_cases_do_not_keep_their_inputs():
+    case = SyntheticCase(num_validators=4, num_servers=3, num_epochs=6, chunk_size=2)
+
+    weights = case.weights
+    case.stacked_inputs()
+
+    assert weights.shape == (6, 4, 3)
+    assert torch.equal(case.weights, weights)
+    assert "_stacked_inputs" not in case.__dict__
+
+
+def test_repeated_epochs_compare_sparse_lists_by_value():
+    W = torch.tensor([[0.0, 1.0], [1.0, 0.0]])
+    S = torch.tensor([0.5, 0.5])
+    weights_epochs = [W.to_sparse_coo(), W.to_sparse_coo(), W.flip(0).to_sparse_coo()]
+    stakes_epochs = [S.clone(), S.clone(), S.clone()]
+
+    assert _repeated_epochs(weights_epochs, stakes_epochs) == [False, True, False]
+    assert _repeated_epochs(weights_epochs, stakes_epochs, compare_values=False) == [False] * 3
+
+
+def test_changing_a_field_rebuilds_inputs():
+    case = Case1()
+    case.weights_epochs
+
+    case.num_epochs = 5
+
+    assert len(case.weights_epochs) == 5
+    assert case.weights.shape == (5, 3, 2)
+
+
+def test_segmented_case_merges_identical_epochs():
+    case = Case9()
+
+    segmented = SegmentedCase.from_case(case)
+
+    assert [(segment.start, segment.stop) for segment in segmented.segments] == [(0, 6), (6, 40)]
+    assert segmented.num_epochs == case.num_epochs
+    for expected, actual in zip(case.weights_epochs, segmented.weights_epochs):
+        assert torch.equal(actual, expected)
+    for expected, actual in zip(case.stakes_epochs, segmented.stakes_epochs):
+        assert torch.equal(actual, expected)
+
+
+def test_case_builder_keeps_previous_inputs():
+    W = torch.tensor([[0.0, 1.0], [0.0, 1.0], [0.0, 1.0]])
+    S = torch.tensor([0.8, 0.1, 0.1])
+    S_merged = torch.tensor([0.8, 0.2, 0.0])
+
+    case = (
+        CaseBuilder("Merged stakes", ["A", "B", "C"], base_validator="A")
+        .hold(W, S, epochs=6)
+        .hold(S=S_merged, epochs=34)
+        .build()
+    )
+
+    assert case.num_epochs == 40
+    assert case.segments[1].W is W
+    assert torch.equal(case.stakes_epochs[6], S_merged)
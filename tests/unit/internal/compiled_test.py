@@ -0,0 +1,65 @@
+import contextlib
+import os
+
+import pytest
+import torch
+from torch._inductor.exc import CppCompileError
+
+from src.yuma_simulation._internal import compiled as compiled_module
+from src.yuma_simulation._internal.compiled import _with_eager_fallback, compile_cache_dir
+
+
+def test_compile_cache_dir_restores_the_environment(tmp_path, monkeypatch):
+    monkeypatch.delenv("TORCHINDUCTOR_CACHE_DIR", raising=False)
+
+    with compile_cache_dir(tmp_path / "graphs") as cache_dir:
+        assert os.environ["TORCHINDUCTOR_CACHE_DIR"] == str(cache_dir)
+        assert cache_dir.is_dir()
+
+    assert "TORCHINDUCTOR_CACHE_DIR" not in os.environ
+
+
+def test_compiled_function_falls_back_to_eager_on_cpp_compile_errors(tmp_path, monkeypatch):
+    monkeypatch.setenv("TORCHINDUCTOR_CACHE_DIR", str(tmp_path))
+    calls = []
+
+    def failing_compiled_function(x):
+        calls.append("compiled")
+        raise CppCompileError(["cc"], "missing compiler")
+
+    def function(x):
+        calls.append("eager")
+        return x + 1
+
+    step = _with_eager_fallback(function, failing_compiled_function)
+
+    with pytest.warns(UserWarning, match="falling back to eager mode"):
+        assert step(1) == 2
+    assert step(2) == 3
+    assert calls == ["compiled", "eager", "eager"]
+    assert os.environ["TORCHINDUCTOR_CACHE_DIR"] == str(tmp_path)
+
+
+def test_compile_cache_is_entered_once_for_all_compiled_steps(monkeypatch):
+    entered = []
+
+    @contextlib.contextmanager
+    def counting_compile_cache_dir():
+        entered.append(True)
+        yield
+
+    monkeypatch.setattr(compiled_module, "compile_cache_dir", counting_compile_cache_dir)
+    monkeypatch.setattr(compiled_module, "_compile_cache", None)
+    monkeypatch.setattr(compiled_module, "_compiled_functions", {})
+    monkeypatch.setattr(torch, "compile", lambda function: function)
+
+    def first(x):
+        return x + 1
+
+    def second(x):
+        return x * 2
+
+    for _ in range(3):
+        assert compiled_module.compiled(first)(1) == 2
+        assert compiled_module.compiled(second)(2) == 4
+    assert entered == [True]
@@ -0,0 +1,128 @@
+import pytest
+import torch
+
+from src.yuma_simulation._internal.cases import cases
+from src.yuma_simulation._internal.consensus import (
+    consensus_bisection,
+    consensus_loop,
+    consensus_sorted,
+    consensus_sparse,
+)
+from src.yuma_simulation._internal.yumas import SimulationHyperparameters
+
+
+
+def _consensus_sparse_coo(W, S, kappa, consensus_precision):
+    return consensus_sparse(W.to_sparse_coo().coalesce(), S, kappa, consensus_precision)
+
+
+consensus_kernels = [consensus_sorted, consensus_bisection, _consensus_sparse_coo]
+
+
+def _normalized_epochs(case):
+    for W, S in zip(case.weights_epochs, case.stakes_epochs):
+        yield (W.T / (W.sum(dim=1) + 1e-6)).T, S / S.sum()
+
+
+@pytest.mark.parametrize("kernel", consensus_kernels, ids=lambda kernel: kernel.__name__)
+@pytest.mark.parametrize("case", cases, ids=lambda case: case.name)
+def test_consensus_kernel_matches_loop(case, kernel):
+    hyperparameters = SimulationHyperparameters()
+
+    for W, S in _normalized_epochs(case):
+        expected = consensus_loop(
+            W, S, hyperparameters.kappa, hyperparameters.consensus_precision
+        )
+        actual = kernel(
+            W, S, hyperparameters.kappa, hyperparameters.consensus_precision
+        )
+        assert torch.equal(actual, expected)
+
+
+@pytest.mark.parametrize("kernel", consensus_kernels, ids=lambda kernel: kernel.__name__)
+def test_consensus_kernel_matches_loop_on_random_weights(kernel):
+    generator = torch.Generator().manual_seed(0)
+    W = torch.rand(16, 32, generator=generator)
+    W[W < 0.5] = 0.0
+    W = (W.T / (W.sum(dim=1) + 1e-6)).T
+    S = torch.rand(16, generator=generator)
+    S = S / S.sum()
+
+    for kappa in [0.25, 0.5, 0.75]:
+        expected = consensus_loop(W, S, kappa, 100_000)
+        actual = kernel(W, S, kappa, 100_000)
+        assert torch.equal(actual, expected)
+
+
+@pytest.mark.parametrize("kernel", consensus_kernels, ids=lambda kernel: kernel.__name__)
+def test_consensus_kernel_matches_loop_at_kappa_ties(kernel):
+    # Miner 3 is supported by exactly kappa, after groups whose stakes do not sum exactly in float64
+    S = torch.tensor([0.7, 0.8, 0.7, 0.8, 0.1, 0.2], dtype=torch.float64)
+    W = torch.tensor(
+        [
+            [0.5, 0.75, 0.0, 0.0],
+            [0.25, 0.0, 0.0, 0.0],
+            [0.0, 0.0, 0.25, 0.5],
+            [0.0, 0.0, 0.75, 0.0],
+            [0.0, 0.0, 0.5, 0.0],
+            [0.75, 0.0, 0.5, 0.0],
+        ],
+        dtype=torch.float64,
+    )
+
+    expected = consensus_loop(W, S, 0.7, 100_000)
+    actual = kernel(W, S, 0.7, 100_000)
+    assert torch.equal(actual, expected)
+
+
+@pytest.mark.parametrize("kernel", [consensus_sorted, consensus_bisection], ids=lambda kernel: kernel.__name__)
+def test_consensus_kernel_matches_loop_for_swept_parameters(kernel):
+    generator = torch.Generator().manual_seed(0)
+    W = torch.rand(3, 8, 5, generator=generator)
+    W = W / W.sum(dim=-1, keepdim=True)
+    S = torch.rand(3, 8, generator=generator)
+    S = S / S.sum(dim=-1, keepdim=True)
+    kappa = torch.tensor([0.4, 0.5, 0.6])
+    consensus_precision = torch.tensor([100_000, 1_000, 10])
+
+    expected = consensus_loop(W, S, kappa, consensus_precision)
+    actual = kernel(W, S, kappa, consensus_precision)
+    assert torch.equal(actual, expected)
+
+
+@pytest.mark.parametrize("kernel", consensus_kernels, ids=lambda kernel: kernel.__name__)
+def test_consensus_kernel_matches_loop_at_exact_half_support(kernel):
+    # Equal stakes, half of which back miner 0 and half miner 1, so each miner has exactly kappa of support
+    S = torch.ones(6) / 6
+    W = torch.tensor([[1.0, 0.0]] * 3 + [[0.0, 1.0]] * 3)
+
+    expected = consensus_loop(W, S, 0.5, 100_000)
+    actual = kernel(W, S, 0.5, 100_000)
+    assert torch.equal(actual, expected)
+
+
+@pytest.mark.parametrize("kernel", consensus_kernels, ids=lambda kernel: kernel.__name__)
+@pytest.mark.parametrize("num_validators", [4, 6, 8, 10, 12])
+def test_consensus_kernel_matches_loop_on_equal_stakes(kernel, num_validators):
+    generator = torch.Generator().manual_seed(num_validators)
+    S = torch.ones(num_validators) / num_validators
+
+    for _ in range(20):
+        W = torch.randint(0, 4, (num_validators, 5), generator=generator).float() / 4
+        for kappa in [0.25, 0.5, 0.75]:
+            expected = consensus_loop(W, S, kappa, 100_000)
+            actual = kernel(W, S, kappa, 100_000)
+            assert torch.equal(actual, expected)
+
+
+@pytest.mark.parametrize("kernel", [consensus_sorted, consensus_bisection], ids=lambda kernel: kernel.__name__)
+def test_consensus_kernel_matches_loop_at_swept_ties(kernel):
+    S = torch.ones(2, 3, 6) / 6
+    W = torch.tensor([[1.0, 0.0, 0.5]] * 3 + [[0.0, 1.0, 0.5]] * 3).expand(2, 3, 6, 3)
+    kappa = torch.tensor([0.5, 0.5, 0.4])
+    consensus_precision = torch.tensor([100_000, 1_000, 100_000])
+
+    expected = consensus_loop(W, S, kappa, consensus_precision)
+    actual = kernel(W, S, kappa, consensus_precision)
+    assert torch.equal(actual, expected)
+
@@ -0,0 +1,69 @@
+import re
+
+import pytest
+
+from src.yuma_simulation._internal.cases import cases
+from src.yuma_simulation._internal.executor import (
+    SimulationJob,
+    SimulationJobError,
+    run_jobs,
+)
+from src.yuma_simulation._internal.simulation_utils import generate_total_dividends_table
+from src.yuma_simulation._internal.yumas import (
+    SimulationHyperparameters,
+    YumaConfig,
+    YumaParams,
+    YumaSimulationNames,
+)
+
+yumas = YumaSimulationNames()
+yuma_versions = [
+    (yumas.YUMA, YumaParams()),
+    (yumas.YUMA3, YumaParams()),
+    (yumas.YUMA4_LIQUID, YumaParams(liquid_alpha=True)),
+]
+
+
+def _job_name(job):
+    return job.name
+
+
+def _fail_on_yuma3(job):
+    if job.yuma_version == yumas.YUMA3:
+        raise ValueError("Invalid Yuma function.")
+    return job.name
+
+
+def _jobs():
+    return [
+        SimulationJob(case, yuma_version, YumaConfig(yuma_params=yuma_params))
+        for case in cases[:4]
+        for yuma_version, yuma_params in yuma_versions
+    ]
+
+
+def test_run_jobs_keeps_job_order():
+    jobs = _jobs()
+
+    assert run_jobs(_job_name, jobs, max_workers=3) == [job.name for job in jobs]
+
+
+def test_run_jobs_names_failing_job():
+    with pytest.raises(SimulationJobError, match=re.escape(f"{cases[0].name} - {yumas.YUMA3}")):
+        run_jobs(_fail_on_yuma3, _jobs(), max_workers=2)
+
+
+def test_run_jobs_rejects_invalid_worker_count():
+    with pytest.raises(ValueError):
+        run_jobs(_job_name, _jobs(), max_workers=0)
+
+
+def test_total_dividends_table_matches_serial_run():
+    simulation_hyperparameters = SimulationHyperparameters(bond_penalty=0.99)
+
+    expected = generate_total_dividends_table(cases, yuma_versions, simulation_hyperparameters)
+    actual = generate_total_dividends_table(
+        cases, yuma_versions, simulation_hyperparameters, max_workers=2
+    )
+
+    assert actual.equals(expected)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+import torch
+
+from src.yuma_simulation._internal.cases import cases
+from src.yuma_simulation._internal.export import ExportedRun, export_results, load_table
+from src.yuma_simulation._internal.simulation_utils import run_simulation
+from src.yuma_simulation._internal.yumas import YumaConfig, YumaSimulationNames
+
+pytest.importorskip("pyarrow")
+
+yumas = YumaSimulationNames()
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_export_round_trips_runs(tmp_path, format):
+    runs = [
+        ExportedRun(case.name, yuma_version, YumaConfig(), run_simulation(case, yuma_version, YumaConfig()))
+        for case in cases[:2]
+        for yuma_version in [yumas.YUMA, yumas.YUMA3]
+    ]
+
+    paths = export_results(runs, tmp_path, format=format, include_bonds=True)
+    validators, runs_metadata = load_table(paths["validators"])
+    servers, _ = load_table(paths["servers"])
+
+    assert [metadata["case"] for metadata in runs_metadata] == [run.case_name for run in runs]
+    assert runs_metadata[0]["config"]["bond_alpha"] == YumaConfig().bond_alpha
+    for index, run in enumerate(runs):
+        run_rows = validators[validators["run"] == index]
+        expected = run.result.dividends_per_validator
+        for validator in run.result.validators:
+            assert run_rows[run_rows["validator"] == validator]["dividend"].tolist() == expected[validator]
+
+        run_servers = servers[servers["run"] == index]
+        incentives = run_servers["incentive"].to_numpy().reshape(run.result.server_incentives.shape)
+        assert np.allclose(incentives, run.result.server_incentives.double().numpy())
+
+        bonds = np.load(paths[f"bonds_{index}"], mmap_mode="r")
+        assert torch.equal(torch.from_numpy(np.array(bonds)), run.result.bonds)
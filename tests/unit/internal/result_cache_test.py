@@ -0,0 +1,61 @@
+import torch
+
+from src.yuma_simulation._internal.cases import cases
+from src.yuma_simulation._internal.result_cache import ResultCache
+from src.yuma_simulation._internal.simulation_utils import run_simulation
+from src.yuma_simulation._internal.yumas import (
+    SimulationHyperparameters,
+    YumaConfig,
+    YumaSimulationNames,
+)
+
+yumas = YumaSimulationNames()
+
+
+def _assert_same_outputs(actual, expected):
+    dividends, bonds, incentives = actual
+    expected_dividends, expected_bonds, expected_incentives = expected
+    assert dividends == expected_dividends
+    for B, expected_B in zip(bonds, expected_bonds, strict=True):
+        assert torch.equal(B, expected_B)
+    for I, expected_I in zip(incentives, expected_incentives, strict=True):
+        assert torch.equal(I, expected_I)
+
+
+def test_second_run_is_served_from_cache(tmp_path):
+    cache = ResultCache(tmp_path)
+    expected = run_simulation(cases[0], yumas.YUMA3, YumaConfig())
+
+    run_simulation(cases[0], yumas.YUMA3, YumaConfig(), cache=cache)
+    actual = run_simulation(cases[0], yumas.YUMA3, YumaConfig(), cache=cache)
+
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    _assert_same_outputs(actual, expected)
+
+
+def test_changed_config_misses(tmp_path):
+    cache = ResultCache(tmp_path)
+
+    run_simulation(cases[0], yumas.YUMA3, YumaConfig(), cache=cache)
+    run_simulation(
+        cases[0],
+        yumas.YUMA3,
+        YumaConfig(simulation=SimulationHyperparameters(kappa=0.4)),
+        cache=cache,
+    )
+    run_simulation(cases[1], yumas.YUMA3, YumaConfig(), cache=cache)
+
+    assert (cache.stats.hits, cache.stats.misses) == (0, 3)
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = ResultCache(tmp_path)
+    run_simulation(cases[0], yumas.YUMA3, YumaConfig(), cache=cache)
+    entry_bytes = next(tmp_path.glob("*.pt")).stat().st_size
+
+    small_cache = ResultCache(tmp_path, max_bytes=entry_bytes)
+    run_simulation(cases[1], yumas.YUMA3, YumaConfig(), cache=small_cache)
+    run_simulation(cases[0], yumas.YUMA3, YumaConfig(), cache=small_cache)
+
+    assert small_cache.stats.evictions >= 1
+    assert small_cache.stats.misses == 2
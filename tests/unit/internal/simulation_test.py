@@ -0,0 +1,655 @@
+import os
+from dataclasses import dataclass, replace
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+from src.yuma_simulation._internal.cases import (
+    BaseCase,
+    SegmentedCase,
+    StreamingCase,
+    cases,
+)
+from src.yuma_simulation._internal import simulation_utils
+from src.yuma_simulation._internal.checkpoint import SimulationCheckpoint
+from src.yuma_simulation._internal.charts_utils import _prepare_bond_data
+from src.yuma_simulation._internal.result_cache import ResultCache
+from src.yuma_simulation._internal.results import open_bond_history
+from src.yuma_simulation._internal.simulation_utils import (
+    iter_simulation,
+    resume_simulation,
+    run_batched_simulation,
+    run_simulation,
+    run_simulations,
+    run_sweep,
+)
+from src.yuma_simulation._internal.yumas import (
+    SimulationHyperparameters,
+    YumaConfig,
+    YumaParams,
+    YumaSimulationNames,
+)
+
+yumas = YumaSimulationNames()
+yuma_versions = [
+    (yumas.YUMA_RUST, YumaParams()),
+    (yumas.YUMA, YumaParams()),
+    (yumas.YUMA_LIQUID, YumaParams(liquid_alpha=True)),
+    (yumas.YUMA2, YumaParams()),
+    (yumas.YUMA3, YumaParams()),
+    (yumas.YUMA31, YumaParams()),
+    (yumas.YUMA32, YumaParams()),
+    (yumas.YUMA4, YumaParams()),
+    (
+        yumas.YUMA4_LIQUID,
+        YumaParams(bond_alpha=0.025, alpha_high=0.99, alpha_low=0.9, liquid_alpha=True),
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "yuma_version,yuma_params", yuma_versions, ids=[name for name, _ in yuma_versions]
+)
+@pytest.mark.parametrize("case", cases, ids=lambda case: case.name)
+def test_run_simulation_two_phase_matches_sequential(case, yuma_version, yuma_params):
+    yuma_config = YumaConfig(
+        simulation=SimulationHyperparameters(bond_penalty=0.99),
+        yuma_params=yuma_params,
+    )
+
+    dividends, bonds, incentives = run_simulation(case, yuma_version, yuma_config)
+    dividends_2p, bonds_2p, incentives_2p = run_simulation(
+        case, yuma_version, yuma_config, two_phase=True
+    )
+
+    for validator in case.validators:
+        assert dividends_2p[validator] == pytest.approx(dividends[validator], rel=1e-5, abs=1e-9)
+    for expected, actual in zip(bonds + incentives, bonds_2p + incentives_2p):
+        assert torch.allclose(actual, expected, rtol=1e-5, atol=1e-7)
+
+
+def _sparse_case(case):
+    return SimpleNamespace(
+        name=case.name,
+        validators=case.validators,
+        num_epochs=case.num_epochs,
+        reset_bonds_index=case.reset_bonds_index,
+        reset_bonds_epoch=case.reset_bonds_epoch,
+        weights_epochs=[W.to_sparse() for W in case.weights_epochs],
+        stakes_epochs=case.stakes_epochs,
+    )
+
+
+@pytest.mark.parametrize(
+    "yuma_version,yuma_params", yuma_versions, ids=[name for name, _ in yuma_versions]
+)
+@pytest.mark.parametrize("case", cases, ids=lambda case: case.name)
+def test_run_simulation_sparse_weights_match_dense(case, yuma_version, yuma_params):
+    yuma_config = YumaConfig(
+        simulation=SimulationHyperparameters(bond_penalty=0.99),
+        yuma_params=yuma_params,
+    )
+
+    dividends, bonds, incentives = run_simulation(case, yuma_version, yuma_config)
+    dividends_sp, bonds_sp, incentives_sp = run_simulation(
+        _sparse_case(case), yuma_version, yuma_config
+    )
+
+    for validator in case.validators:
+        assert dividends_sp[validator] == pytest.approx(dividends[validator], rel=1e-5, abs=1e-9)
+    for expected, actual in zip(bonds, bonds_sp):
+        assert actual.is_sparse
+        assert torch.allclose(actual.to_dense(), expected, rtol=1e-5, atol=1e-7)
+    for expected, actual in zip(incentives, incentives_sp):
+        assert torch.allclose(actual, expected, rtol=1e-5, atol=1e-7)
+
+
+@pytest.mark.parametrize("dtype", [torch.float32, torch.float64])
+@pytest.mark.parametrize(
+    "yuma_version,yuma_params", yuma_versions, ids=[name for name, _ in yuma_versions]
+)
+def test_run_simulation_applies_dtype_policy(yuma_version, yuma_params, dtype):
+    yuma_config = YumaConfig(
+        simulation=SimulationHyperparameters(dtype=str(dtype).removeprefix("torch.")),
+        yuma_params=yuma_params,
+    )
+
+    _, bonds, incentives = run_simulation(cases[0], yuma_version, yuma_config)
+
+    assert all(B.dtype == dtype for B in bonds)
+    assert all(I.dtype == dtype for I in incentives)
+
+
+@pytest.mark.parametrize("case", cases, ids=lambda case: case.name)
+def test_run_simulations_matches_run_simulation(case):
+    simulation_hyperparameters = SimulationHyperparameters(bond_penalty=0.99)
+
+    results = run_simulations(case, yuma_versions, simulation_hyperparameters)
+
+    assert len(results) == len(yuma_versions)
+    for (yuma_version, yuma_params), result in zip(yuma_versions, results):
+        expected = run_simulation(
+            case,
+            yuma_version,
+            YumaConfig(simulation=simulation_hyperparameters, yuma_params=yuma_params),
+        )
+        assert result[0] == expected[0]
+        for expected_tensors, actual_tensors in zip(expected[1:], result[1:]):
+            assert all(torch.equal(a, e) for a, e in zip(actual_tensors, expected_tensors))
+
+
+@pytest.mark.parametrize(
+    "yuma_version,yuma_params", yuma_versions, ids=[name for name, _ in yuma_versions]
+)
+def test_run_simulation_compiled_backend_matches_eager(yuma_version, yuma_params):
+    simulation_hyperparameters = SimulationHyperparameters(bond_penalty=0.99)
+
+    dividends, bonds, incentives = run_simulation(
+        cases[0],
+        yuma_version,
+        YumaConfig(simulation=simulation_hyperparameters, yuma_params=yuma_params),
+    )
+    dividends_c, bonds_c, incentives_c = run_simulation(
+        cases[0],
+        yuma_version,
+        YumaConfig(
+            simulation=replace(simulation_hyperparameters, backend="compiled"),
+            yuma_params=yuma_params,
+        ),
+    )
+
+    for validator in cases[0].validators:
+        assert dividends_c[validator] == pytest.approx(dividends[validator], rel=1e-5, abs=1e-9)
+    for expected, actual in zip(bonds + incentives, bonds_c + incentives_c):
+        assert torch.allclose(actual, expected, rtol=1e-5, atol=1e-7)
+
+
+@pytest.mark.parametrize("two_phase", [False, True])
+@pytest.mark.parametrize(
+    "yuma_version,yuma_params", yuma_versions, ids=[name for name, _ in yuma_versions]
+)
+def test_run_batched_simulation_matches_run_simulation(yuma_version, yuma_params, two_phase):
+    yuma_config = YumaConfig(
+        simulation=SimulationHyperparameters(bond_penalty=0.99),
+        yuma_params=yuma_params,
+    )
+
+    results = run_batched_simulation(cases, yuma_version, yuma_config, two_phase=two_phase)
+
+    assert len(results) == len(cases)
+    for case, (dividends_b, bonds_b, incentives_b) in zip(cases, results):
+        dividends, bonds, incentives = run_simulation(case, yuma_version, yuma_config)
+        for validator in case.validators:
+            assert dividends_b[validator] == pytest.approx(dividends[validator], rel=1e-5, abs=1e-9)
+        for expected, actual in zip(bonds + incentives, bonds_b + incentives_b):
+            assert torch.allclose(actual, expected, rtol=1e-5, atol=1e-7)
+
+
+@dataclass
+class _StreamedCase(StreamingCase):
+    source: BaseCase | None = None
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.chunk_lengths = []
+
+    def generate_epochs(self):
+        yield from zip(self.source.weights_epochs, self.source.stakes_epochs)
+
+    def epoch_chunks(self, chunk_size=None, dtype=None):
+        for weights, stakes in super().epoch_chunks(chunk_size, dtype):
+            self.chunk_lengths.append(len(weights))
+            yield weights, stakes
+
+    @property
+    def weights_epochs(self):
+        raise AssertionError("Streaming cases must be read one chunk at a time.")
+
+    @property
+    def stakes_epochs(self):
+        raise AssertionError("Streaming cases must be read one chunk at a time.")
+
+
+def _streamed_case(case, chunk_size):
+    return _StreamedCase(
+        name=case.name,
+        validators=case.validators,
+        base_validator=case.base_validator,
+        num_epochs=case.num_epochs,
+        reset_bonds=case.reset_bonds,
+        reset_bonds_index=case.reset_bonds_index,
+        reset_bonds_epoch=case.reset_bonds_epoch,
+        chunk_size=chunk_size,
+        source=case,
+    )
+
+
+@pytest.mark.parametrize("two_phase", [False, True])
+@pytest.mark.parametrize(
+    "yuma_version,yuma_params", yuma_versions, ids=[name for name, _ in yuma_versions]
+)
+def test_run_simulation_streaming_case_matches_case(yuma_version, yuma_params, two_phase):
+    yuma_config = YumaConfig(
+        simulation=SimulationHyperparameters(bond_penalty=0.99),
+        yuma_params=yuma_params,
+    )
+
+    for case in cases:
+        dividends, bonds, incentives = run_simulation(
+            case, yuma_version, yuma_config, two_phase=two_phase
+        )
+        streamed_case = _streamed_case(case, chunk_size=7)
+        dividends_s, bonds_s, incentives_s = run_simulation(
+            streamed_case, yuma_version, yuma_config, two_phase=two_phase
+        )
+
+        # The previous epoch's weights (Yuma 2) and the bonds are carried over chunk boundaries
+        assert len(streamed_case.chunk_lengths) > 1
+        assert max(streamed_case.chunk_lengths) == 7
+        assert sum(streamed_case.chunk_lengths) == case.num_epochs
+        assert "_stacked_inputs" not in streamed_case.__dict__
+        for validator in case.validators:
+            assert dividends_s[validator] == pytest.approx(dividends[validator], rel=1e-5, abs=1e-9)
+        assert len(bonds_s) == len(bonds)
+        for expected, actual in zip(bonds + incentives, bonds_s + incentives_s):
+            assert torch.allclose(actual, expected, rtol=1e-5, atol=1e-7)
+
+
+@pytest.mark.parametrize("two_phase", [False, True])
+@pytest.mark.parametrize(
+    "yuma_version,yuma_params", yuma_versions, ids=[name for name, _ in yuma_versions]
+)
+def test_run_simulation_computes_stages_once_per_segment(
+    monkeypatch, yuma_version, yuma_params, two_phase
+):
+    yuma_config = YumaConfig(
+        simulation=SimulationHyperparameters(bond_penalty=0.99),
+        yuma_params=yuma_params,
+    )
+    computed_epochs = []
+    consensus_stages = simulation_utils.yuma_consensus_stages
+
+    def counting_consensus_stages(W, *args, **kwargs):
+        computed_epochs.append(len(W) if W.dim() == 3 else 1)
+        return consensus_stages(W, *args, **kwargs)
+
+    for case in cases:
+        dividends, bonds, incentives = run_simulation(case, yuma_version, yuma_config)
+        segmented = SegmentedCase.from_case(case)
+        computed_epochs.clear()
+        with monkeypatch.context() as patch:
+            patch.setattr(simulation_utils, "yuma_consensus_stages", counting_consensus_stages)
+            dividends_s, bonds_s, incentives_s = run_simulation(
+                segmented, yuma_version, yuma_config, two_phase=two_phase
+            )
+
+        # Without two phases, the first epoch of a segment runs its stages itself and its repeats share one
+        repeated_segments = sum(segment.stop - segment.start > 1 for segment in segmented.segments)
+        if not two_phase:
+            expected_epochs = repeated_segments
+        elif yuma_version == yumas.YUMA2:
+            expected_epochs = len(segmented.segments) + repeated_segments
+        else:
+            expected_epochs = len(segmented.segments)
+        assert sum(computed_epochs) == expected_epochs
+        for validator in case.validators:
+            assert dividends_s[validator] == pytest.approx(dividends[validator], rel=1e-5, abs=1e-9)
+        assert len(bonds_s) == len(bonds)
+        for expected, actual in zip(bonds + incentives, bonds_s + incentives_s):
+            assert torch.allclose(actual, expected, rtol=1e-5, atol=1e-7)
+
+
+@pytest.mark.parametrize(
+    "yuma_version,yuma_params", yuma_versions, ids=[name for name, _ in yuma_versions]
+)
+def test_run_sweep_matches_run_simulation_per_point(yuma_version, yuma_params):
+    kappas = [0.4, 0.5, 0.6]
+    bond_penalties = [0.0, 0.5, 0.99]
+    bond_alphas = [0.05, 0.1, 0.2]
+    alpha_lows = [0.6, 0.7, 0.8]
+    decay_rates = [0.05, 0.1, 0.2]
+    yuma_config = YumaConfig(
+        simulation=SimulationHyperparameters(
+            kappa=torch.tensor(kappas), bond_penalty=torch.tensor(bond_penalties)
+        ),
+        yuma_params=replace(
+            yuma_params,
+            bond_alpha=torch.tensor(bond_alphas),
+            alpha_low=torch.tensor(alpha_lows),
+            decay_rate=torch.tensor(decay_rates),
+        ),
+    )
+
+    results = run_sweep(cases[1], yuma_version, yuma_config)
+
+    assert len(results) == len(kappas)
+    for index, (dividends_s, bonds_s, incentives_s) in enumerate(results):
+        point_config = YumaConfig(
+            simulation=SimulationHyperparameters(
+                kappa=kappas[index], bond_penalty=bond_penalties[index]
+            ),
+            yuma_params=replace(
+                yuma_params,
+                bond_alpha=bond_alphas[index],
+                alpha_low=alpha_lows[index],
+                decay_rate=decay_rates[index],
+            ),
+        )
+        dividends, bonds, incentives = run_simulation(cases[1], yuma_version, point_config)
+        for validator in cases[1].validators:
+            assert dividends_s[validator] == pytest.approx(dividends[validator], rel=1e-4, abs=1e-6)
+        for expected, actual in zip(bonds + incentives, bonds_s + incentives_s):
+            assert torch.allclose(actual, expected, rtol=1e-4, atol=1e-6)
+
+
+@pytest.mark.parametrize("dtype", [None, "float64"])
+@pytest.mark.parametrize(
+    "yuma_version,yuma_params", yuma_versions, ids=[name for name, _ in yuma_versions]
+)
+def test_run_sweep_of_float64_values_rounds_like_scalars(yuma_version, yuma_params, dtype):
+    kappas = [0.3, 0.55]
+    bond_alphas = [0.1, 0.3]
+    yuma_config = YumaConfig(
+        simulation=SimulationHyperparameters(
+            kappa=torch.tensor(kappas, dtype=torch.float64), dtype=dtype
+        ),
+        yuma_params=replace(yuma_params, bond_alpha=torch.tensor(bond_alphas, dtype=torch.float64)),
+    )
+
+    results = run_sweep(cases[1], yuma_version, yuma_config)
+
+    for index, result in enumerate(results):
+        point_config = YumaConfig(
+            simulation=SimulationHyperparameters(kappa=kappas[index], dtype=dtype),
+            yuma_params=replace(yuma_params, bond_alpha=bond_alphas[index]),
+        )
+        expected = run_simulation(cases[1], yuma_version, point_config)
+        assert result.bonds.dtype == expected.bonds.dtype
+        assert torch.allclose(result.bonds, expected.bonds, rtol=1e-6, atol=1e-9)
+        assert torch.equal(result.server_consensus, expected.server_consensus)
+
+
+def test_single_scenario_runners_reject_swept_configs():
+    simulation_hyperparameters = SimulationHyperparameters(kappa=torch.tensor([0.4, 0.6]))
+
+    with pytest.raises(ValueError, match="swept parameters"):
+        run_simulation(cases[0], yumas.YUMA3, YumaConfig(simulation=simulation_hyperparameters))
+    with pytest.raises(ValueError, match="swept parameters"):
+        run_simulations(cases[0], [(yumas.YUMA3, YumaParams())], simulation_hyperparameters)
+
+
+@pytest.mark.parametrize(
+    "yuma_version,yuma_params", yuma_versions, ids=[name for name, _ in yuma_versions]
+)
+def test_run_simulation_fast_forwards_steady_state(monkeypatch, yuma_version, yuma_params):
+    case = replace(cases[0], num_epochs=3000)
+    yuma_config = YumaConfig(
+        simulation=SimulationHyperparameters(bond_penalty=0.99),
+        yuma_params=yuma_params,
+    )
+    dividends, bonds, incentives = run_simulation(case, yuma_version, yuma_config)
+
+    stepped_epochs = []
+    run_epoch = simulation_utils._run_epoch
+
+    def counting_run_epoch(case, epoch, *args, **kwargs):
+        stepped_epochs.append(epoch)
+        return run_epoch(case, epoch, *args, **kwargs)
+
+    monkeypatch.setattr(simulation_utils, "_run_epoch", counting_run_epoch)
+    dividends_f, bonds_f, incentives_f = run_simulation(
+        case, yuma_version, yuma_config, steady_state_tolerance=1e-7
+    )
+
+    assert len(stepped_epochs) < case.num_epochs
+    assert len(bonds_f) == len(incentives_f) == case.num_epochs
+    for validator in case.validators:
+        assert len(dividends_f[validator]) == case.num_epochs
+        assert dividends_f[validator] == pytest.approx(dividends[validator], rel=1e-4, abs=1e-4)
+    for expected, actual in zip(bonds + incentives, bonds_f + incentives_f):
+        assert torch.allclose(actual, expected, rtol=1e-4, atol=1e-4)
+
+
+def test_iter_simulation_yields_run_simulation_epochs():
+    case = cases[0]
+    yuma_config = YumaConfig(simulation=SimulationHyperparameters(bond_penalty=0.99))
+    dividends, bonds, incentives = run_simulation(case, yumas.YUMA32, yuma_config)
+
+    records = []
+    for record in iter_simulation(
+        case, yumas.YUMA32, yuma_config, outputs=["server_consensus_weight"]
+    ):
+        records.append((record.epoch, record.dividends.tolist(), record.bonds.clone(), record.outputs))
+        if record.epoch == 9:
+            break
+
+    assert [epoch for epoch, _, _, _ in records] == list(range(10))
+    for epoch, record_dividends, record_bonds, outputs in records:
+        assert record_dividends == [dividends[validator][epoch] for validator in case.validators]
+        assert torch.equal(record_bonds, bonds[epoch])
+        assert "server_consensus_weight" in outputs
+
+
+def test_run_simulation_stops_when_callback_returns_true():
+    case = cases[0]
+    seen_epochs = []
+
+    def on_epoch(record):
+        seen_epochs.append(record.epoch)
+        return record.epoch == 4
+
+    dividends, bonds, incentives = run_simulation(
+        case, yumas.YUMA3, YumaConfig(), on_epoch=on_epoch
+    )
+
+    assert seen_epochs == [0, 1, 2, 3, 4]
+    assert len(bonds) == len(incentives) == 5
+    assert all(len(values) == 5 for values in dividends.values())
+
+
+def test_run_simulation_result_is_columnar():
+    case = cases[0]
+    result = run_simulation(case, yumas.YUMA3, YumaConfig())
+    dividends, bonds, incentives = result
+
+    assert result.dividends.shape == (case.num_epochs, len(case.validators))
+    assert result.bonds.shape == (case.num_epochs, *case.weights_epochs[0].shape)
+    assert result.server_incentives.shape == (case.num_epochs, case.weights_epochs[0].shape[1])
+    for index, validator in enumerate(case.validators):
+        assert result.dividends[:, index].tolist() == dividends[validator]
+    assert all(torch.equal(actual, expected) for actual, expected in zip(result.bonds, bonds))
+    assert len(result) == 3
+    assert result[0] == dividends
+    assert len(result[1]) == len(result[-1]) == case.num_epochs
+
+    arrays = result.as_numpy()
+    arrays["dividends"][0, 0] = -1.0
+    assert result.dividends[0, 0] == -1.0
+
+    last = run_simulation(case, yumas.YUMA3, YumaConfig(), keep_history=False)
+    assert last.bonds.shape[0] == last.server_incentives.shape[0] == 1
+    assert torch.equal(last.bonds[0], bonds[-1])
+
+
+def test_run_simulation_truncates_streams_shorter_than_num_epochs():
+    case = cases[0]
+    streamed_case = replace(_streamed_case(case, chunk_size=7), num_epochs=case.num_epochs + 10)
+
+    result = run_simulation(streamed_case, yumas.YUMA3, YumaConfig())
+    results = run_simulations(streamed_case, [(yumas.YUMA3, YumaParams())], SimulationHyperparameters())
+
+    expected = run_simulation(case, yumas.YUMA3, YumaConfig())
+    for actual in [result, *results]:
+        assert actual.num_epochs == case.num_epochs
+        assert len(actual.bonds) == len(actual.server_incentives) == case.num_epochs
+        assert torch.equal(actual.dividends, expected.dividends)
+
+
+def test_run_simulation_writes_bond_history_to_file(tmp_path):
+    case = cases[0]
+    dividends, bonds, incentives = run_simulation(case, yumas.YUMA3, YumaConfig())
+
+    path = tmp_path / "bonds.npy"
+    result = run_simulation(case, yumas.YUMA3, YumaConfig(), bonds_path=path)
+    history = open_bond_history(path)
+
+    assert result.dividends_per_validator == dividends
+    assert history.shape == (case.num_epochs, *bonds[0].shape)
+    assert all(torch.equal(actual, expected) for actual, expected in zip(history, bonds))
+    assert _prepare_bond_data(history, case.validators, case.servers, normalize=True) == (
+        _prepare_bond_data(bonds, case.validators, case.servers, normalize=True)
+    )
+
+
+def test_run_simulation_shrinks_bond_file_of_stopped_runs(tmp_path):
+    case = cases[0]
+    _, bonds, _ = run_simulation(case, yumas.YUMA3, YumaConfig())
+
+    path = tmp_path / "bonds.npy"
+    result = run_simulation(
+        case, yumas.YUMA3, YumaConfig(), bonds_path=path, on_epoch=lambda record: record.epoch == 9
+    )
+    history = open_bond_history(path)
+
+    assert result.bonds.shape[0] == history.shape[0] == 10
+    assert all(torch.equal(actual, expected) for actual, expected in zip(history, bonds[:10]))
+    header_size = path.stat().st_size - history.numel() * history.element_size()
+    assert header_size % 64 == 0
+
+
+def test_run_simulation_writes_cached_bonds_to_file(tmp_path):
+    case = cases[0]
+    cache = ResultCache(tmp_path / "cache")
+    _, bonds, _ = run_simulation(case, yumas.YUMA3, YumaConfig(), cache=cache)
+
+    path = tmp_path / "bonds.npy"
+    run_simulation(case, yumas.YUMA3, YumaConfig(), cache=cache, bonds_path=path)
+    history = open_bond_history(path)
+
+    assert history.shape[0] == case.num_epochs
+    assert all(torch.equal(actual, expected) for actual, expected in zip(history, bonds))
+
+
+class _Interrupted(Exception):
+    pass
+
+
+@pytest.mark.parametrize("yuma_version", [yumas.YUMA2, yumas.YUMA32, yumas.YUMA4])
+def test_resume_simulation_matches_uninterrupted_run(tmp_path, yuma_version):
+    # Case 6 resets its bonds at epoch 21, right after the checkpoint of epoch 20
+    case = cases[5]
+    yuma_config = YumaConfig(simulation=SimulationHyperparameters(bond_penalty=0.99))
+    expected = run_simulation(case, yuma_version, yuma_config)
+
+    def interrupt(record):
+        if record.epoch == 23:
+            raise _Interrupted
+
+    path = tmp_path / "checkpoint.pt"
+    with pytest.raises(_Interrupted):
+        run_simulation(
+            case,
+            yuma_version,
+            yuma_config,
+            on_epoch=interrupt,
+            checkpoint_path=path,
+            checkpoint_every=10,
+        )
+    resumed_epochs = []
+    actual = resume_simulation(
+        case,
+        yuma_version,
+        yuma_config,
+        path,
+        on_epoch=lambda record: resumed_epochs.append(record.epoch),
+    )
+
+    assert resumed_epochs == list(range(20, case.num_epochs))
+    assert torch.equal(actual.dividends, expected.dividends)
+    assert torch.equal(actual.bonds, expected.bonds)
+    assert torch.equal(actual.server_incentives, expected.server_incentives)
+
+
+def test_checkpoints_only_write_the_epochs_since_the_previous_one(tmp_path):
+    case = cases[0]
+    path = tmp_path / "checkpoint.pt"
+    run_simulation(case, yumas.YUMA3, YumaConfig(), checkpoint_path=path, checkpoint_every=10)
+
+    checkpoint = SimulationCheckpoint.load(path)
+    segments = [
+        torch.load(tmp_path / "checkpoint.pt.rows" / segment, weights_only=True)
+        for segment in checkpoint.segments
+    ]
+
+    assert checkpoint.epoch == case.num_epochs
+    assert [len(segment["dividends"]) for segment in segments] == [10] * (case.num_epochs // 10)
+    assert sorted(os.listdir(tmp_path / "checkpoint.pt.rows")) == sorted(checkpoint.segments)
+
+
+def test_resume_simulation_reads_bonds_back_from_the_bond_file(tmp_path):
+    case = cases[5]
+    expected = run_simulation(case, yumas.YUMA3, YumaConfig())
+
+    def interrupt(record):
+        if record.epoch == 23:
+            raise _Interrupted
+
+    path = tmp_path / "checkpoint.pt"
+    bonds_path = tmp_path / "bonds.npy"
+    with pytest.raises(_Interrupted):
+        run_simulation(
+            case,
+            yumas.YUMA3,
+            YumaConfig(),
+            on_epoch=interrupt,
+            bonds_path=bonds_path,
+            checkpoint_path=path,
+            checkpoint_every=10,
+        )
+    checkpoint = SimulationCheckpoint.load(path)
+    assert all(
+        torch.load(tmp_path / "checkpoint.pt.rows" / segment, weights_only=True)["bonds"] is None
+        for segment in checkpoint.segments
+    )
+
+    actual = resume_simulation(case, yumas.YUMA3, YumaConfig(), path, bonds_path=bonds_path)
+
+    assert torch.equal(actual.dividends, expected.dividends)
+    assert torch.equal(open_bond_history(bonds_path), expected.bonds)
+
+
+def test_resume_simulation_rejects_different_inputs(tmp_path):
+    case = cases[0]
+    path = tmp_path / "checkpoint.pt"
+    run_simulation(case, yumas.YUMA3, YumaConfig(), checkpoint_path=path, checkpoint_every=10)
+
+    changed_case = SegmentedCase.from_case(case)
+    changed_case.segments[0].W = changed_case.segments[0].W.flip(-1)
+
+    resume_simulation(SegmentedCase.from_case(case), yumas.YUMA3, YumaConfig(), path)
+    with pytest.raises(ValueError, match="different inputs"):
+        resume_simulation(changed_case, yumas.YUMA3, YumaConfig(), path)
+
+
+def test_resume_simulation_extends_finished_run(tmp_path):
+    case = cases[0]
+    long_case = replace(case, num_epochs=120)
+    path = tmp_path / "checkpoint.pt"
+    run_simulation(case, yumas.YUMA3, YumaConfig(), checkpoint_path=path)
+
+    simulated_epochs = []
+    extended = resume_simulation(
+        long_case,
+        yumas.YUMA3,
+        YumaConfig(),
+        path,
+        on_epoch=lambda record: simulated_epochs.append(record.epoch),
+    )
+    expected = run_simulation(long_case, yumas.YUMA3, YumaConfig())
+
+    assert simulated_epochs == list(range(case.num_epochs, long_case.num_epochs))
+    assert torch.equal(extended.dividends, expected.dividends)
+    assert torch.equal(extended.bonds, expected.bonds)
+    with pytest.raises(ValueError):
+        resume_simulation(long_case, yumas.YUMA4, YumaConfig(), path)
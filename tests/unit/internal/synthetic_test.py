@@ -0,0 +1,68 @@
+import pytest
+import torch
+
+from src.yuma_simulation._internal.simulation_utils import run_simulation
+from src.yuma_simulation._internal.synthetic import SyntheticCase
+from src.yuma_simulation._internal.yumas import YumaConfig, YumaSimulationNames
+
+
+def _case(**kwargs):
+    return SyntheticCase(num_validators=16, num_servers=64, num_epochs=30, chunk_size=8, **kwargs)
+
+
+def test_synthetic_case_is_seeded():
+    weights, stakes = _case().weights, _case().stakes
+
+    assert weights.shape == (30, 16, 64)
+    assert stakes.shape == (30, 16)
+    assert torch.equal(weights, _case().weights)
+    assert not torch.equal(weights, _case(seed=1).weights)
+    assert torch.allclose(stakes.sum(dim=-1), torch.ones(30))
+    assert bool((stakes[:, 0] >= stakes.max(dim=-1).values * 0.5).all())
+
+
+def test_synthetic_case_does_not_depend_on_chunk_size():
+    case = _case(copier_fraction=0.25, churn_rate=0.2)
+
+    for chunk_size in [1, 7, 30]:
+        chunks = list(case.epoch_chunks(chunk_size=chunk_size))
+        assert torch.equal(torch.cat([weights for weights, _ in chunks]), case.weights)
+        assert torch.equal(torch.cat([stakes for _, stakes in chunks]), case.stakes)
+
+
+def test_synthetic_case_yields_sparse_weights():
+    case = _case(sparse=True)
+    weights_epochs = [W for weights, _ in case.epoch_chunks() for W in weights]
+
+    assert all(W.layout == torch.sparse_coo for W in weights_epochs)
+    assert torch.equal(torch.stack([W.to_dense() for W in weights_epochs]), _case().weights)
+
+    dividends, _, _ = run_simulation(case, YumaSimulationNames().YUMA3, YumaConfig())
+    expected, _, _ = run_simulation(_case(), YumaSimulationNames().YUMA3, YumaConfig())
+    for validator in case.validators:
+        assert dividends[validator] == pytest.approx(expected[validator], rel=1e-5, abs=1e-9)
+
+
+def test_synthetic_case_rejects_invalid_stake_tail():
+    with pytest.raises(ValueError, match="stake_tail"):
+        _case(stake_tail=0.0)
+
+
+def test_synthetic_case_is_sparse_and_has_copiers():
+    case = _case(density=0.1, copier_fraction=0.25, churn_rate=0.0, drift=0.0)
+    weights = case.weights
+
+    # Validators weight few miners, the 4 copiers share one row per epoch
+    nonzero = (weights > 0).float().mean().item()
+    assert nonzero < 0.5
+    rows = weights[1:].unsqueeze(2) == weights[1:].unsqueeze(1)
+    identical_pairs = rows.all(dim=-1).sum(dim=(1, 2)) - case.num_validators
+    assert bool((identical_pairs >= 4 * 3).all())
+
+
+def test_synthetic_case_runs():
+    case = _case()
+    dividends, bonds, _ = run_simulation(case, YumaSimulationNames().YUMA4, YumaConfig())
+
+    assert len(bonds) == case.num_epochs
+    assert all(len(values) == case.num_epochs for values in dividends.values())
@@ -0,0 +1,106 @@
+import pytest
+import torch
+from torch.utils._python_dispatch import TorchDispatchMode
+from torch.utils._pytree import tree_flatten
+
+from src.yuma_simulation._internal.workspace import YumaWorkspace
+from src.yuma_simulation._internal.yumas import (
+    Yuma,
+    Yuma3,
+    Yuma4,
+    YumaConfig,
+    YumaParams,
+    YumaRust,
+)
+
+yuma_functions = [
+    (YumaRust, YumaParams()),
+    (Yuma, YumaParams()),
+    (Yuma, YumaParams(liquid_alpha=True)),
+    (Yuma3, YumaParams()),
+    (Yuma4, YumaParams()),
+]
+
+
+class _AllocationCounter(TorchDispatchMode):
+    """Counts the operators returning a new tensor of at least min_numel elements."""
+
+    def __init__(self, min_numel):
+        super().__init__()
+        self.min_numel = min_numel
+        self.allocations = []
+
+    def __torch_dispatch__(self, func, types, args=(), kwargs=None):
+        kwargs = kwargs or {}
+        result = func(*args, **kwargs)
+
+        inputs, _ = tree_flatten((args, kwargs))
+        input_storages = {
+            x.untyped_storage().data_ptr() for x in inputs if isinstance(x, torch.Tensor)
+        }
+        outputs, _ = tree_flatten(result)
+        for x in outputs:
+            if (
+                isinstance(x, torch.Tensor)
+                and x.numel() >= self.min_numel
+                and x.untyped_storage().data_ptr() not in input_storages
+            ):
+                self.allocations.append(func)
+        return result
+
+
+def _random_epochs(num_epochs, num_validators=8, num_servers=16):
+    generator = torch.Generator().manual_seed(0)
+    for _ in range(num_epochs):
+        W = torch.rand(num_validators, num_servers, generator=generator)
+        W[W < 0.3] = 0.0
+        S = torch.rand(num_validators, generator=generator)
+        yield W, S
+
+
+def _bonds(result):
+    return result.get("validator_ema_bond", result.get("validator_bonds"))
+
+
+@pytest.mark.parametrize(
+    "yuma_function,yuma_params",
+    yuma_functions,
+    ids=[f"{f.__name__}-{p.liquid_alpha}" for f, p in yuma_functions],
+)
+def test_workspace_epochs_do_not_allocate_v_by_m_tensors(yuma_function, yuma_params):
+    config = YumaConfig(yuma_params=yuma_params)
+    workspace = YumaWorkspace(8, 16)
+    epochs = list(_random_epochs(6))
+
+    B_state = None
+    for W, S in epochs[:3]:
+        B_state = _bonds(yuma_function(W, S, B_state, config, workspace=workspace))
+
+    counter = _AllocationCounter(min_numel=8 * 16)
+    with counter:
+        for W, S in epochs[3:]:
+            B_state = _bonds(yuma_function(W, S, B_state, config, workspace=workspace))
+
+    assert counter.allocations == []
+
+
+@pytest.mark.parametrize(
+    "yuma_function,yuma_params",
+    yuma_functions,
+    ids=[f"{f.__name__}-{p.liquid_alpha}" for f, p in yuma_functions],
+)
+def test_workspace_matches_allocating_kernels(yuma_function, yuma_params):
+    config = YumaConfig(yuma_params=yuma_params)
+    workspace = YumaWorkspace(8, 16)
+
+    B_state = B_state_ws = None
+    for W, S in _random_epochs(5):
+        result = yuma_function(W, S, B_state, config)
+        result_ws = yuma_function(W, S, B_state_ws, config, workspace=workspace)
+        B_state, B_state_ws = _bonds(result), _bonds(result_ws)
+
+        assert torch.equal(B_state_ws, B_state)
+        assert torch.equal(
+            result_ws["validator_reward_normalized"],
+            result["validator_reward_normalized"],
+        )
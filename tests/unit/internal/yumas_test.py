@@ -0,0 +1,63 @@
+import pytest
+import torch
+
+from src.yuma_simulation._internal.cases import cases
+from src.yuma_simulation._internal.yumas import (
+    Yuma,
+    Yuma3,
+    Yuma4,
+    SimulationHyperparameters,
+    YumaConfig,
+    YumaRust,
+    yuma_consensus_stages,
+)
+
+
+@pytest.mark.parametrize("yuma_function", [YumaRust, Yuma, Yuma3, Yuma4])
+def test_yuma_returns_only_requested_outputs(yuma_function):
+    W = cases[0].weights_epochs[1]
+    S = cases[0].stakes_epochs[1]
+    outputs = {"server_incentive", "validator_reward_normalized"}
+
+    result = yuma_function(W, S, outputs=outputs)
+    full_result = yuma_function(W, S)
+
+    assert set(result) == outputs
+    for key in outputs:
+        assert torch.equal(result[key], full_result[key])
+
+
+def test_consensus_stages_skip_unrequested_trusts():
+    W = cases[0].weights_epochs[1]
+    S = cases[0].stakes_epochs[1]
+
+    stages = yuma_consensus_stages(W, S, outputs={"server_incentive"})
+
+    assert "server_prerank" not in stages
+    assert "server_trust" not in stages
+    assert "validator_trust" not in stages
+
+
+@pytest.mark.parametrize("sparse", [False, True], ids=["dense", "sparse"])
+@pytest.mark.parametrize("dtype", ["float32", "float64"])
+def test_consensus_stages_keep_the_dtype_policy(dtype, sparse):
+    W = cases[0].weights_epochs[1]
+    S = cases[0].stakes_epochs[1]
+    config = YumaConfig(simulation=SimulationHyperparameters(dtype=dtype))
+
+    stages = yuma_consensus_stages(W.to_sparse_coo() if sparse else W, S, config)
+
+    for name, stage in stages.items():
+        assert stage.dtype == getattr(torch, dtype), name
+
+
+def test_sparse_consensus_stages_match_the_loop_on_equal_stakes():
+    generator = torch.Generator().manual_seed(0)
+    S = torch.ones(6)
+    config = YumaConfig(simulation=SimulationHyperparameters(consensus_mode="loop"))
+
+    for _ in range(20):
+        W = torch.randint(0, 4, (6, 5), generator=generator).float()
+        expected = yuma_consensus_stages(W, S, config)
+        actual = yuma_consensus_stages(W.to_sparse_coo(), S)
+        assert torch.equal(actual["server_consensus_weight"], expected["server_consensus_weight"])
@@ -0,0 +1,46 @@
+from scripts.benchmark import _measure, compare_reports
+
+
+def _report(**benchmarks):
+    return {
+        "schema_version": 2,
+        "quick": True,
+        "benchmarks": {
+            name: {"seconds": seconds, "min_seconds": seconds, "repeats": 3, "peak_memory_mb": memory}
+            for name, (seconds, memory) in benchmarks.items()
+        },
+    }
+
+
+def test_compare_reports_flags_slower_and_larger_benchmarks():
+    baseline = _report(steady=(1.0, 100.0), slower=(1.0, 100.0), larger=(1.0, 100.0), removed=(1.0, 1.0))
+    current = _report(steady=(1.05, 110.0), slower=(1.5, 100.0), larger=(1.0, 150.0), added=(9.0, 900.0))
+
+    regressions = compare_reports(
+        baseline, current, time_threshold=0.1, memory_threshold=0.2, min_memory_mb=16.0
+    )
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("slower: 1.50x slower")
+    assert regressions[1].startswith("larger: 50.0 MB more peak memory")
+
+
+def test_compare_reports_allows_small_memory_growth():
+    baseline = _report(small=(1.0, 1.0))
+    current = _report(small=(1.0, 10.0))
+
+    assert compare_reports(baseline, current, 0.1, 0.2, min_memory_mb=16.0) == []
+    assert len(compare_reports(baseline, current, 0.1, 0.2, min_memory_mb=1.0)) == 1
+
+
+def test_measure_counts_the_memory_of_the_first_call():
+    allocations = []
+
+    def allocate_once():
+        if not allocations:
+            allocations.append(b"\x01" * (64 * 2**20))
+
+    result = _measure(allocate_once, repeats=2)
+
+    assert result["repeats"] == 2
+    assert result["peak_memory_mb"] >= 32